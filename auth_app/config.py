@@ -1,8 +1,36 @@
+import functools
+import math
+import os
 from pathlib import Path
+from typing import (
+    Literal,
+    Optional,
+)
 
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings
 
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def available_cpus() -> int:
+    """
+    CPUs the process may run on, capped by the cgroup quota of the
+    container: os.cpu_count() reports the cores of the whole node.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        # no affinity mask on macOS and Windows
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = CGROUP_CPU_MAX.read_text().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota == "max":
+        return cpus
+    return max(1, min(cpus, math.ceil(int(quota) / int(period))))
+
 
 class BaseConfig(BaseSettings):
     class Config:
@@ -17,6 +45,10 @@ class PostgresSettings(BaseConfig):
     POSTGRES_PORT: int
     POSTGRES_HOST: str
     POSTGRES_DB: str
+    POSTGRES_SQL_LOG: Literal["off", "slow", "all"] = "off"
+    POSTGRES_SLOW_QUERY_MS: float = 200.0
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 10
 
     @property
     def postgres_dsn(self) -> str:
@@ -31,6 +63,11 @@ class RedisSettings(BaseConfig):
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_PASSWORD: SecretStr
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 5.0
+    REDIS_WARM_CONNECTIONS: int = 10
 
     @property
     def redis_dsn(self) -> str:
@@ -44,6 +81,10 @@ class JWTSettings(BaseConfig):
     REFRESH_LASTING: int
     ACCESS_LASTING: int
     ADMIN_SECRET: SecretStr
+    JWT_SIGNING_KEY_FILE: Optional[Path] = None
+    JWT_VERIFICATION_KEY_FILES: list[Path] = []
+    JWT_LEGACY_HS_ALGORITHM: Optional[str] = None
+    JWT_JWKS_MAX_AGE: int = 300
 
     @property
     def jwt_key(self) -> str:
@@ -53,6 +94,10 @@ class JWTSettings(BaseConfig):
 class PasswordSettings(BaseConfig):
     HASHING_ALGORITHM: SecretStr
     HASHING_DEPRECATED: SecretStr
+    # the CPUs of the process split among the server workers by default
+    HASHING_POOL_SIZE: Optional[int] = None
+    HASHING_MAX_QUEUE: int = 64
+    HASHING_TIMEOUT: float = 5.0
 
     @property
     def hashing_algorithm(self) -> tuple[str, str]:
@@ -74,8 +119,162 @@ class AWSSettings(BaseConfig):
     VERIFICATION_CODE_LENGTH: int
 
 
-pg_settings = PostgresSettings()
-redis_settings = RedisSettings()
-jwt_settings = JWTSettings()
-pwd_settings = PasswordSettings()
-aws_settings = AWSSettings()
+class OutboxSettings(BaseConfig):
+    OUTBOX_ENABLED: bool = True
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_CONCURRENCY: int = 10
+    OUTBOX_POLL_INTERVAL: float = 1.0
+    OUTBOX_LEASE_SECONDS: int = 60
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_BACKOFF_BASE: float = 2.0
+    OUTBOX_BACKOFF_MAX: float = 600.0
+
+
+class TokenPurgeSettings(BaseConfig):
+    TOKEN_PURGE_ENABLED: bool = True
+    TOKEN_PURGE_INTERVAL: float = 3600.0
+    TOKEN_PURGE_BATCH_SIZE: int = 1000
+    TOKEN_PURGE_PAUSE: float = 0.05
+    TOKEN_PURGE_GRACE_SECONDS: int = 0
+
+
+class OTPSettings(BaseConfig):
+    OTP_TTL: int = 300
+    OTP_HMAC_KEY: Optional[SecretStr] = None
+    OTP_MAX_ATTEMPTS: int = 5
+    OTP_MAX_FAILURES: int = 10
+    OTP_FAILURE_WINDOW: int = 3600
+    OTP_MAX_ISSUES: int = 5
+    OTP_ISSUE_WINDOW: int = 3600
+
+
+class RateLimitSettings(BaseConfig):
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    RATE_LIMIT_LOCAL_SIZE: int = 10000
+
+
+class CacheSettings(BaseConfig):
+    USER_STATUS_TTL: int = 60
+    USER_STATUS_LOCAL_TTL: float = 5.0
+    USER_STATUS_LOCAL_SIZE: int = 10000
+    USER_STATUS_CHANNEL: str = "user-status:invalidate"
+    INTROSPECTION_CACHE_SIZE: int = 10000
+
+
+class RevocationSettings(BaseConfig):
+    REVOCATION_CHANNEL: str = "token-revocation"
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    REVOCATION_REBUILD_INTERVAL: float = 300.0
+
+
+class MetricsSettings(BaseConfig):
+    METRICS_ENABLED: bool = True
+
+
+class TracingSettings(BaseConfig):
+    TRACING_ENABLED: bool = False
+    TRACING_SERVICE_NAME: str = "skill-tracker-auth"
+    TRACING_EXPORTER: Literal["otlp", "memory"] = "otlp"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    TRACING_MAX_QUEUE_SIZE: int = 2048
+    TRACING_EXPORT_BATCH_SIZE: int = 512
+    TRACING_EXPORT_DELAY: float = 5.0
+
+
+class ExportSettings(BaseConfig):
+    # rows changed this recently are left to the next export, so that
+    # transactions still in flight cannot commit behind the watermark
+    EXPORT_SAFETY_LAG: int = 300
+
+
+class ServerSettings(BaseConfig):
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    # several workers share their metrics through the files of
+    # PROMETHEUS_MULTIPROC_DIR, a temporary one when it is unset
+    SERVER_WORKERS: Optional[int] = None
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEP_ALIVE: int = 5
+    SERVER_LIMIT_CONCURRENCY: Optional[int] = None
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    SERVER_ACCESS_LOG: bool = True
+
+
+# each group is read from the environment on its first use, importing
+# a module needs none of the variables
+@functools.cache
+def get_pg_settings() -> PostgresSettings:
+    return PostgresSettings()
+
+
+@functools.cache
+def get_redis_settings() -> RedisSettings:
+    return RedisSettings()
+
+
+@functools.cache
+def get_jwt_settings() -> JWTSettings:
+    return JWTSettings()
+
+
+@functools.cache
+def get_pwd_settings() -> PasswordSettings:
+    return PasswordSettings()
+
+
+@functools.cache
+def get_aws_settings() -> AWSSettings:
+    return AWSSettings()
+
+
+@functools.cache
+def get_outbox_settings() -> OutboxSettings:
+    return OutboxSettings()
+
+
+@functools.cache
+def get_token_purge_settings() -> TokenPurgeSettings:
+    return TokenPurgeSettings()
+
+
+@functools.cache
+def get_cache_settings() -> CacheSettings:
+    return CacheSettings()
+
+
+@functools.cache
+def get_rate_limit_settings() -> RateLimitSettings:
+    return RateLimitSettings()
+
+
+@functools.cache
+def get_otp_settings() -> OTPSettings:
+    return OTPSettings()
+
+
+@functools.cache
+def get_revocation_settings() -> RevocationSettings:
+    return RevocationSettings()
+
+
+@functools.cache
+def get_metrics_settings() -> MetricsSettings:
+    return MetricsSettings()
+
+
+@functools.cache
+def get_tracing_settings() -> TracingSettings:
+    return TracingSettings()
+
+
+@functools.cache
+def get_export_settings() -> ExportSettings:
+    return ExportSettings()
+
+
+@functools.cache
+def get_server_settings() -> ServerSettings:
+    return ServerSettings()
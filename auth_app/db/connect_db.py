@@ -1,27 +1,85 @@
-from collections.abc import AsyncGenerator
+import math
+import time
+from typing import Any
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-
-from auth_app.config import pg_settings
-
-async_engine = create_async_engine(
-    pg_settings.postgres_dsn,
-    echo=True,
-    pool_size=10,
-    max_overflow=10,
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    PoolProxiedConnection,
 )
 
-AsyncSessionLocal = async_sessionmaker(
-    async_engine,
-    expire_on_commit=False,
-    class_=AsyncSession,
+from auth_app.config import get_pg_settings
+from auth_app.db.query_stats import QueryStats
+from auth_app.metrics import (
+    db_pool_checkout_wait,
+    db_pool_in_use,
 )
+from auth_app.tracing import (
+    install_query_spans,
+    span,
+    tracing_enabled,
+)
+
+# the slow query threshold is set from the settings on install
+query_stats = QueryStats(slow_threshold=math.inf)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool recording how long a checkout waits for a connection
+    """
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            with span("db.pool.checkout"):
+                return super().connect()
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - started)
+
+
+def _on_checkout(*args: Any) -> None:
+    db_pool_in_use.inc()
+
+
+def _on_checkin(*args: Any) -> None:
+    db_pool_in_use.dec()
+
+
+def create_db_engine() -> AsyncEngine:
+    """
+    Created once per process by the application lifespan
+    or by a standalone script, never at import time.
+    """
+    pg_settings = get_pg_settings()
+    engine = create_async_engine(
+        pg_settings.postgres_dsn,
+        echo=pg_settings.POSTGRES_SQL_LOG == "all",
+        pool_size=pg_settings.POSTGRES_POOL_SIZE,
+        max_overflow=pg_settings.POSTGRES_MAX_OVERFLOW,
+        poolclass=TimedQueuePool,
+    )
+    event.listen(engine.sync_engine.pool, "checkout", _on_checkout)
+    event.listen(engine.sync_engine.pool, "checkin", _on_checkin)
+    if pg_settings.POSTGRES_SQL_LOG != "off":
+        query_stats.slow_threshold = pg_settings.POSTGRES_SLOW_QUERY_MS / 1000
+        query_stats.install(engine.sync_engine)
+    if tracing_enabled():
+        install_query_spans(engine.sync_engine)
+    return engine
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
-        yield session
+def create_session_factory(
+    engine: AsyncEngine,
+) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        engine,
+        expire_on_commit=False,
+        class_=AsyncSession,
+    )
@@ -1,22 +1,75 @@
-from collections.abc import AsyncGenerator
+import time
+from typing import Any
 
-import redis.asyncio as redis
-from redis.asyncio.client import Redis
-
-from auth_app.config import redis_settings
-
-redis_client = redis.from_url(
-    redis_settings.redis_dsn,
-    decode_responses=True,
+from opentelemetry.trace import SpanKind
+from redis.asyncio import ConnectionPool
+from redis.asyncio.client import (
+    Pipeline,
+    Redis,
 )
 
+from auth_app.config import get_redis_settings
+from auth_app.metrics import redis_commands
+from auth_app.tracing import span
+
 
-async def get_redis_client() -> AsyncGenerator[Redis, None]:
-    client = Redis.from_url(
+def create_redis_pool() -> ConnectionPool:
+    """
+    Application-wide Redis connection pool.
+    Created once in the lifespan hook and shared by every request.
+    """
+    redis_settings = get_redis_settings()
+    return ConnectionPool.from_url(
         redis_settings.redis_dsn,
         decode_responses=True,
+        max_connections=redis_settings.REDIS_MAX_CONNECTIONS,
+        health_check_interval=redis_settings.REDIS_HEALTH_CHECK_INTERVAL,
+        socket_timeout=redis_settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=redis_settings.REDIS_SOCKET_CONNECT_TIMEOUT,
     )
-    try:
-        yield client
-    finally:
-        await client.aclose()
+
+
+# span attributes shared by every command, nothing allocated per call
+REDIS_SPAN_ATTRIBUTES = {"db.system": "redis"}
+
+
+class TimedPipeline(Pipeline):
+    """
+    Pipeline observed as a single PIPELINE round trip
+    """
+
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        started = time.perf_counter()
+        try:
+            with span("PIPELINE", SpanKind.CLIENT, REDIS_SPAN_ATTRIBUTES):
+                return await super().execute(raise_on_error)
+        finally:
+            redis_commands["PIPELINE"].observe(time.perf_counter() - started)
+
+
+class TimedRedis(Redis):
+    """
+    Client recording the latency of every command by command name,
+    in a CLIENT span when tracing is enabled.
+    Scripts are observed as EVALSHA.
+    """
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            with span(args[0], SpanKind.CLIENT, REDIS_SPAN_ATTRIBUTES):
+                return await super().execute_command(*args, **options)
+        finally:
+            redis_commands[args[0]].observe(time.perf_counter() - started)
+
+    def pipeline(
+        self,
+        transaction: bool = True,
+        shard_hint: str | None = None,
+    ) -> TimedPipeline:
+        return TimedPipeline(
+            self.connection_pool,
+            self.response_callbacks,
+            transaction,
+            shard_hint,
+        )
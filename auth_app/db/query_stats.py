@@ -0,0 +1,147 @@
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from auth_app.middleware.request_id import request_id_ctx
+
+logger = logging.getLogger("auth_app.db.slow_query")
+
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_PARAMS = re.compile(
+    r"\$\d+(?:::[A-Z_]+(?: WITH(?:OUT)? TIME ZONE)?(?:\[\])?)?|%\(\w+\)s|\?"
+)
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    Normalise a statement so that queries differing only in literals,
+    bind parameters or IN-list length share the same key.
+    """
+    result = _STRINGS.sub("?", statement)
+    result = _PARAMS.sub("?", result)
+    result = _NUMBERS.sub("?", result)
+    result = _LISTS.sub("(?+)", result)
+    return _SPACES.sub(" ", result).strip()
+
+
+class QueryAggregate:
+    __slots__ = ("count", "total", "max", "min")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.min = float("inf")
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+        if duration < self.min:
+            self.min = duration
+
+
+class QueryStats:
+    """
+    Statement timing based on SQLAlchemy cursor events.
+    Aggregates latency per statement fingerprint and logs statements
+    slower than the threshold.
+    """
+
+    def __init__(
+        self,
+        slow_threshold: float,
+        max_fingerprints: int = 1000,
+    ) -> None:
+        self.slow_threshold = slow_threshold
+        self.max_fingerprints = max_fingerprints
+        self._aggregates: dict[str, QueryAggregate] = {}
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._on_error)
+
+    def _before_execute(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after_execute(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        duration = time.perf_counter() - conn.info["query_start"].pop()
+        key = fingerprint(statement)
+        aggregate = self._aggregates.get(key)
+        if aggregate is None:
+            if len(self._aggregates) >= self.max_fingerprints:
+                key = "<other>"
+            aggregate = self._aggregates.setdefault(key, QueryAggregate())
+        aggregate.add(duration)
+
+        if duration >= self.slow_threshold:
+            request_id = request_id_ctx.get()
+            logger.warning(
+                "slow_query duration_ms=%.2f rows=%s request_id=%s sql=%s",
+                duration * 1000,
+                cursor.rowcount,
+                request_id,
+                key,
+                extra={
+                    "fingerprint": key,
+                    "duration_ms": duration * 1000,
+                    "rowcount": cursor.rowcount,
+                    "request_id": request_id,
+                },
+            )
+
+    def _on_error(self, context: Any) -> None:
+        # a failed statement never reaches after_cursor_execute
+        if context.connection is None:
+            return
+        starts = context.connection.info.get("query_start")
+        if starts:
+            starts.pop()
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """
+        Aggregates sorted by total time spent, slowest first.
+        """
+        items: list[dict[str, Any]] = [
+            {
+                "fingerprint": key,
+                "count": agg.count,
+                "total_ms": agg.total * 1000,
+                "avg_ms": agg.total / agg.count * 1000,
+                "max_ms": agg.max * 1000,
+                "min_ms": agg.min * 1000,
+            }
+            for key, agg in self._aggregates.items()
+        ]
+        items.sort(key=lambda item: item["total_ms"], reverse=True)
+        return items
+
+    def reset(self) -> None:
+        self._aggregates.clear()
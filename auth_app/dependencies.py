@@ -1,32 +1,98 @@
-from aiobotocore.client import AioBaseClient
-from fastapi import Depends
-from redis.asyncio.client import Redis
+from fastapi import (
+    Depends,
+    Request,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from auth_app.db.connect_redis import get_redis_client
 from auth_app.middleware.db_session import get_db_from_request
+from auth_app.repositories.outbox import OutboxRepo
 from auth_app.repositories.tokens import TokenRepo
 from auth_app.repositories.users import UserRepo
-from auth_app.services.ses.clients import get_ses_client
 from auth_app.services.tokens import TokenService
+from auth_app.services.user_export import UserExportService
+from auth_app.services.user_import import UserImportService
 from auth_app.services.users import UserService
+from auth_app.services.utils.introspection import TokenIntrospector
+from auth_app.services.utils.key_ring import KeyRing
+from auth_app.services.utils.otp_store import OTPStore
+from auth_app.services.utils.pwd_hashing import HashingPool
+from auth_app.services.utils.revocation import RevocationList
+from auth_app.services.utils.token_handler import TokenHandler
+from auth_app.services.utils.user_status_cache import UserStatusCache
+
+
+def get_user_status_cache(request: Request) -> UserStatusCache:
+    return request.app.state.resources.user_status_cache
+
+
+def get_revocation_list(request: Request) -> RevocationList:
+    return request.app.state.resources.revocation_list
+
+
+def get_otp_store(request: Request) -> OTPStore:
+    return request.app.state.resources.otp_store
+
+
+def get_key_ring(request: Request) -> KeyRing:
+    return request.app.state.resources.key_ring
+
+
+def get_token_handler(request: Request) -> TokenHandler:
+    return request.app.state.resources.token_handler
+
+
+def get_token_introspector(request: Request) -> TokenIntrospector:
+    return request.app.state.resources.token_introspector
+
+
+def get_hashing_pool(request: Request) -> HashingPool:
+    return request.app.state.resources.hashing_pool
 
 
 async def get_user_service(
     session: AsyncSession = Depends(get_db_from_request),
-    redis: Redis = Depends(get_redis_client),
-    ses: AioBaseClient = Depends(get_ses_client),
+    otp_store: OTPStore = Depends(get_otp_store),
+    status_cache: UserStatusCache = Depends(get_user_status_cache),
 ) -> UserService:
     user_repo = UserRepo(session)
     token_repo = TokenRepo(session)
-    return UserService(user_repo, token_repo, redis, ses)
+    outbox_repo = OutboxRepo(session)
+    return UserService(
+        user_repo,
+        token_repo,
+        outbox_repo,
+        otp_store,
+        status_cache,
+    )
 
 
 async def get_token_service(
     session: AsyncSession = Depends(get_db_from_request),
-    redis: Redis = Depends(get_redis_client),
-    ses: AioBaseClient = Depends(get_ses_client),
+    status_cache: UserStatusCache = Depends(get_user_status_cache),
+    revocations: RevocationList = Depends(get_revocation_list),
+    token_handler: TokenHandler = Depends(get_token_handler),
 ) -> TokenService:
     user_repo = UserRepo(session)
     token_repo = TokenRepo(session)
-    return TokenService(user_repo, token_repo, redis, ses)
+    return TokenService(
+        user_repo,
+        token_repo,
+        status_cache,
+        revocations,
+        token_handler,
+    )
+
+
+async def get_user_import_service(
+    session: AsyncSession = Depends(get_db_from_request),
+) -> UserImportService:
+    user_repo = UserRepo(session)
+    outbox_repo = OutboxRepo(session)
+    return UserImportService(user_repo, outbox_repo)
+
+
+async def get_user_export_service(
+    session: AsyncSession = Depends(get_db_from_request),
+) -> UserExportService:
+    user_repo = UserRepo(session)
+    return UserExportService(user_repo)
@@ -14,6 +14,24 @@ class TokenError(Exception):
     """Base class for token related errors."""
 
 
+class HashingError(Exception):
+    """Base class for password hashing pool errors."""
+
+
+class ImportFormatError(ValueError):
+    """Bulk import stream that cannot be parsed at all."""
+
+
+class RateLimitError(Exception):
+    """
+    Too many attempts, retry_after is in seconds
+    """
+
+    def __init__(self, retry_after: float) -> None:
+        self.retry_after = retry_after
+        super().__init__("Too many attempts. Try again later.")
+
+
 class UserVerificationError(ValueError, ServiceError):
     """
     Error with verification
@@ -1,19 +1,25 @@
+import math
+
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 
 from auth_app.exeptions.custom import (
+    HashingError,
+    RateLimitError,
     ServiceError,
     TokenError,
     TransactionError,
     UserActivityError,
     UserVerificationError,
 )
+from auth_app.metrics import error_counts
 
 
 async def transaction_error_handler(
     request: Request,
     exc: TransactionError,
 ) -> JSONResponse:
+    error_counts[type(exc).__name__].inc()
     return JSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
         content={
@@ -26,6 +32,7 @@ async def user_verification_exception_handler(
     request: Request,
     exc: UserVerificationError,
 ) -> JSONResponse:
+    error_counts[type(exc).__name__].inc()
     return JSONResponse(
         status_code=status.HTTP_403_FORBIDDEN,
         content={
@@ -38,6 +45,7 @@ async def user_activity_exception_handler(
     request: Request,
     exc: UserActivityError,
 ) -> JSONResponse:
+    error_counts[type(exc).__name__].inc()
     return JSONResponse(
         status_code=status.HTTP_403_FORBIDDEN,
         content={
@@ -50,6 +58,7 @@ async def token_verification_handler(
     request: Request,
     exc: TokenError,
 ) -> JSONResponse:
+    error_counts[type(exc).__name__].inc()
     return JSONResponse(
         status_code=status.HTTP_403_FORBIDDEN,
         content={
@@ -62,9 +71,39 @@ async def service_error_handler(
     request: Request,
     exc: ServiceError,
 ) -> JSONResponse:
+    error_counts[type(exc).__name__].inc()
     return JSONResponse(
         status_code=status.HTTP_404_NOT_FOUND,
         content={
             "detail": str(exc),
         }
     )
+
+
+async def hashing_error_handler(
+    request: Request,
+    exc: HashingError,
+) -> JSONResponse:
+    error_counts[type(exc).__name__].inc()
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "detail": str(exc),
+        }
+    )
+
+
+async def rate_limit_handler(
+    request: Request,
+    exc: RateLimitError,
+) -> JSONResponse:
+    error_counts[type(exc).__name__].inc()
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={
+            "detail": str(exc),
+        },
+        headers={
+            "Retry-After": str(max(1, math.ceil(exc.retry_after))),
+        },
+    )
@@ -1,7 +1,13 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 
+from auth_app.config import get_metrics_settings
 from auth_app.exeptions.custom import (
+    HashingError,
+    RateLimitError,
     ServiceError,
     TokenError,
     TransactionError,
@@ -9,6 +15,8 @@ from auth_app.exeptions.custom import (
     UserVerificationError,
 )
 from auth_app.exeptions.handlers import (
+    hashing_error_handler,
+    rate_limit_handler,
     service_error_handler,
     token_verification_handler,
     transaction_error_handler,
@@ -16,29 +24,53 @@ from auth_app.exeptions.handlers import (
     user_verification_exception_handler,
 )
 from auth_app.messages.common import msg_creator
+from auth_app.metrics import mark_process_dead
 from auth_app.middleware.db_session import DBSessionMiddleware
+from auth_app.middleware.metrics import MetricsMiddleware
+from auth_app.middleware.request_id import RequestIDMiddleware
+from auth_app.middleware.tracing import TracingMiddleware
+from auth_app.resources import Resources
+from auth_app.routers.metrics import metrics_router
+from auth_app.routers.service import service_router
 from auth_app.routers.tokens import token_router
 from auth_app.routers.users import user_router
-from auth_app.services.ses.clients import get_ses_client
-from auth_app.services.ses.ses_handler import ses_handler
+from auth_app.routers.well_known import well_known_router
+from auth_app.tracing import tracing_enabled
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    app.state.resources = Resources()
+    try:
+        await app.state.resources.start()
+        yield
+    finally:
+        await app.state.resources.close()
+        mark_process_dead()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(router=user_router)
 app.include_router(router=token_router)
+app.include_router(router=service_router)
+app.include_router(router=well_known_router)
+if get_metrics_settings().METRICS_ENABLED:
+    app.include_router(router=metrics_router)
 
 app.add_exception_handler(UserActivityError, user_activity_exception_handler)
 app.add_exception_handler(UserVerificationError, user_verification_exception_handler)
 app.add_exception_handler(TokenError, token_verification_handler)
 app.add_exception_handler(ServiceError, service_error_handler)
 app.add_exception_handler(TransactionError, transaction_error_handler)
+app.add_exception_handler(HashingError, hashing_error_handler)
+app.add_exception_handler(RateLimitError, rate_limit_handler)
 
 app.add_middleware(DBSessionMiddleware)
-
-
-@app.on_event("startup")
-async def on_startup() -> None:
-    async for ses in get_ses_client():
-        await ses_handler.verify_sender(ses)
+app.add_middleware(RequestIDMiddleware)
+if tracing_enabled():
+    app.add_middleware(TracingMiddleware)
+if get_metrics_settings().METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 
 @app.get('/', tags=['root'])
@@ -43,5 +43,17 @@ class MessageCreator:
             "response_message": response,
         }
 
+    @staticmethod
+    def get_ses_import_message(email: str) -> dict:
+        message = (
+            f"An account was created for {email}.\n"
+            f"Sign in and request a verification code to activate it."
+        )
+        subject = "Auth service: Your account"
+        return {
+            "message": message,
+            "subject": subject,
+        }
+
 
 msg_creator = MessageCreator()
@@ -0,0 +1,186 @@
+import os
+from typing import (
+    Any,
+    Iterable,
+)
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from auth_app.exeptions.custom import (
+    HashingError,
+    RateLimitError,
+    ServiceError,
+    TokenError,
+    TransactionError,
+    UserActivityError,
+    UserVerificationError,
+)
+
+# sub-millisecond work: JWT, Redis commands, pool checkout
+FAST_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+)
+# network round trips and whole requests
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+HASHING_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# enqueue to delivery: a poll interval when healthy, minutes on retries
+OUTBOX_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+
+class Children(dict):
+    """
+    Label children of a single-label metric, created up front for the
+    known values. A value seen for the first time gets its child once,
+    after that every sample is a dict lookup.
+    """
+
+    def __init__(
+        self,
+        metric: Any,
+        values: Iterable[str] = (),
+    ) -> None:
+        super().__init__((value, metric.labels(value)) for value in values)
+        self._metric = metric
+
+    def __missing__(self, value: str) -> Any:
+        child = self[value] = self._metric.labels(value)
+        return child
+
+
+request_latency = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+db_pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to get a connection from the pool, including connecting",
+    buckets=FAST_BUCKETS,
+)
+db_pool_in_use = Gauge(
+    "db_pool_connections_in_use",
+    "Connections checked out of the pool",
+    multiprocess_mode="livesum",
+)
+redis_latency = Histogram(
+    "redis_command_duration_seconds",
+    "Redis round trip by command, pipelines as PIPELINE",
+    ["command"],
+    buckets=FAST_BUCKETS,
+)
+ses_latency = Histogram(
+    "ses_call_duration_seconds",
+    "SES API call latency",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+hashing_latency = Histogram(
+    "password_hashing_duration_seconds",
+    "bcrypt time in the hashing pool, including the wait for a worker",
+    ["operation"],
+    buckets=HASHING_BUCKETS,
+)
+jwt_latency = Histogram(
+    "jwt_operation_duration_seconds",
+    "Token signing and verification time",
+    ["operation"],
+    buckets=FAST_BUCKETS,
+)
+outbox_delivery_latency = Histogram(
+    "outbox_delivery_latency_seconds",
+    "Time from enqueueing an email to its delivery, retries included",
+    buckets=OUTBOX_BUCKETS,
+)
+outbox_emails = Counter(
+    "outbox_emails_total",
+    "Outbox delivery attempts by outcome",
+    ["outcome"],
+)
+errors = Counter(
+    "app_errors_total",
+    "Errors by exception type",
+    ["exception"],
+)
+
+redis_commands = Children(
+    redis_latency,
+    ("HMGET", "EVALSHA", "SCRIPT LOAD", "PIPELINE", "PING"),
+)
+ses_calls = Children(ses_latency, ("send_email", "verify_email_identity"))
+hashing_calls = Children(hashing_latency, ("hash", "verify"))
+jwt_calls = Children(jwt_latency, ("encode", "decode"))
+outbox_outcomes = Children(
+    outbox_emails,
+    ("sent", "retried", "failed", "expired"),
+)
+error_counts = Children(
+    errors,
+    (
+        exc.__name__
+        for exc in (
+            HashingError,
+            RateLimitError,
+            ServiceError,
+            TokenError,
+            TransactionError,
+            UserActivityError,
+            UserVerificationError,
+        )
+    ),
+)
+
+
+def collect() -> bytes:
+    """
+    Text exposition of the metrics. With PROMETHEUS_MULTIPROC_DIR set
+    (several server workers) the samples of all workers are merged.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def mark_process_dead() -> None:
+    """
+    Drops the live gauges of the exiting worker in multiprocess mode
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
@@ -1,28 +1,145 @@
-from typing import Callable
+import logging
+from typing import (
+    Awaitable,
+    Callable,
+)
 
-from sqlalchemy.ext.asyncio import AsyncSession
-from starlette.middleware.base import BaseHTTPMiddleware
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+)
+from starlette import status
 from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.responses import JSONResponse
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
 
-from auth_app.db.connect_db import AsyncSessionLocal
+logger = logging.getLogger(__name__)
 
+COMMIT_FAILED = JSONResponse(
+    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+    content={"detail": "Transaction commit failed"},
+)
 
-class DBSessionMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        async with AsyncSessionLocal() as session:
-            request.state.db = session
+def after_commit(
+    session: AsyncSession,
+    callback: Callable[[], Awaitable[None]],
+) -> None:
+    """
+    Run the callback once the request transaction is committed.
+    It is dropped if the transaction is rolled back.
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+class LazySession:
+    """
+    Per-request holder that opens the session on first access.
+    Requests that never touch the database never create one.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> None:
+        self._session_factory = session_factory
+        self._session: AsyncSession | None = None
+        self._finished = False
+
+    def get(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    async def finish(self, commit: bool) -> None:
+        if self._session is None or self._finished:
+            return
+        self._finished = True
+        callbacks = self._session.info.pop("after_commit", [])
+        if not commit:
+            await self._session.rollback()
+            return
+        await self._session.commit()
+        for callback in callbacks:
             try:
-                async with session.begin():
-                    response = await call_next(request)
-            except Exception:
-                raise
-            return response
+                await callback()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("After-commit callback failed")
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class DBSessionMiddleware:
+    """
+    Pure ASGI middleware that provides a lazily created DB session.
+    The transaction is committed before the last response chunk is sent,
+    or rolled back on an error status or an unhandled exception.
+    The response start is held back until then, so a failed commit
+    still turns into a 500. Streamed responses send it with the first
+    chunk and can only be aborted.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        holder = LazySession(scope["app"].state.resources.session_factory)
+        scope.setdefault("state", {})["db_session"] = holder
+        status_code = 500
+        start: Message | None = None
+        failed = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, start, failed
+            if failed:
+                return
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                start = message
+                return
+            if message["type"] == "http.response.body":
+                if not message.get("more_body", False):
+                    try:
+                        await holder.finish(commit=status_code < 400)
+                    except Exception:  # pylint: disable=broad-exception-caught
+                        if start is None:
+                            # streamed, the status is already out
+                            raise
+                        logger.exception("Request transaction commit failed")
+                        failed = True
+                        await COMMIT_FAILED(scope, receive, send)
+                        return
+                if start is not None:
+                    await send(start)
+                    start = None
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            await holder.finish(commit=False)
+            raise
+        finally:
+            await holder.close()
 
 
-def get_db_from_request(request: Request) -> AsyncSession:
-    return request.state.db
+async def get_db_from_request(request: Request) -> AsyncSession:
+    return request.state.db_session.get()
@@ -0,0 +1,63 @@
+import time
+from typing import Any
+
+from starlette.types import (
+    ASGIApp,
+    Receive,
+    Scope,
+    Send,
+)
+
+from auth_app.metrics import (
+    error_counts,
+    request_latency,
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware observing the latency of every request
+    under its route template. The label children of all routes are
+    created on lifespan startup, a request only looks its child up.
+    Unhandled exceptions are counted by type.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._children: dict[Any, dict[str, Any]] = {}
+        self._unmatched = request_latency.labels("ANY", "unmatched")
+
+    def prepare(self, routes: list[Any]) -> None:
+        for route in routes:
+            endpoint = getattr(route, "endpoint", None)
+            methods = getattr(route, "methods", None)
+            if endpoint is None or not methods:
+                continue
+            self._children[endpoint] = {
+                method: request_latency.labels(method, route.path)
+                for method in methods
+            }
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if scope["type"] == "lifespan":
+            self.prepare(scope["app"].routes)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        except Exception as exc:
+            error_counts[type(exc).__name__].inc()
+            raise
+        finally:
+            # the router has put the matched endpoint into the scope
+            by_method = self._children.get(scope.get("endpoint"))
+            child = by_method.get(scope["method"]) if by_method else None
+            (child or self._unmatched).observe(time.perf_counter() - started)
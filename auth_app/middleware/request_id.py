@@ -0,0 +1,58 @@
+import uuid
+from contextvars import ContextVar
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+REQUEST_ID_HEADER = "x-request-id"
+
+request_id_ctx: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def _get_header(scope: Scope, name: str) -> str | None:
+    raw_name = name.encode("latin-1")
+    for key, value in scope["headers"]:
+        if key == raw_name:
+            return value.decode("latin-1")
+    return None
+
+
+class RequestIDMiddleware:
+    """
+    Pure ASGI middleware binding a request id to the current context.
+    Reuses the incoming X-Request-ID header or generates a new one
+    and echoes it back in the response.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _get_header(scope, REQUEST_ID_HEADER) or uuid.uuid4().hex
+        token = request_id_ctx.set(request_id)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_ctx.reset(token)
@@ -0,0 +1,80 @@
+from opentelemetry import (
+    context,
+    trace,
+)
+from opentelemetry.trace import (
+    SpanKind,
+    Status,
+    StatusCode,
+)
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+from auth_app.tracing import (
+    extract_context,
+    tracer,
+)
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware opening the SERVER span of every request.
+    Continues the trace of an incoming traceparent header, the span
+    is renamed after the matched route template once routing is done.
+    Everything the request does below becomes a child of this span.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        request_span = tracer.start_span(
+            method,
+            context=extract_context(scope["headers"]),
+            kind=SpanKind.SERVER,
+            attributes={
+                "http.request.method": method,
+                "url.path": scope["path"],
+            },
+        )
+        token = context.attach(trace.set_span_in_context(request_span))
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                request_span.set_attribute(
+                    "http.response.status_code",
+                    status_code,
+                )
+                if status_code >= 500:
+                    request_span.set_status(Status(StatusCode.ERROR))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            request_span.record_exception(exc)
+            request_span.set_status(Status(StatusCode.ERROR))
+            raise
+        finally:
+            route = scope.get("route")
+            if route is not None:
+                request_span.update_name(f"{method} {route.path}")
+                request_span.set_attribute("http.route", route.path)
+            request_span.end()
+            context.detach(token)
@@ -1,4 +1,5 @@
+from .outbox import EmailOutboxORM
 from .tokens import RefreshTokenORM
 from .users import UserORM
 
-__all__ = ["UserORM", "RefreshTokenORM"]
+__all__ = ["UserORM", "RefreshTokenORM", "EmailOutboxORM"]
@@ -1,11 +1,9 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import (
-    DateTime,
-    ForeignKey,
-    String,
-)
+from sqlalchemy import DateTime
+from sqlalchemy import Enum as Enum_Sql
+from sqlalchemy import ForeignKey, LargeBinary, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import (
     Mapped,
@@ -14,14 +12,18 @@ from sqlalchemy.orm import (
 )
 
 from auth_app.models.base import Base
+from auth_app.models.users import UserRole
 
 
 class RefreshTokenORM(Base):
     __tablename__ = "refresh_tokens"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    token: Mapped[str] = mapped_column(String, unique=True, nullable=False)
-    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, unique=True, index=True)
+    token_digest: Mapped[bytes] = mapped_column(LargeBinary, unique=True, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    # claims of the current token, a reissue keeps the role and revokes the jti
+    role: Mapped[UserRole | None] = mapped_column(Enum_Sql(UserRole), nullable=True)
+    jti: Mapped[str | None] = mapped_column(String, nullable=True)
 
     user: Mapped["UserORM"] = relationship("UserORM", back_populates="refresh_tokens")
@@ -1,9 +1,11 @@
 import uuid
+from datetime import datetime
 from enum import Enum
+from typing import NamedTuple
 
-from sqlalchemy import Boolean
+from sqlalchemy import Boolean, DateTime
 from sqlalchemy import Enum as Enum_Sql
-from sqlalchemy import String
+from sqlalchemy import Index, String, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import (
     Mapped,
@@ -21,14 +23,24 @@ class UserRole(str, Enum):
     OTHER = 'OTHER'
 
 
+class UserStatus(NamedTuple):
+    is_verified: bool
+    is_active: bool
+
+
 class UserORM(Base):
     __tablename__ = "users"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email: Mapped[str] = mapped_column(String, unique=True, nullable=False)
+    email: Mapped[str] = mapped_column(String, nullable=False)
     password_hash: Mapped[str] = mapped_column(String, nullable=False)
     role: Mapped[UserRole] = mapped_column(Enum_Sql(UserRole), nullable=False, default=UserRole.USER)
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=text("(now() AT TIME ZONE 'utc')"), index=True)
 
     refresh_tokens: Mapped[list["RefreshTokenORM"]] = relationship("RefreshTokenORM", back_populates="user")
+
+
+# emails are unique regardless of case
+Index("users_email_lower_key", func.lower(UserORM.email), unique=True)
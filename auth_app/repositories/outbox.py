@@ -0,0 +1,166 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+from uuid import UUID
+
+from sqlalchemy import (
+    insert,
+    or_,
+    select,
+    update,
+)
+
+from auth_app.models.outbox import (
+    EmailOutboxORM,
+    OutboxStatus,
+)
+from auth_app.repositories.base import BaseRepo
+from auth_app.schemes.email import EmailPayloadScheme
+
+
+class OutboxRepo(BaseRepo):
+
+    def enqueue(
+        self,
+        email_to: str,
+        payload: EmailPayloadScheme,
+        ttl: int | None = None,
+    ) -> EmailOutboxORM:
+        """
+        Add the email to the current transaction.
+        It is written together with the rest of the unit of work.
+        An email with a ttl is dropped if not delivered within it.
+        """
+        outbox_orm = EmailOutboxORM(
+            email_to=email_to,
+            subject=payload.subject,
+            message=payload.message,
+            source=payload.source,
+            expires_at=(
+                datetime.utcnow() + timedelta(seconds=ttl)
+                if ttl is not None
+                else None
+            ),
+        )
+        self.session.add(outbox_orm)
+        return outbox_orm
+
+    async def enqueue_many(
+        self,
+        emails: list[tuple[str, EmailPayloadScheme]],
+    ) -> None:
+        """
+        Bulk variant of enqueue written with a single executemany.
+        """
+        if not emails:
+            return
+        await self.session.execute(
+            insert(EmailOutboxORM),
+            [
+                {
+                    "email_to": email_to,
+                    "subject": payload.subject,
+                    "message": payload.message,
+                    "source": payload.source,
+                }
+                for email_to, payload in emails
+            ],
+        )
+
+    async def claim_batch(
+        self,
+        limit: int,
+        lease: timedelta,
+    ) -> list[EmailOutboxORM]:
+        """
+        Lock due rows with SKIP LOCKED and push their next attempt
+        past the lease, so concurrent workers never pick the same row.
+        """
+        now = datetime.utcnow()
+        due = (
+            select(EmailOutboxORM.id)
+            .where(
+                EmailOutboxORM.status == OutboxStatus.PENDING,
+                EmailOutboxORM.next_attempt_at <= now,
+                or_(
+                    EmailOutboxORM.expires_at.is_(None),
+                    EmailOutboxORM.expires_at > now,
+                ),
+            )
+            .order_by(EmailOutboxORM.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(EmailOutboxORM)
+            .where(EmailOutboxORM.id.in_(due.scalar_subquery()))
+            .values(
+                attempts=EmailOutboxORM.attempts + 1,
+                next_attempt_at=now + lease,
+            )
+            .returning(EmailOutboxORM)
+        )
+        rows = await self.session.execute(stmt)
+        return list(rows.scalars().all())
+
+    async def expire_pending(self, now: datetime) -> int:
+        """
+        Give up on the emails whose ttl passed before delivery
+        and drop their content.
+        """
+        stmt = (
+            update(EmailOutboxORM)
+            .where(
+                EmailOutboxORM.status == OutboxStatus.PENDING,
+                EmailOutboxORM.expires_at <= now,
+            )
+            .values(
+                status=OutboxStatus.FAILED,
+                message=None,
+                last_error="Expired before delivery",
+            )
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
+    async def mark_sent(
+        self,
+        ids: list[UUID],
+        sent_at: datetime,
+    ) -> None:
+        if not ids:
+            return
+        stmt = (
+            update(EmailOutboxORM)
+            .where(EmailOutboxORM.id.in_(ids))
+            .values(
+                status=OutboxStatus.SENT,
+                sent_at=sent_at,
+                last_error=None,
+                message=None,
+            )
+        )
+        await self.session.execute(stmt)
+
+    async def mark_failed(
+        self,
+        outbox_id: UUID,
+        error: str,
+        next_attempt_at: datetime | None,
+    ) -> None:
+        """
+        Schedule a retry, or give up when next_attempt_at is None.
+        """
+        values: dict = {"last_error": error}
+        if next_attempt_at is None:
+            values["status"] = OutboxStatus.FAILED
+            values["message"] = None
+        else:
+            values["next_attempt_at"] = next_attempt_at
+        stmt = (
+            update(EmailOutboxORM)
+            .where(EmailOutboxORM.id == outbox_id)
+            .values(**values)
+        )
+        await self.session.execute(stmt)
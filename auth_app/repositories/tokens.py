@@ -1,9 +1,16 @@
+import hashlib
+from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy import (
+    ColumnClause,
+    Delete,
+    delete,
+    literal_column,
     select,
     update,
 )
+from sqlalchemy.dialects.postgresql import insert
 
 from auth_app.models.tokens import RefreshTokenORM
 from auth_app.repositories.base import BaseRepo
@@ -11,27 +18,52 @@ from auth_app.schemes.tokens import (
     CreateRefreshScheme,
     UpdateRefreshScheme,
 )
+from auth_app.tracing import traced
 
 
+def _token_digest(token: str) -> bytes:
+    """
+    Refresh tokens are stored and looked up by SHA-256 digest only.
+    """
+    return hashlib.sha256(token.encode()).digest()
+
+
+@traced
 class TokenRepo(BaseRepo):
 
     async def create_refresh(
         self,
         create_data: CreateRefreshScheme,
-    ) -> RefreshTokenORM:
-        token_orm = RefreshTokenORM(**create_data.model_dump())
-        self.session.add(token_orm)
-        await self.session.flush()
-        await self.session.refresh(token_orm)
-        return token_orm
+    ) -> RefreshTokenORM | None:
+        """
+        Single INSERT ... RETURNING.
+        Returns None when the user already has a refresh token.
+        """
+        stmt = (
+            insert(RefreshTokenORM)
+            .values(
+                user_id=create_data.user_id,
+                token_digest=_token_digest(create_data.token),
+                expires_at=create_data.expires_at,
+                role=create_data.role,
+                jti=create_data.jti,
+            )
+            .on_conflict_do_nothing(index_elements=[RefreshTokenORM.user_id])
+            .returning(RefreshTokenORM)
+        )
+        token_orm = await self.session.execute(stmt)
+        return token_orm.scalar_one_or_none()
 
     async def get_refresh(
         self,
         user_id: UUID,
+        for_update: bool = False,
     ) -> RefreshTokenORM | None:
         stmt = select(RefreshTokenORM).where(
             RefreshTokenORM.user_id == str(user_id)
         )
+        if for_update:
+            stmt = stmt.with_for_update()
         token_orm = await self.session.execute(stmt)
         return token_orm.scalar_one_or_none()
 
@@ -42,10 +74,86 @@ class TokenRepo(BaseRepo):
     ) -> RefreshTokenORM | None:
         stmt = (
             update(RefreshTokenORM)
-            .where(RefreshTokenORM.token == old_token)
-            .values(**update_data.model_dump())
+            .where(RefreshTokenORM.token_digest == _token_digest(old_token))
+            .values(
+                token_digest=_token_digest(update_data.token),
+                expires_at=update_data.expires_at,
+                jti=update_data.jti,
+            )
+            .returning(RefreshTokenORM)
+        )
+
+        token_orm = await self.session.execute(stmt)
+        return token_orm.scalar_one_or_none()
+
+    async def update_user_refresh(
+        self,
+        user_id: UUID,
+        update_data: UpdateRefreshScheme,
+    ) -> RefreshTokenORM | None:
+        stmt = (
+            update(RefreshTokenORM)
+            .where(RefreshTokenORM.user_id == str(user_id))
+            .values(
+                token_digest=_token_digest(update_data.token),
+                expires_at=update_data.expires_at,
+                jti=update_data.jti,
+            )
             .returning(RefreshTokenORM)
         )
 
         token_orm = await self.session.execute(stmt)
         return token_orm.scalar_one_or_none()
+
+    async def delete_refresh(
+        self,
+        token: str,
+    ) -> UUID | None:
+        stmt = (
+            delete(RefreshTokenORM)
+            .where(RefreshTokenORM.token_digest == _token_digest(token))
+            .returning(RefreshTokenORM.user_id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def delete_user_refresh(
+        self,
+        user_id: UUID,
+    ) -> UUID | None:
+        stmt = (
+            delete(RefreshTokenORM)
+            .where(RefreshTokenORM.user_id == str(user_id))
+            .returning(RefreshTokenORM.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    def _purge_statement(
+        expired_before: datetime,
+        limit: int,
+    ) -> Delete:
+        ctid: ColumnClause[str] = literal_column("ctid")
+        batch = (
+            select(ctid)
+            .select_from(RefreshTokenORM)
+            .where(RefreshTokenORM.expires_at < expired_before)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return delete(RefreshTokenORM).where(ctid.in_(batch.scalar_subquery()))
+
+    async def purge_expired_batch(
+        self,
+        expired_before: datetime,
+        limit: int,
+    ) -> int:
+        """
+        Deletes up to limit expired rows addressed by ctid.
+        Rows locked by a concurrent exchange or purge are skipped.
+        """
+        result = await self.session.execute(
+            self._purge_statement(expired_before, limit)
+        )
+        return result.rowcount
@@ -1,21 +1,106 @@
-from typing import cast
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    NamedTuple,
+    Sequence,
+    cast,
+)
 from uuid import UUID
 
 from sqlalchemy import (
+    Row,
+    Select,
+    String,
+    bindparam,
+    func,
     select,
+    text,
     update,
 )
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection
 
-from auth_app.models.users import UserORM
+from auth_app.models.users import (
+    UserORM,
+    UserRole,
+    UserStatus,
+)
 from auth_app.repositories.base import BaseRepo
 from auth_app.schemes.users import (
     CreateUserExtendedScheme,
 )
 from auth_app.services.utils.pwd_hashing import (
-    hash_password,
+    hash_password_async,
 )
+from auth_app.tracing import traced
+
+
+class AuthUserRow(NamedTuple):
+    id: UUID
+    email: str
+    password_hash: str
+    role: UserRole
+    is_verified: bool
+    is_active: bool
 
 
+_users = UserORM.__table__
+# Built once: plain Core columns skip ORM entity loading and
+# the statement's compiled form is reused from the engine cache.
+_auth_row_by_email = (
+    select(
+        _users.c.id,
+        _users.c.email,
+        _users.c.password_hash,
+        _users.c.role,
+        _users.c.is_verified,
+        _users.c.is_active,
+    )
+    .where(func.lower(_users.c.email) == bindparam("email", type_=String))
+    .limit(2)
+)
+
+_IMPORT_COLUMNS = ("line", "id", "email", "password_hash", "role")
+_create_import_staging = text(
+    "CREATE TEMP TABLE IF NOT EXISTS users_import ("
+    "line integer, id uuid, email varchar, password_hash varchar, "
+    "role userrole) ON COMMIT DROP"
+)
+_upsert_from_import_staging = text(
+    "INSERT INTO users (id, email, password_hash, role, is_verified, "
+    "is_active) "
+    "SELECT id, email, password_hash, role, false, true "
+    "FROM users_import ORDER BY line "
+    "ON CONFLICT (lower(email)) DO NOTHING "
+    "RETURNING id"
+)
+_truncate_import_staging = text("TRUNCATE users_import")
+
+# password_hash never leaves the service
+EXPORT_COLUMNS = (
+    _users.c.id,
+    _users.c.email,
+    _users.c.role,
+    _users.c.is_verified,
+    _users.c.is_active,
+    _users.c.updated_at,
+)
+
+
+async def _driver_connection(conn: AsyncConnection) -> Any:
+    """
+    The asyncpg connection under conn, for COPY
+    """
+    raw_conn = await conn.get_raw_connection()
+    if raw_conn.driver_connection is None:
+        raise ConnectionError("The database connection is closed")
+    return raw_conn.driver_connection
+
+
+@traced
 class UserRepo(BaseRepo):
     @staticmethod
     def _build_filter_condition(
@@ -23,6 +108,10 @@ class UserRepo(BaseRepo):
     ) -> list:
         conditions = []
         for k, v in filter_dict.items():
+            if k == "email":
+                # matches the users_email_lower_key functional index
+                conditions.append(func.lower(UserORM.email) == v.lower())
+                continue
             column = getattr(UserORM, k, None)
             conditions.append(column == v)
         return conditions
@@ -30,18 +119,24 @@ class UserRepo(BaseRepo):
     async def create_user(
         self,
         create_data: CreateUserExtendedScheme,
-    ) -> UserORM:
-
+    ) -> UserORM | None:
+        """
+        Single INSERT ... RETURNING.
+        Returns None when the email is already taken.
+        """
         data = create_data.model_dump()
         data.pop("admin_code", None)
-        data['password_hash'] = hash_password(data.get('password_hash'))
-        user_orm = UserORM(**data)
-
-        self.session.add(user_orm)
-        await self.session.flush()
-        await self.session.refresh(user_orm)
-
-        return user_orm
+        data['password_hash'] = await hash_password_async(
+            data['password_hash']
+        )
+        stmt = (
+            insert(UserORM)
+            .values(**data)
+            .on_conflict_do_nothing(index_elements=[func.lower(UserORM.email)])
+            .returning(UserORM)
+        )
+        user_orm = await self.session.execute(stmt)
+        return user_orm.scalar_one_or_none()
 
     async def get_user(
         self,
@@ -51,6 +146,33 @@ class UserRepo(BaseRepo):
         user_orm = await self.session.execute(stmt)
         return user_orm.scalar_one_or_none()
 
+    async def get_user_status(
+        self,
+        user_id: UUID | str,
+    ) -> UserStatus | None:
+        stmt = select(_users.c.is_verified, _users.c.is_active).where(
+            _users.c.id == user_id
+        )
+        result = await self.session.execute(stmt)
+        row = result.first()
+        return UserStatus._make(row) if row else None
+
+    async def get_auth_row_by_email(
+        self,
+        email: str,
+    ) -> AuthUserRow | None:
+        """
+        None unless exactly one account has the email in any case.
+        users_email_lower_key rules out several, an ambiguous match
+        is never authenticated as an arbitrary one of them.
+        """
+        result = await self.session.execute(
+            _auth_row_by_email,
+            {"email": email.lower()},
+        )
+        rows = result.all()
+        return AuthUserRow._make(rows[0]) if len(rows) == 1 else None
+
     async def get_users(
         self,
         filter_dict: dict | None,
@@ -63,6 +185,130 @@ class UserRepo(BaseRepo):
         users_orm = await self.session.execute(stmt)
         return cast(list, users_orm.scalars().all())
 
+    def _page_statement(
+        self,
+        filter_dict: dict | None,
+        after_id: UUID | None,
+    ) -> Select:
+        conditions = self._build_filter_condition(
+            filter_dict=filter_dict or {}
+        )
+        if after_id is not None:
+            conditions.append(UserORM.id > after_id)
+        stmt = select(UserORM).order_by(UserORM.id)
+        if conditions:
+            stmt = stmt.where(*conditions)
+        return stmt
+
+    async def get_users_page(
+        self,
+        filter_dict: dict | None,
+        limit: int,
+        after_id: UUID | None = None,
+    ) -> list[UserORM]:
+        """
+        Keyset page ordered by id. One extra row is fetched
+        so the caller can tell whether a next page exists.
+        """
+        stmt = self._page_statement(filter_dict, after_id).limit(limit + 1)
+        users_orm = await self.session.execute(stmt)
+        return cast(list, users_orm.scalars().all())
+
+    async def stream_users(
+        self,
+        filter_dict: dict | None,
+        after_id: UUID | None = None,
+        yield_per: int = 500,
+    ) -> AsyncIterator[UserORM]:
+        """
+        Read matching users through a server-side cursor,
+        holding at most one batch in memory.
+        """
+        stmt = self._page_statement(filter_dict, after_id)
+        result = await self.session.stream_scalars(
+            stmt,
+            execution_options={"yield_per": yield_per},
+        )
+        async for user_orm in result:
+            yield user_orm
+
+    async def import_users_batch(
+        self,
+        records: list[tuple],
+    ) -> set[UUID]:
+        """
+        COPY the records into a transaction-scoped staging table and
+        move them into users, skipping emails that already exist.
+        Records follow _IMPORT_COLUMNS; returns ids of inserted users.
+        """
+        conn = await self.session.connection()
+        await conn.execute(_create_import_staging)
+        driver_conn = await _driver_connection(conn)
+        await driver_conn.copy_records_to_table(
+            "users_import",
+            records=records,
+            columns=_IMPORT_COLUMNS,
+        )
+        result = await conn.execute(_upsert_from_import_staging)
+        inserted = set(result.scalars().all())
+        await conn.execute(_truncate_import_staging)
+        return inserted
+
+    @staticmethod
+    def _export_statement(
+        changed_since: datetime | None,
+        until: datetime | None = None,
+    ) -> Select:
+        stmt = select(*EXPORT_COLUMNS).order_by(
+            _users.c.updated_at,
+            _users.c.id,
+        )
+        if changed_since is not None:
+            stmt = stmt.where(_users.c.updated_at >= changed_since)
+        if until is not None:
+            stmt = stmt.where(_users.c.updated_at < until)
+        return stmt
+
+    async def stream_export_rows(
+        self,
+        changed_since: datetime | None,
+        until: datetime | None = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Export rows as plain tuples in batches of yield_per,
+        read through a server-side cursor.
+        """
+        stmt = self._export_statement(changed_since, until)
+        result = await self.session.stream(
+            stmt.execution_options(yield_per=yield_per)
+        )
+        async for rows in result.partitions():
+            yield rows
+
+    async def copy_export_csv(
+        self,
+        changed_since: datetime | None,
+        output: Callable[[bytes], Awaitable[None]],
+        until: datetime | None = None,
+    ) -> None:
+        """
+        Let PostgreSQL render the export as CSV with COPY and pass
+        the raw chunks to output, skipping row decoding entirely.
+        """
+        conn = await self.session.connection()
+        query = self._export_statement(changed_since, until).compile(
+            dialect=conn.dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+        driver_conn = await _driver_connection(conn)
+        await driver_conn.copy_from_query(
+            str(query),
+            output=output,
+            format="csv",
+            header=True,
+        )
+
     async def update_user(
         self,
         user_id: UUID,
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter
+from redis.asyncio import ConnectionPool
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
+
+from auth_app.config import (
+    get_outbox_settings,
+    get_pg_settings,
+    get_redis_settings,
+    get_token_purge_settings,
+)
+from auth_app.db.connect_db import (
+    create_db_engine,
+    create_session_factory,
+)
+from auth_app.db.connect_redis import (
+    TimedRedis,
+    create_redis_pool,
+)
+from auth_app.services.outbox import OutboxWorker
+from auth_app.services.ses.clients import SesClientProvider
+from auth_app.services.ses.ses_handler import ses_handler
+from auth_app.services.token_purge import TokenPurgeJob
+from auth_app.services.utils.introspection import TokenIntrospector
+from auth_app.services.utils.key_ring import KeyRing
+from auth_app.services.utils.otp_store import OTPStore
+from auth_app.services.utils.pwd_hashing import (
+    HashingPool,
+    default_hashing_pool,
+)
+from auth_app.services.utils.rate_limit import RateLimiter
+from auth_app.services.utils.revocation import RevocationList
+from auth_app.services.utils.token_handler import TokenHandler
+from auth_app.services.utils.user_status_cache import UserStatusCache
+from auth_app.tracing import (
+    get_span_exporter,
+    get_tracer_provider,
+    tracing_enabled,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Resources:
+    """
+    Process-wide resources of the application, created in the lifespan
+    and reached by requests through app.state.resources.
+    start() warms up every pool before the server reports readiness,
+    close() releases everything in reverse order.
+    """
+
+    def __init__(self) -> None:
+        self.span_exporter: SpanExporter | None = None
+        self.tracer_provider: TracerProvider | None = None
+        if tracing_enabled():
+            self.span_exporter = get_span_exporter()
+            self.tracer_provider = get_tracer_provider()
+        self.engine: AsyncEngine = create_db_engine()
+        self.session_factory: async_sessionmaker[AsyncSession] = (
+            create_session_factory(self.engine)
+        )
+        self.redis_pool: ConnectionPool = create_redis_pool()
+        self.ses_provider = SesClientProvider()
+        self.hashing_pool: HashingPool = default_hashing_pool()
+        self.key_ring = KeyRing.from_settings()
+        self.token_handler = TokenHandler(self.key_ring)
+        self.token_introspector = TokenIntrospector(self.token_handler)
+        self.user_status_cache = UserStatusCache(self.redis())
+        self.revocation_list = RevocationList(self.redis())
+        self.rate_limiter = RateLimiter(self.redis())
+        self.otp_store = OTPStore(self.redis())
+        self.outbox_worker = OutboxWorker(
+            self.session_factory,
+            self.ses_provider,
+        )
+        self.token_purge_job = TokenPurgeJob(self.session_factory)
+
+    def redis(self) -> Redis:
+        return TimedRedis(connection_pool=self.redis_pool)
+
+    async def start(self) -> None:
+        await self.warm_up()
+        await self.user_status_cache.start()
+        await self.revocation_list.start()
+        await ses_handler.verify_sender(await self.ses_provider.get_client())
+        if get_outbox_settings().OUTBOX_ENABLED:
+            self.outbox_worker.start()
+        if get_token_purge_settings().TOKEN_PURGE_ENABLED:
+            self.token_purge_job.start()
+
+    async def close(self) -> None:
+        await self.token_purge_job.stop()
+        await self.outbox_worker.stop()
+        await self.ses_provider.close()
+        await self.revocation_list.stop()
+        await self.user_status_cache.stop()
+        await self.redis_pool.aclose()
+        await self.engine.dispose()
+        self.hashing_pool.shutdown()
+        if self.tracer_provider is not None:
+            # exports the spans still queued, the provider itself
+            # outlives the lifespan and is shut down at exit
+            self.tracer_provider.force_flush()
+
+    async def warm_up(self) -> None:
+        """
+        Opens the pooled connections and spawns the hashing workers,
+        so the first requests after a deploy don't pay for them.
+        A failed step is logged, the resource then connects lazily.
+        """
+        redis_settings = get_redis_settings()
+        steps = {
+            "postgres": self._warm_db(get_pg_settings().POSTGRES_POOL_SIZE),
+            "redis": self._warm_redis(redis_settings.REDIS_WARM_CONNECTIONS),
+            "hashing pool": self.hashing_pool.warm_up(),
+            "ses": self.ses_provider.get_client(),
+        }
+        started = time.perf_counter()
+        results = await asyncio.gather(*steps.values(), return_exceptions=True)
+        for name, result in zip(steps, results):
+            if isinstance(result, Exception):
+                logger.warning("Warm-up of %s failed: %r", name, result)
+        logger.info(
+            "Resources warmed up in %.3fs",
+            time.perf_counter() - started,
+        )
+
+    async def _warm_db(self, size: int) -> None:
+        connections = await asyncio.gather(
+            *(self.engine.connect() for _ in range(size))
+        )
+        try:
+            await asyncio.gather(
+                *(conn.exec_driver_sql("SELECT 1") for conn in connections)
+            )
+        finally:
+            await asyncio.gather(*(conn.close() for conn in connections))
+
+    async def _warm_redis(self, size: int) -> None:
+        size = min(size, get_redis_settings().REDIS_MAX_CONNECTIONS)
+        await asyncio.gather(*(self.redis().ping() for _ in range(size)))
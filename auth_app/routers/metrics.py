@@ -0,0 +1,25 @@
+from fastapi import (
+    APIRouter,
+    Response,
+    status,
+)
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from auth_app.metrics import collect
+
+metrics_router = APIRouter(
+    tags=['service'],
+)
+
+
+@metrics_router.get(
+    path='/metrics',
+    description='Prometheus metrics of the process',
+    status_code=status.HTTP_200_OK,
+    include_in_schema=False,
+)
+async def get_metrics() -> Response:
+    return Response(
+        content=collect(),
+        media_type=CONTENT_TYPE_LATEST,
+    )
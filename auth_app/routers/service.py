@@ -0,0 +1,60 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    status,
+)
+
+from auth_app.db.connect_db import query_stats
+from auth_app.dependencies import (
+    get_hashing_pool,
+    get_token_handler,
+)
+from auth_app.schemes.service import (
+    HashingPoolStatsScheme,
+    QueryStatsScheme,
+)
+from auth_app.services.utils.pwd_hashing import HashingPool
+from auth_app.services.utils.token_handler import (
+    TokenData,
+    TokenHandler,
+    get_current_token_payload,
+)
+
+service_router = APIRouter(
+    prefix='/service',
+    tags=['service'],
+)
+
+
+@service_router.get(
+    path='/hashing-pool',
+    response_model=HashingPoolStatsScheme,
+    description='Get password hashing pool saturation metrics',
+    status_code=status.HTTP_200_OK,
+)
+async def get_hashing_pool_stats(
+    token_data: TokenData = Depends(get_current_token_payload),
+    token_handler: TokenHandler = Depends(get_token_handler),
+    hashing_pool: HashingPool = Depends(get_hashing_pool),
+) -> HashingPoolStatsScheme:
+    token_handler.verify_admin(token_data.token)
+    return HashingPoolStatsScheme.model_validate(hashing_pool.stats())
+
+
+@service_router.get(
+    path='/query-stats',
+    response_model=list[QueryStatsScheme],
+    description='Get per-statement latency aggregates, slowest first',
+    status_code=status.HTTP_200_OK,
+)
+async def get_query_stats(
+    limit: int = Query(default=50, ge=1, le=1000),
+    token_data: TokenData = Depends(get_current_token_payload),
+    token_handler: TokenHandler = Depends(get_token_handler),
+) -> list[QueryStatsScheme]:
+    token_handler.verify_admin(token_data.token)
+    return [
+        QueryStatsScheme.model_validate(item)
+        for item in query_stats.snapshot()[:limit]
+    ]
@@ -1,4 +1,6 @@
+import logging
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import (
     APIRouter,
@@ -8,43 +10,68 @@ from fastapi import (
     status,
 )
 
-from auth_app.dependencies import get_token_service
+from auth_app.dependencies import (
+    get_revocation_list,
+    get_token_handler,
+    get_token_introspector,
+    get_token_service,
+)
+from auth_app.exeptions.custom import ServiceError
 from auth_app.schemes.tokens import (
     GetAccessScheme,
     GetRefreshScheme,
+    IntrospectRequestScheme,
+    IntrospectResponseScheme,
+    ReissueRefreshScheme,
+    RevocationScheme,
+    RevokeTokenScheme,
     RoleDataScheme,
 )
-from auth_app.schemes.users import (
-    AuthUserScheme,
-)
 from auth_app.services.tokens import (
     TokenService,
 )
+from auth_app.services.utils.introspection import TokenIntrospector
+from auth_app.services.utils.rate_limit import (
+    Rate,
+    RateLimit,
+)
+from auth_app.services.utils.revocation import RevocationList
 from auth_app.services.utils.token_handler import (
     TokenData,
+    TokenHandler,
     get_current_token_payload,
 )
 
+logger = logging.getLogger(__name__)
+
 token_router = APIRouter(
     prefix='/tokens',
     tags=['tokens'],
 )
 
+# credential checks run bcrypt, both routes share the buckets
+login_rate_limit = RateLimit(
+    scope='login',
+    per_ip=Rate(capacity=20, period=60),
+    per_email=Rate(capacity=5, period=300),
+    overall=Rate(capacity=200, period=1),
+)
+
 
 @token_router.post(
     path='/refresh/get',
     response_model=GetRefreshScheme,
-    description='Get refresh token for the user',
+    description='Reissue the refresh token of the user',
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(login_rate_limit)],
 )
 async def get_refresh(
-    auth_data: Annotated[AuthUserScheme, Body()],
+    auth_data: Annotated[ReissueRefreshScheme, Body()],
     token_service: TokenService = Depends(get_token_service),
 ) -> GetRefreshScheme:
-    token = await token_service.get_refresh_token(
+    return await token_service.get_refresh_token(
         auth_data=auth_data,
     )
-    return GetRefreshScheme.model_validate(token)
 
 
 @token_router.post(
@@ -52,6 +79,7 @@ async def get_refresh(
     response_model=GetRefreshScheme,
     description='Generate refresh token for the user',
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(login_rate_limit)],
 )
 async def create_refresh(
     auth_data: Annotated[RoleDataScheme, Body()],
@@ -62,11 +90,11 @@ async def create_refresh(
             auth_data=auth_data,
         )
     except Exception as e:
-        print(f"[DEBUG] Token creation failed: {e}")
+        logger.warning("Token creation failed: %r", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}"
         ) from e
-    return GetRefreshScheme.model_validate(token, from_attributes=True)
+    return token
 
 
 @token_router.get(
@@ -79,10 +107,9 @@ async def exchange_refresh(
     token_data: TokenData = Depends(get_current_token_payload),
     token_service: TokenService = Depends(get_token_service),
 ) -> GetRefreshScheme:
-    token = await token_service.exchange_refresh_token(
+    return await token_service.exchange_refresh_token(
         token_data=token_data,
     )
-    return GetRefreshScheme.model_validate(token)
 
 
 @token_router.post(
@@ -99,3 +126,59 @@ async def create_access(
         token_data=token_data,
     )
     return GetAccessScheme(message=token)
+
+
+@token_router.post(
+    path='/introspect',
+    response_model=IntrospectResponseScheme,
+    description='Validate a batch of tokens without a database lookup',
+    status_code=status.HTTP_200_OK,
+)
+async def introspect(
+    request_data: Annotated[IntrospectRequestScheme, Body()],
+    revocations: RevocationList = Depends(get_revocation_list),
+    token_introspector: TokenIntrospector = Depends(get_token_introspector),
+) -> IntrospectResponseScheme:
+    results = await token_introspector.introspect_many(
+        request_data.tokens,
+        revocations,
+    )
+    return IntrospectResponseScheme(results=results)
+
+
+@token_router.post(
+    path='/revoke',
+    response_model=RevocationScheme,
+    description='Revoke a refresh or access token before it expires',
+    status_code=status.HTTP_200_OK,
+)
+async def revoke_token(
+    request_data: Annotated[RevokeTokenScheme, Body()],
+    token_data: TokenData = Depends(get_current_token_payload),
+    token_handler: TokenHandler = Depends(get_token_handler),
+    token_service: TokenService = Depends(get_token_service),
+) -> RevocationScheme:
+    token_handler.verify_admin(token_data.token)
+    try:
+        return await token_service.revoke_token(token=request_data.token)
+    except ServiceError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+
+@token_router.post(
+    path='/revoke/users/{user_id}',
+    response_model=RevocationScheme,
+    description='Revoke every token issued to the user so far',
+    status_code=status.HTTP_200_OK,
+)
+async def revoke_user_tokens(
+    user_id: UUID,
+    token_data: TokenData = Depends(get_current_token_payload),
+    token_handler: TokenHandler = Depends(get_token_handler),
+    token_service: TokenService = Depends(get_token_service),
+) -> RevocationScheme:
+    token_handler.verify_admin(token_data.token)
+    return await token_service.revoke_user_tokens(user_id=user_id)
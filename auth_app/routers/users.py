@@ -1,4 +1,9 @@
-from typing import Annotated
+from datetime import datetime
+from typing import (
+    Annotated,
+    AsyncIterator,
+    Optional,
+)
 
 from fastapi import (
     APIRouter,
@@ -6,24 +11,46 @@ from fastapi import (
     Depends,
     HTTPException,
     Query,
+    Request,
     status,
 )
+from fastapi.responses import StreamingResponse
 
-from auth_app.dependencies import get_user_service
+from auth_app.dependencies import (
+    get_token_handler,
+    get_user_export_service,
+    get_user_import_service,
+    get_user_service,
+)
+from auth_app.exeptions.custom import ImportFormatError
+from auth_app.models.users import UserORM
 from auth_app.schemes.users import (
     CreateResponseScheme,
     CreateUserExtendedScheme,
+    ExportFormatEnum,
     GetUserScheme,
     MessageResponseScheme,
-    UserFilterScheme,
+    UserImportResultScheme,
+    UserListQueryScheme,
+    UserPageScheme,
+)
+from auth_app.services.user_export import UserExportService
+from auth_app.services.user_import import (
+    IMPORT_PARSERS,
+    UserImportService,
+    iter_lines,
 )
 from auth_app.services.users import (
     UserService,
 )
+from auth_app.services.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+)
 from auth_app.services.utils.token_handler import (
     TokenData,
+    TokenHandler,
     get_current_token_payload,
-    token_handler,
 )
 
 user_router = APIRouter(
@@ -51,6 +78,74 @@ async def create_user(
     return CreateResponseScheme.model_validate(user)
 
 
+@user_router.post(
+    path="/import",
+    response_model=UserImportResultScheme,
+    description="Bulk import users from a CSV or NDJSON stream",
+    status_code=status.HTTP_200_OK,
+)
+async def import_users(
+    request: Request,
+    send_verification: bool = Query(default=False),
+    token_data: TokenData = Depends(get_current_token_payload),
+    token_handler: TokenHandler = Depends(get_token_handler),
+    import_service: UserImportService = Depends(get_user_import_service),
+) -> UserImportResultScheme:
+    token_handler.verify_admin(token_data.token)
+    content_type = request.headers.get('content-type', '')
+    parser = IMPORT_PARSERS.get(content_type.split(';')[0].strip())
+    if parser is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Supported types: {', '.join(IMPORT_PARSERS)}",
+        )
+    try:
+        return await import_service.import_users(
+            records=parser(iter_lines(request.stream())),
+            send_verification=send_verification,
+        )
+    except ImportFormatError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+
+@user_router.get(
+    path="/export",
+    description=(
+        "Stream users ordered by updated_at for the warehouse sync. "
+        "changed_since is inclusive, pass the X-Export-Watermark "
+        "header of the previous export"
+    ),
+    status_code=status.HTTP_200_OK,
+)
+async def export_users(
+    export_format: ExportFormatEnum = Query(
+        default=ExportFormatEnum.NDJSON,
+        alias='format',
+    ),
+    changed_since: Optional[datetime] = Query(default=None),
+    token_data: TokenData = Depends(get_current_token_payload),
+    token_handler: TokenHandler = Depends(get_token_handler),
+    export_service: UserExportService = Depends(get_user_export_service),
+) -> StreamingResponse:
+    token_handler.verify_admin(token_data.token)
+    until = export_service.watermark()
+    headers = {'X-Export-Watermark': until.isoformat()}
+    if export_format == ExportFormatEnum.CSV:
+        return StreamingResponse(
+            export_service.csv(changed_since=changed_since, until=until),
+            media_type='text/csv',
+            headers=headers,
+        )
+    return StreamingResponse(
+        export_service.ndjson(changed_since=changed_since, until=until),
+        media_type='application/x-ndjson',
+        headers=headers,
+    )
+
+
 @user_router.get(
     path="/verification/get-code",
     response_model=MessageResponseScheme,
@@ -124,27 +219,71 @@ async def get_user(
 
 @user_router.get(
     path='/',
-    response_model=list[GetUserScheme],
-    description="Get users",
+    response_model=UserPageScheme,
+    description="Get users page by page, or stream them as NDJSON",
     status_code=status.HTTP_200_OK,
 )
 async def get_users(
-    filter_model: Annotated[UserFilterScheme, Query()],
+    query: Annotated[UserListQueryScheme, Query()],
     token_data: TokenData = Depends(get_current_token_payload),
+    token_handler: TokenHandler = Depends(get_token_handler),
     user_service: UserService = Depends(get_user_service),
-) -> list[GetUserScheme]:
+) -> UserPageScheme | StreamingResponse:
     user_repo = user_service.user_repo
     token_handler.verify_admin(token_data.token)
-    filter_dict = filter_model.model_dump(
+    filter_dict = query.model_dump(
         exclude_unset=True,
         exclude_defaults=True,
+        exclude={'limit', 'cursor', 'stream'},
     )
-    users = await user_repo.get_users(
+    try:
+        after_id = decode_cursor(query.cursor) if query.cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+    if query.stream:
+        return StreamingResponse(
+            _users_ndjson(
+                user_repo.stream_users(
+                    filter_dict=filter_dict,
+                    after_id=after_id,
+                )
+            ),
+            media_type='application/x-ndjson',
+        )
+
+    users = await user_repo.get_users_page(
         filter_dict=filter_dict,
+        limit=query.limit,
+        after_id=after_id,
     )
     if not users:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='Relevant users not found',
         )
-    return [GetUserScheme.model_validate(user) for user in users]
+    next_cursor = None
+    if len(users) > query.limit:
+        users = users[: query.limit]
+        next_cursor = encode_cursor(users[-1].id)
+    return UserPageScheme(
+        items=[GetUserScheme.model_validate(user) for user in users],
+        next_cursor=next_cursor,
+    )
+
+
+async def _users_ndjson(
+    users: AsyncIterator[UserORM],
+    chunk_size: int = 100,
+) -> AsyncIterator[str]:
+    lines = []
+    async for user in users:
+        lines.append(GetUserScheme.model_validate(user).model_dump_json())
+        if len(lines) >= chunk_size:
+            yield '\n'.join(lines) + '\n'
+            lines.clear()
+    if lines:
+        yield '\n'.join(lines) + '\n'
@@ -0,0 +1,42 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+    Request,
+    Response,
+    status,
+)
+
+from auth_app.config import get_jwt_settings
+from auth_app.dependencies import get_key_ring
+from auth_app.services.utils.key_ring import KeyRing
+
+well_known_router = APIRouter(
+    prefix='/.well-known',
+    tags=['well-known'],
+)
+
+
+@well_known_router.get(
+    path='/jwks.json',
+    description='Public keys for local verification of issued tokens',
+    status_code=status.HTTP_200_OK,
+)
+async def get_jwks(
+    request: Request,
+    key_ring: KeyRing = Depends(get_key_ring),
+) -> Response:
+    max_age = get_jwt_settings().JWT_JWKS_MAX_AGE
+    headers = {
+        'Cache-Control': f'public, max-age={max_age}',
+        'ETag': key_ring.jwks_etag,
+    }
+    if request.headers.get('if-none-match') == key_ring.jwks_etag:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers,
+        )
+    return Response(
+        content=key_ring.jwks_body,
+        media_type='application/json',
+        headers=headers,
+    )
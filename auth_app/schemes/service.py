@@ -0,0 +1,76 @@
+from pydantic import (
+    BaseModel,
+    Field,
+)
+
+
+class HashingPoolStatsScheme(BaseModel):
+    size: int = Field(
+        description='Number of hashing worker processes',
+        example=4,
+    )
+    max_queue: int = Field(
+        description='Max number of tasks waiting for a free worker',
+        example=64,
+    )
+    in_flight: int = Field(
+        description='Tasks currently running or waiting',
+        example=6,
+    )
+    busy: int = Field(
+        description='Workers currently hashing',
+        example=4,
+    )
+    queued: int = Field(
+        description='Tasks waiting for a free worker',
+        example=2,
+    )
+    peak_in_flight: int = Field(
+        description='Highest number of in-flight tasks since startup',
+        example=12,
+    )
+    completed: int = Field(
+        description='Tasks completed since startup',
+        example=1024,
+    )
+    rejected: int = Field(
+        description='Tasks rejected because the queue was full',
+        example=0,
+    )
+    timed_out: int = Field(
+        description='Tasks that exceeded the hashing timeout',
+        example=0,
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class QueryStatsScheme(BaseModel):
+    fingerprint: str = Field(
+        description='Normalised SQL statement',
+        example='SELECT users.id FROM users WHERE users.email = ?',
+    )
+    count: int = Field(
+        description='Number of executions',
+        example=120,
+    )
+    total_ms: float = Field(
+        description='Total execution time in milliseconds',
+        example=96.4,
+    )
+    avg_ms: float = Field(
+        description='Average execution time in milliseconds',
+        example=0.8,
+    )
+    max_ms: float = Field(
+        description='Slowest execution in milliseconds',
+        example=12.5,
+    )
+    min_ms: float = Field(
+        description='Fastest execution in milliseconds',
+        example=0.3,
+    )
+
+    class Config:
+        from_attributes = True
@@ -9,6 +9,7 @@ from pydantic import (
 )
 
 from auth_app.schemes.users import (
+    AuthUserScheme,
     CreateUserScheme,
     RoleEnum,
 )
@@ -22,6 +23,14 @@ class RoleDataScheme(CreateUserScheme):
     )
 
 
+class ReissueRefreshScheme(AuthUserScheme):
+    admin_secret: Optional[str] = Field(
+        description='Explicit admin key, required for non-USER tokens',
+        example='123Admin',
+        default=None,
+    )
+
+
 class CreateDataScheme(BaseModel):
     user_id: UUID = Field(
         description='Unique user identifier',
@@ -59,6 +68,16 @@ class CreateRefreshScheme(BaseModel):
         description='Date and time of token activity',
         example='2025-01-01T15:34:00',
     )
+    role: RoleEnum = Field(
+        description='Role the token was issued for',
+        example='USER',
+        default=RoleEnum.USER,
+    )
+    jti: Optional[str] = Field(
+        description='Unique token identifier, used to revoke the token',
+        example='4c4bd2a8b7c94bd4a2e0a6b5f0c3d1e2',
+        default=None,
+    )
 
     class Config:
         from_attributes = True
@@ -111,6 +130,11 @@ class UpdateRefreshScheme(BaseModel):
         description='Date and time of token activity',
         example='2025-01-01T15:34:00',
     )
+    jti: Optional[str] = Field(
+        description='Unique token identifier, used to revoke the token',
+        example='4c4bd2a8b7c94bd4a2e0a6b5f0c3d1e2',
+        default=None,
+    )
 
     class Config:
         from_attributes = True
@@ -134,3 +158,73 @@ class GetAccessScheme(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class IntrospectRequestScheme(BaseModel):
+    tokens: list[str] = Field(
+        description='Tokens to validate',
+        example=['eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ...'],
+        min_length=1,
+        max_length=100,
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class IntrospectResultScheme(BaseModel):
+    active: bool = Field(
+        description='Signature is valid and the token is not expired',
+        example=True,
+    )
+    claims: Optional[dict] = Field(
+        description='Decoded token payload of an active token',
+        example={'user_id': '123e4567-e89b-12d3-a456-426614174000'},
+        default=None,
+    )
+    error: Optional[str] = Field(
+        description='Reason the token is not active',
+        example='Expired token',
+        default=None,
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class IntrospectResponseScheme(BaseModel):
+    results: list[IntrospectResultScheme] = Field(
+        description='Results in the order of the requested tokens',
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class RevokeTokenScheme(BaseModel):
+    token: str = Field(
+        description='Refresh or access token to revoke',
+        example='eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ...',
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class RevocationScheme(BaseModel):
+    user_id: UUID = Field(
+        description='Owner of the revoked tokens',
+        example='123e4567-e89b-12d3-a456-426614174000',
+    )
+    jti: Optional[str] = Field(
+        description='Revoked token identifier, empty for a user revocation',
+        example='9f1c2b7e4d3a4e5f8a6b0c1d2e3f4a5b',
+        default=None,
+    )
+    revoked_at: datetime = Field(
+        description='Date and time of the revocation',
+        example='2025-01-01T15:34:00',
+    )
+
+    class Config:
+        from_attributes = True
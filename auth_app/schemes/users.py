@@ -6,6 +6,7 @@ from pydantic import (
     BaseModel,
     EmailStr,
     Field,
+    model_validator,
 )
 
 
@@ -169,6 +170,45 @@ class UserFilterScheme(BaseModel):
         from_attributes = True
 
 
+class UserListQueryScheme(UserFilterScheme):
+    limit: int = Field(
+        description='Maximum number of users per page',
+        example=100,
+        default=100,
+        ge=1,
+        le=1000,
+    )
+    cursor: Optional[str] = Field(
+        description='Opaque cursor returned as next_cursor',
+        example='Ej5FZ-ibEtOkVkJmFBdAAA',
+        default=None,
+    )
+    stream: bool = Field(
+        description='Stream all matching users as NDJSON',
+        example=False,
+        default=False,
+    )
+
+
+class UserPageScheme(BaseModel):
+    items: list[GetUserScheme] = Field(
+        description='Users of the current page',
+    )
+    next_cursor: Optional[str] = Field(
+        description='Cursor of the next page, empty on the last one',
+        example='Ej5FZ-ibEtOkVkJmFBdAAA',
+        default=None,
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class ExportFormatEnum(str, Enum):
+    NDJSON = 'ndjson'
+    CSV = 'csv'
+
+
 class VerificationScheme(BaseModel):
     email: EmailStr = Field(
         description='Unique email address',
@@ -199,3 +239,90 @@ class CreateResponseScheme(MessageResponseScheme):
 
     class Config:
         from_attributes = True
+
+
+class ImportUserScheme(BaseModel):
+    email: EmailStr = Field(
+        description='Unique email address',
+        example='joe.0101@example.com',
+    )
+    password: Optional[str] = Field(
+        description='Plain password, hashed during the import',
+        example='MySecurePassword123!',
+        min_length=6,
+        max_length=100,
+        default=None,
+    )
+    password_hash: Optional[str] = Field(
+        description='Password already hashed with a supported scheme',
+        example='$2b$12$KIXQJ5hM6b2m1yZ4rO9vUe8t3VdQw7nC2Xy1Lk0pR6sT4uW8aB9cD',
+        default=None,
+    )
+    role: RoleEnum = Field(
+        description="User role in ['USER', 'ADMIN'] and etc",
+        example='USER',
+        default=RoleEnum.USER,
+    )
+
+    @model_validator(mode='after')
+    def check_password(self) -> 'ImportUserScheme':
+        if (self.password is None) == (self.password_hash is None):
+            raise ValueError(
+                'Exactly one of password or password_hash is required'
+            )
+        return self
+
+
+class ImportStatusEnum(str, Enum):
+    CREATED = 'CREATED'
+    DUPLICATE = 'DUPLICATE'
+    INVALID = 'INVALID'
+
+
+class UserImportRowScheme(BaseModel):
+    line: int = Field(
+        description='Line number in the uploaded stream',
+        example=2,
+    )
+    status: ImportStatusEnum = Field(
+        description="Row outcome in ['CREATED', 'DUPLICATE', 'INVALID']",
+        example='CREATED',
+    )
+    email: Optional[str] = Field(
+        description='Email address of the row',
+        example='joe.0101@example.com',
+        default=None,
+    )
+    id: Optional[UUID] = Field(
+        description='Identifier of the created user',
+        example='123e4567-e89b-12d3-a456-426614174000',
+        default=None,
+    )
+    detail: Optional[str] = Field(
+        description='Reason the row was rejected',
+        default=None,
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class UserImportResultScheme(BaseModel):
+    created: int = Field(
+        description='Number of created users',
+        example=998,
+    )
+    duplicates: int = Field(
+        description='Rows skipped because the email already exists',
+        example=1,
+    )
+    invalid: int = Field(
+        description='Rows rejected by validation',
+        example=1,
+    )
+    rows: list[UserImportRowScheme] = Field(
+        description='Per-row results in input order',
+    )
+
+    class Config:
+        from_attributes = True
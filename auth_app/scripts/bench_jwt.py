@@ -0,0 +1,122 @@
+"""
+Micro-benchmark of token mint and verify throughput.
+
+Compares the previous per-call PyJWT path, which resolves the secret,
+the algorithm and the key on every call, with the pre-built KeyRing.
+
+    python -m auth_app.scripts.bench_jwt [--seconds 2]
+        [--key-file private.pem --algorithm RS256]
+"""
+import argparse
+import time
+import warnings
+from pathlib import Path
+from typing import Callable
+
+import jwt
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    PublicFormat,
+)
+
+from auth_app.config import get_jwt_settings
+from auth_app.services.utils.key_ring import (
+    JWTKey,
+    KeyRing,
+    load_private_key,
+)
+
+PAYLOAD = {
+    "user_id": "123e4567-e89b-12d3-a456-426614174000",
+    "email": "joe.0101@example.com",
+    "role": "USER",
+    "expires": time.time() + 3600,
+    "token_type": "access",
+    "is_verified": True,
+    "is_active": True,
+}
+
+
+def rate(
+    func: Callable[[], object],
+    seconds: float,
+) -> float:
+    count = 0
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            func()
+        count += 100
+    return count / (time.perf_counter() - started)
+
+
+def build_ring(
+    key_file: Path | None,
+    algorithm: str,
+) -> tuple[KeyRing, str | bytes, str | bytes]:
+    """
+    Key ring plus the raw signing and verification keys
+    in the form the per-call path received them.
+    """
+    if key_file is None:
+        secret = get_jwt_settings().KEY.get_secret_value()
+        key = JWTKey(kid=None, algorithm=algorithm, key=secret, jwk=None)
+        return KeyRing(signing=key, verification=[key]), secret, secret
+    signing, public = load_private_key(key_file)
+    ring = KeyRing(signing=signing, verification=[public])
+    public_pem = public.key.public_bytes(
+        Encoding.PEM,
+        PublicFormat.SubjectPublicKeyInfo,
+    )
+    return ring, key_file.read_bytes(), public_pem
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--key-file", type=Path, default=None)
+    parser.add_argument(
+        "--algorithm",
+        default=get_jwt_settings().ALGORITHM.get_secret_value(),
+    )
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", jwt.warnings.InsecureKeyLengthWarning)
+
+    ring, sign_key, verify_key = build_ring(args.key_file, args.algorithm)
+    headers = {"kid": ring.signing.kid} if ring.signing.kid else None
+    token = ring.encode(PAYLOAD)
+
+    def encode_before() -> str:
+        return jwt.encode(
+            payload=PAYLOAD,
+            key=sign_key,
+            algorithm=args.algorithm,
+            headers=headers,
+        )
+
+    def decode_before() -> dict:
+        return jwt.decode(
+            jwt=token,
+            key=verify_key,
+            algorithms=[args.algorithm],
+        )
+
+    results = {
+        "mint": (
+            rate(encode_before, args.seconds),
+            rate(lambda: ring.encode(PAYLOAD), args.seconds),
+        ),
+        "verify": (
+            rate(decode_before, args.seconds),
+            rate(lambda: ring.decode(token), args.seconds),
+        ),
+    }
+    print(f"algorithm: {args.algorithm}")
+    print(f"{'':8}{'before/s':>12}{'after/s':>12}{'speedup':>10}")
+    for name, (before, after) in results.items():
+        print(f"{name:8}{before:12.0f}{after:12.0f}{after / before:9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+HTTP load generator for comparing server settings.
+
+Keeps the given number of keep-alive connections busy against a running
+server for a fixed time and reports requests per second and latency
+percentiles. Start the server with the settings under test, e.g.
+
+    python -m auth_app.serve --workers 2
+    python -m auth_app.scripts.bench_server [--url http://127.0.0.1:8000/]
+        [--connections 64] [--seconds 10] [--body '{"token": "..."}']
+
+The generator runs in one process and takes a core of its own, point it
+at a server on another machine when measuring more workers than cores.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+
+class BenchResult(NamedTuple):
+    requests: int
+    errors: int
+    elapsed: float
+    latencies: list[float]
+
+    @property
+    def rate(self) -> float:
+        return self.requests / self.elapsed
+
+    def percentile(self, p: int) -> float:
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0.0
+        return statistics.quantiles(self.latencies, n=100)[p - 1]
+
+
+def build_request(
+    url: str,
+    body: str | None,
+) -> tuple[str, int, bytes]:
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    host = parts.hostname or "127.0.0.1"
+    port = parts.port or 80
+    lines = [
+        f"{'POST' if body else 'GET'} {path} HTTP/1.1",
+        f"Host: {host}:{port}",
+        "Connection: keep-alive",
+    ]
+    payload = (body or "").encode()
+    if body:
+        lines.append("Content-Type: application/json")
+        lines.append(f"Content-Length: {len(payload)}")
+    return host, port, "\r\n".join(lines).encode() + b"\r\n\r\n" + payload
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *headers = head.decode("latin-1").split("\r\n")
+    length = 0
+    for header in headers:
+        name, _, value = header.partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def connection(
+    host: str,
+    port: int,
+    request: bytes,
+    deadline: float,
+    latencies: list[float],
+) -> int:
+    errors = 0
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(request)
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status >= 500:
+                errors += 1
+    finally:
+        writer.close()
+    return errors
+
+
+async def bench(
+    url: str,
+    connections: int,
+    seconds: float,
+    body: str | None = None,
+) -> BenchResult:
+    host, port, request = build_request(url, body)
+    latencies: list[float] = []
+    started = time.perf_counter()
+    errors = await asyncio.gather(
+        *(
+            connection(host, port, request, started + seconds, latencies)
+            for _ in range(connections)
+        )
+    )
+    return BenchResult(
+        requests=len(latencies),
+        errors=sum(errors),
+        elapsed=time.perf_counter() - started,
+        latencies=latencies,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://127.0.0.1:8000/")
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--body", default=None)
+    args = parser.parse_args()
+    result = asyncio.run(
+        bench(args.url, args.connections, args.seconds, args.body)
+    )
+    print(
+        f"{result.requests} requests in {result.elapsed:.2f}s, "
+        f"{result.rate:.0f} req/s, {result.errors} error(s)\n"
+        f"latency p50 {result.percentile(50) * 1000:.2f}ms, "
+        f"p99 {result.percentile(99) * 1000:.2f}ms"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Fails when hot queries regress to sequential scans.
+
+Seeds users and refresh tokens inside a transaction that is rolled back,
+runs EXPLAIN for every hot query and exits with status 1 if the planner
+chooses a Seq Scan on a checked table.
+
+    python -m auth_app.scripts.check_query_plans [--rows 50000]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    ClauseElement,
+    func,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from auth_app.db.connect_db import create_db_engine
+from auth_app.models.tokens import RefreshTokenORM
+from auth_app.models.users import UserORM
+from auth_app.repositories.tokens import TokenRepo
+from auth_app.repositories.users import (
+    UserRepo,
+    _auth_row_by_email,
+)
+
+CHECKED_TABLES = {"users", "refresh_tokens"}
+
+SEED_USERS = """
+    INSERT INTO users (id, email, password_hash, role, is_verified, is_active)
+    SELECT
+        md5('user' || n)::uuid,
+        'user' || n || '@example.com',
+        'hash',
+        'USER',
+        true,
+        true
+    FROM generate_series(1, :rows) AS n
+"""
+
+SEED_TOKENS = """
+    INSERT INTO refresh_tokens (id, user_id, token_digest, expires_at)
+    SELECT
+        md5('token' || n)::uuid,
+        md5('user' || n)::uuid,
+        sha256(convert_to('token-' || n, 'UTF8')),
+        now() AT TIME ZONE 'utc' + (n % 30 - 15) * interval '1 day'
+    FROM generate_series(1, :rows) AS n
+"""
+
+
+def hot_queries() -> dict[str, ClauseElement]:
+    sample_user_id = uuid.UUID("5a7d2d2c-4bff-4f44-b2ae-7e1c7a9e9a51")
+    return {
+        "refresh token by user": select(RefreshTokenORM).where(
+            RefreshTokenORM.user_id == sample_user_id
+        ),
+        "refresh token by digest": select(RefreshTokenORM).where(
+            RefreshTokenORM.token_digest
+            == func.sha256(func.convert_to("token-42", "UTF8"))
+        ),
+        "expired refresh tokens": TokenRepo._purge_statement(
+            expired_before=datetime(2000, 1, 1),
+            limit=1000,
+        ),
+        "auth row by email": _auth_row_by_email.params(
+            email="user42@example.com"
+        ),
+        "user by email": select(UserORM).where(
+            *UserRepo._build_filter_condition(
+                {"email": "User42@Example.com"}
+            )
+        ),
+        "users changed since": UserRepo._export_statement(
+            changed_since=datetime(2100, 1, 1)
+        ),
+    }
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    found = []
+    if (
+        plan.get("Node Type") == "Seq Scan"
+        and plan.get("Relation Name") in CHECKED_TABLES
+    ):
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+
+async def explain(
+    conn: AsyncConnection,
+    stmt: ClauseElement,
+) -> dict:
+    compiled = stmt.compile(
+        dialect=conn.dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def check(rows: int) -> int:
+    failures = 0
+    async_engine = create_db_engine()
+    async with async_engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            await conn.execute(text(SEED_USERS), {"rows": rows})
+            await conn.execute(text(SEED_TOKENS), {"rows": rows})
+            await conn.execute(text("ANALYZE users"))
+            await conn.execute(text("ANALYZE refresh_tokens"))
+            for name, stmt in hot_queries().items():
+                seq_scans = find_seq_scans(await explain(conn, stmt))
+                if seq_scans:
+                    failures += 1
+                    print(f"FAIL {name}: Seq Scan on {', '.join(seq_scans)}")
+                else:
+                    print(f"OK   {name}")
+        finally:
+            await transaction.rollback()
+    await async_engine.dispose()
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+    failures = asyncio.run(check(args.rows))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
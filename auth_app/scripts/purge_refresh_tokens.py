@@ -0,0 +1,69 @@
+"""
+Deletes expired refresh tokens in batches and reports the result.
+
+Same job the application runs in-process when TOKEN_PURGE_ENABLED is set,
+for deployments that prefer to schedule it externally (cron, k8s CronJob).
+
+    python -m auth_app.scripts.purge_refresh_tokens
+        [--batch-size 1000] [--pause 0.05] [--grace-seconds 0]
+"""
+import argparse
+import asyncio
+
+from auth_app.config import get_token_purge_settings
+from auth_app.db.connect_db import (
+    create_db_engine,
+    create_session_factory,
+)
+from auth_app.services.token_purge import (
+    PurgeResult,
+    TokenPurgeJob,
+)
+
+
+async def purge(
+    batch_size: int,
+    pause: float,
+    grace_seconds: int,
+) -> PurgeResult:
+    engine = create_db_engine()
+    job = TokenPurgeJob(
+        create_session_factory(engine),
+        batch_size=batch_size,
+        pause=pause,
+        grace_seconds=grace_seconds,
+    )
+    try:
+        return await job.run_once()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    token_purge_settings = get_token_purge_settings()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=token_purge_settings.TOKEN_PURGE_BATCH_SIZE,
+    )
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=token_purge_settings.TOKEN_PURGE_PAUSE,
+    )
+    parser.add_argument(
+        "--grace-seconds",
+        type=int,
+        default=token_purge_settings.TOKEN_PURGE_GRACE_SECONDS,
+    )
+    args = parser.parse_args()
+    result = asyncio.run(purge(args.batch_size, args.pause, args.grace_seconds))
+    print(
+        f"deleted {result.deleted} expired refresh token(s) "
+        f"in {result.batches} batch(es), {result.elapsed:.3f}s"
+    )
+
+
+if __name__ == '__main__':
+    main()
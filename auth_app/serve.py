@@ -0,0 +1,168 @@
+"""
+Production entry point of the application.
+
+Runs uvicorn with SERVER_WORKERS processes (one per available CPU by
+default), on uvloop and httptools when they are installed. Each worker
+sizes its password hashing pool to its share of the CPUs unless
+HASHING_POOL_SIZE is set.
+With several workers the metrics of every worker are written to
+PROMETHEUS_MULTIPROC_DIR and merged by /metrics. A temporary directory
+is used when it is unset; files left by a previous run are removed on
+startup, so the counters of dead workers are not reported again.
+On SIGTERM every worker stops accepting connections, waits up to
+SERVER_GRACEFUL_TIMEOUT seconds for the requests in flight and then
+runs the lifespan shutdown, which lets the outbox worker finish its
+batch and stops the background jobs before the pools are closed.
+
+    python -m auth_app.serve [--workers 4] [--port 8000]
+        [--keep-alive 5] [--backlog 2048] [--limit-concurrency 1000]
+        [--graceful-timeout 30] [--no-access-log]
+"""
+import argparse
+import importlib.util
+import logging
+import os
+import shutil
+import tempfile
+
+import uvicorn
+from uvicorn.config import (
+    HTTPProtocolType,
+    LoopSetupType,
+)
+
+from auth_app.config import (
+    ServerSettings,
+    available_cpus,
+    get_server_settings,
+)
+
+logger = logging.getLogger(__name__)
+
+APP = "auth_app.main:app"
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def prepare_multiproc_dir(workers: int) -> str | None:
+    """
+    Clears PROMETHEUS_MULTIPROC_DIR, or creates and exports a temporary
+    one for several workers. Has to run before the workers are spawned,
+    prometheus_client reads the variable when it is imported.
+    Returns the directory created, for removal on exit.
+    """
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path is None:
+        if workers < 2:
+            return None
+        created = tempfile.mkdtemp(prefix="auth-app-metrics-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = created
+        return created
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+    return None
+
+
+def run(
+    app: str = APP,
+    settings: ServerSettings | None = None,
+) -> None:
+    settings = settings or get_server_settings()
+    workers = settings.SERVER_WORKERS or available_cpus()
+    # read by the workers to split the CPUs among their hashing pools
+    os.environ["SERVER_WORKERS"] = str(workers)
+    created = prepare_multiproc_dir(workers)
+    loop: LoopSetupType = "uvloop" if _installed("uvloop") else "asyncio"
+    http: HTTPProtocolType = "httptools" if _installed("httptools") else "h11"
+    logger.info(
+        "Serving %s on %s:%s with %d worker(s), %s loop, %s parser",
+        app,
+        settings.SERVER_HOST,
+        settings.SERVER_PORT,
+        workers,
+        loop,
+        http,
+    )
+    try:
+        uvicorn.run(
+            app,
+            host=settings.SERVER_HOST,
+            port=settings.SERVER_PORT,
+            workers=workers,
+            loop=loop,
+            http=http,
+            timeout_keep_alive=settings.SERVER_KEEP_ALIVE,
+            backlog=settings.SERVER_BACKLOG,
+            limit_concurrency=settings.SERVER_LIMIT_CONCURRENCY,
+            timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+            access_log=settings.SERVER_ACCESS_LOG,
+        )
+    finally:
+        if created is not None:
+            shutil.rmtree(created, ignore_errors=True)
+
+
+def main() -> None:
+    server_settings = get_server_settings()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--app", default=APP)
+    parser.add_argument("--host", default=server_settings.SERVER_HOST)
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=server_settings.SERVER_PORT,
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=server_settings.SERVER_WORKERS,
+    )
+    parser.add_argument(
+        "--keep-alive",
+        type=int,
+        default=server_settings.SERVER_KEEP_ALIVE,
+    )
+    parser.add_argument(
+        "--backlog",
+        type=int,
+        default=server_settings.SERVER_BACKLOG,
+    )
+    parser.add_argument(
+        "--limit-concurrency",
+        type=int,
+        default=server_settings.SERVER_LIMIT_CONCURRENCY,
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=server_settings.SERVER_GRACEFUL_TIMEOUT,
+    )
+    parser.add_argument(
+        "--no-access-log",
+        dest="access_log",
+        action="store_false",
+        default=server_settings.SERVER_ACCESS_LOG,
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    run(
+        app=args.app,
+        settings=ServerSettings(
+            SERVER_HOST=args.host,
+            SERVER_PORT=args.port,
+            SERVER_WORKERS=args.workers,
+            SERVER_KEEP_ALIVE=args.keep_alive,
+            SERVER_BACKLOG=args.backlog,
+            SERVER_LIMIT_CONCURRENCY=args.limit_concurrency,
+            SERVER_GRACEFUL_TIMEOUT=args.graceful_timeout,
+            SERVER_ACCESS_LOG=args.access_log,
+        ),
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import random
+from contextlib import suppress
+from datetime import (
+    datetime,
+    timedelta,
+)
+from typing import NamedTuple
+
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+)
+
+from auth_app.config import get_outbox_settings
+from auth_app.metrics import (
+    outbox_delivery_latency,
+    outbox_outcomes,
+)
+from auth_app.models.outbox import EmailOutboxORM
+from auth_app.repositories.outbox import OutboxRepo
+from auth_app.services.ses.clients import SesClientProvider
+from auth_app.services.ses.ses_handler import ses_handler
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryResult(NamedTuple):
+    row: EmailOutboxORM
+    error: str | None
+
+
+class OutboxWorker:
+    """
+    Background delivery of the transactional email outbox.
+    Claims due rows in batches, sends them with bounded parallelism
+    and reschedules failures with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        ses_provider: SesClientProvider,
+    ) -> None:
+        self._session_factory = session_factory
+        self._ses_provider = ses_provider
+        self._settings = get_outbox_settings()
+        self._semaphore = asyncio.Semaphore(self._settings.OUTBOX_CONCURRENCY)
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Finish the batch in progress and stop polling.
+        """
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Outbox delivery iteration failed")
+                claimed = 0
+            if claimed < self._settings.OUTBOX_BATCH_SIZE:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._stop.wait(),
+                        timeout=self._settings.OUTBOX_POLL_INTERVAL,
+                    )
+
+    async def run_once(self) -> int:
+        async with self._session_factory() as session, session.begin():
+            repo = OutboxRepo(session)
+            now = datetime.utcnow()
+            outbox_outcomes["expired"].inc(await repo.expire_pending(now))
+            rows = await repo.claim_batch(
+                limit=self._settings.OUTBOX_BATCH_SIZE,
+                lease=timedelta(seconds=self._settings.OUTBOX_LEASE_SECONDS),
+            )
+        if not rows:
+            return 0
+
+        results = await asyncio.gather(*(self._deliver(row) for row in rows))
+        sent_at = datetime.utcnow()
+        async with self._session_factory() as session, session.begin():
+            repo = OutboxRepo(session)
+            await repo.mark_sent(
+                ids=[res.row.id for res in results if res.error is None],
+                sent_at=sent_at,
+            )
+            for res in results:
+                if res.error is not None:
+                    await repo.mark_failed(
+                        outbox_id=res.row.id,
+                        error=res.error,
+                        next_attempt_at=self._next_attempt_at(res.row),
+                    )
+        return len(rows)
+
+    async def _deliver(
+        self,
+        row: EmailOutboxORM,
+    ) -> DeliveryResult:
+        if row.message is None:
+            # the body is dropped only once the row is no longer pending
+            return DeliveryResult(row=row, error="Message content dropped")
+        payload = ses_handler.generate_email_payload(
+            message=row.message,
+            subject=row.subject,
+            source=row.source,
+        )
+        async with self._semaphore:
+            try:
+                await ses_handler.send_email(
+                    email_to=row.email_to,
+                    ses=await self._ses_provider.get_client(),
+                    payload=payload,
+                )
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning(
+                    "Outbox email %s failed on attempt %s: %r",
+                    row.id,
+                    row.attempts,
+                    e,
+                )
+                return DeliveryResult(row=row, error=repr(e))
+
+        latency = (datetime.utcnow() - row.created_at).total_seconds()
+        outbox_outcomes["sent"].inc()
+        outbox_delivery_latency.observe(latency)
+        logger.info(
+            "Outbox email %s delivered in %.3fs after %s attempt(s)",
+            row.id,
+            latency,
+            row.attempts,
+        )
+        return DeliveryResult(row=row, error=None)
+
+    def _next_attempt_at(
+        self,
+        row: EmailOutboxORM,
+    ) -> datetime | None:
+        if row.attempts >= self._settings.OUTBOX_MAX_ATTEMPTS:
+            outbox_outcomes["failed"].inc()
+            return None
+        outbox_outcomes["retried"].inc()
+        delay = min(
+            self._settings.OUTBOX_BACKOFF_BASE**row.attempts,
+            self._settings.OUTBOX_BACKOFF_MAX,
+        )
+        delay *= random.uniform(0.8, 1.2)
+        return datetime.utcnow() + timedelta(seconds=delay)
@@ -1,22 +1,50 @@
-from typing import AsyncGenerator
+import asyncio
+from contextlib import AsyncExitStack
 
 from aioboto3 import Session
 from aiobotocore.client import AioBaseClient
 
-from auth_app.config import aws_settings
+from auth_app.config import get_aws_settings
 
 
 def get_aws_session() -> Session:
     return Session()
 
 
-async def get_ses_client() -> AsyncGenerator[AioBaseClient, None]:
-    session = get_aws_session()
-    async with session.client(
-        "ses",
-        endpoint_url=aws_settings.AWS_ENDPOINT,
-        aws_access_key_id=aws_settings.AWS_ACCESS_KEY_ID.get_secret_value(),
-        aws_secret_access_key=aws_settings.AWS_SECRET_ACCESS_KEY.get_secret_value(),
-        region_name=aws_settings.AWS_DEFAULT_REGION,
-    ) as client:
-        yield client
+class SesClientProvider:
+    """
+    Keeps a single SES client per worker.
+    The client is created on first use and reused until shutdown,
+    so requests that never send email don't pay for it.
+    """
+
+    def __init__(self) -> None:
+        self._session = get_aws_session()
+        self._stack: AsyncExitStack | None = None
+        self._client: AioBaseClient | None = None
+        self._lock = asyncio.Lock()
+
+    async def get_client(self) -> AioBaseClient:
+        if self._client is not None:
+            return self._client
+        async with self._lock:
+            if self._client is None:
+                aws_settings = get_aws_settings()
+                stack = AsyncExitStack()
+                self._client = await stack.enter_async_context(
+                    self._session.client(
+                        "ses",
+                        endpoint_url=aws_settings.AWS_ENDPOINT,
+                        aws_access_key_id=aws_settings.AWS_ACCESS_KEY_ID.get_secret_value(),
+                        aws_secret_access_key=aws_settings.AWS_SECRET_ACCESS_KEY.get_secret_value(),
+                        region_name=aws_settings.AWS_DEFAULT_REGION,
+                    )
+                )
+                self._stack = stack
+            return self._client
+
+    async def close(self) -> None:
+        if self._stack is not None:
+            await self._stack.aclose()
+        self._stack = None
+        self._client = None
@@ -1,15 +1,26 @@
-import random
+import logging
+import secrets
+import time
 from string import (
     ascii_letters,
     digits,
 )
 
 from aiobotocore.client import AioBaseClient
-from redis.asyncio.client import Redis
+from opentelemetry.trace import SpanKind
 
-from auth_app.config import aws_settings
+from auth_app.config import (
+    get_aws_settings,
+    get_otp_settings,
+)
 from auth_app.messages.common import msg_creator
+from auth_app.metrics import ses_calls
+from auth_app.repositories.outbox import OutboxRepo
 from auth_app.schemes.email import EmailPayloadScheme
+from auth_app.services.utils.otp_store import OTPStore
+from auth_app.tracing import span
+
+logger = logging.getLogger(__name__)
 
 
 class SesHandler:
@@ -37,48 +48,75 @@ class SesHandler:
         """
         Basic email sending
         """
-        await ses.send_email(
-            Destination={'ToAddresses': [email_to]},
-            Message={
-                'Body': {
-                    "Text": {
-                        'Charset': 'UTF-8',
-                        'Data': payload.message,
+        started = time.perf_counter()
+        try:
+            with span("SES SendEmail", SpanKind.CLIENT):
+                await ses.send_email(
+                    Destination={'ToAddresses': [email_to]},
+                    Message={
+                        'Body': {
+                            "Text": {
+                                'Charset': 'UTF-8',
+                                'Data': payload.message,
+                            },
+                        },
+                        'Subject': {
+                            'Charset': 'UTF-8',
+                            'Data': payload.subject,
+                        },
                     },
-                },
-                'Subject': {
-                    'Charset': 'UTF-8',
-                    'Data': payload.subject,
-                },
-            },
-            Source=payload.source,
-        )
+                    Source=payload.source,
+                )
+        finally:
+            ses_calls["send_email"].observe(time.perf_counter() - started)
 
     async def verify_sender(
         self,
         ses: AioBaseClient,
     ) -> None:
-        await ses.verify_email_identity(EmailAddress="sender@example.com")
-        print("Sender verified.")
+        started = time.perf_counter()
+        try:
+            await ses.verify_email_identity(EmailAddress="sender@example.com")
+        finally:
+            ses_calls["verify_email_identity"].observe(
+                time.perf_counter() - started
+            )
+        logger.info("Sender verified")
+
+    def enqueue_email(
+        self,
+        email_to: str,
+        outbox_repo: OutboxRepo,
+        payload: EmailPayloadScheme,
+        ttl: int | None = None,
+    ) -> None:
+        """
+        Queue the email in the outbox of the current transaction.
+        It is delivered by the background OutboxWorker after commit,
+        or dropped once ttl seconds have passed.
+        """
+        outbox_repo.enqueue(email_to=email_to, payload=payload, ttl=ttl)
 
     async def reset_password(
         self,
         email_to: str,
-        ses: AioBaseClient,
+        outbox_repo: OutboxRepo,
     ) -> dict:
         """
-        Generate and send a new password for the User
+        Generate a new password for the User and queue it for sending
         """
-        password = self.generate_otp(aws_settings.RESET_PWD_LENGTH)
+        password = self.generate_otp(get_aws_settings().RESET_PWD_LENGTH)
         msg_content = msg_creator.get_ses_reset_pwd_message(password)
         payload = self.generate_email_payload(
             message=msg_content["message"],
             subject=msg_content["subject"],
         )
-        await self.send_email(email_to, ses, payload)
-        print("---------------------------------")
-        print(f"Password {password} was sent to {email_to}")
-        print("---------------------------------")
+        self.enqueue_email(
+            email_to,
+            outbox_repo,
+            payload,
+            ttl=get_otp_settings().OTP_TTL,
+        )
         return {
             'message': msg_creator.get_reset_pwd_message(),
             'new_password': password,
@@ -86,39 +124,39 @@ class SesHandler:
 
     def generate_otp(
         self,
-        length: int = aws_settings.VERIFICATION_CODE_LENGTH,
+        length: int | None = None,
     ) -> str:
         """
         Generate simple OTP
         """
+        if length is None:
+            length = get_aws_settings().VERIFICATION_CODE_LENGTH
         characters = ascii_letters + digits
-        code = ''.join(random.choices(characters, k=length))
+        code = ''.join(secrets.choice(characters) for _ in range(length))
         return code
 
     async def send_confirmation_email(
         self,
         email_to: str,
-        ses: AioBaseClient,
-        redis_client: Redis,
+        outbox_repo: OutboxRepo,
+        otp_store: OTPStore,
     ) -> dict:
         """
-        User verification via OTP
+        User verification via OTP, delivered through the email outbox
         """
         code = self.generate_otp()
+        await otp_store.issue(email=email_to, code=code)
         msg_content = msg_creator.get_ses_confirmation_message(code)
         payload = self.generate_email_payload(
             message=msg_content["message"],
             subject=msg_content["subject"],
         )
-        await self.send_email(email_to=email_to, ses=ses, payload=payload)
-        await redis_client.set(
-            name=f"otp:{email_to}",
-            value=code,
-            ex=300,
+        self.enqueue_email(
+            email_to=email_to,
+            outbox_repo=outbox_repo,
+            payload=payload,
+            ttl=get_otp_settings().OTP_TTL,
         )
-        print("---------------------------------")
-        print(f"OTP {code} was sent to {email_to}")
-        print("---------------------------------")
         return {
             'message': msg_content["response_message"],
         }
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from datetime import (
+    datetime,
+    timedelta,
+)
+from typing import NamedTuple
+
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+)
+
+from auth_app.config import get_token_purge_settings
+from auth_app.repositories.tokens import TokenRepo
+
+logger = logging.getLogger(__name__)
+
+
+class PurgeResult(NamedTuple):
+    deleted: int
+    batches: int
+    elapsed: float
+
+
+class TokenPurgeJob:
+    """
+    Periodic removal of expired refresh tokens.
+    Every batch is a short transaction of its own with a pause
+    in between, so row locks are held for one batch at most
+    and vacuum can keep up with the deleted tuples.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int | None = None,
+        pause: float | None = None,
+        grace_seconds: int | None = None,
+    ) -> None:
+        self._settings = get_token_purge_settings()
+        if batch_size is None:
+            batch_size = self._settings.TOKEN_PURGE_BATCH_SIZE
+        if pause is None:
+            pause = self._settings.TOKEN_PURGE_PAUSE
+        if grace_seconds is None:
+            grace_seconds = self._settings.TOKEN_PURGE_GRACE_SECONDS
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._pause = pause
+        self._grace = timedelta(seconds=grace_seconds)
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Finish the batch in progress and stop.
+        """
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self.run_once()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Refresh token purge failed")
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._stop.wait(),
+                    timeout=self._settings.TOKEN_PURGE_INTERVAL,
+                )
+
+    async def run_once(self) -> PurgeResult:
+        """
+        Deletes rows expired before the start of the run,
+        until a batch comes back short.
+        """
+        expired_before = datetime.utcnow() - self._grace
+        started = time.perf_counter()
+        deleted = batches = 0
+        while not self._stop.is_set():
+            async with self._session_factory() as session, session.begin():
+                count = await TokenRepo(session).purge_expired_batch(
+                    expired_before=expired_before,
+                    limit=self._batch_size,
+                )
+            deleted += count
+            batches += 1
+            if count < self._batch_size:
+                break
+            await asyncio.sleep(self._pause)
+
+        result = PurgeResult(
+            deleted=deleted,
+            batches=batches,
+            elapsed=time.perf_counter() - started,
+        )
+        logger.info(
+            "Purged %s expired refresh token(s) in %s batch(es), %.3fs",
+            result.deleted,
+            result.batches,
+            result.elapsed,
+        )
+        return result
@@ -1,39 +1,52 @@
-from datetime import datetime
-
-from aiobotocore.client import AioBaseClient
-from redis.asyncio.client import Redis
+import time
+from datetime import (
+    datetime,
+    timezone,
+)
+from functools import partial
+from uuid import UUID
 
-from auth_app.config import jwt_settings
+from auth_app.config import get_jwt_settings
 from auth_app.exeptions.custom import ServiceError
+from auth_app.middleware.db_session import after_commit
 from auth_app.models import RefreshTokenORM
 from auth_app.repositories.tokens import TokenRepo
 from auth_app.repositories.users import UserRepo
 from auth_app.schemes.tokens import (
     CreateDataScheme,
     CreateRefreshScheme,
+    GetRefreshScheme,
+    ReissueRefreshScheme,
+    RevocationScheme,
     RoleDataScheme,
     UpdateRefreshScheme,
 )
-from auth_app.schemes.users import AuthUserScheme
+from auth_app.schemes.users import RoleEnum
 from auth_app.services.utils.authenticate_user import authenticate_user
+from auth_app.services.utils.revocation import RevocationList
 from auth_app.services.utils.token_handler import (
     TokenData,
-    token_handler,
+    TokenHandler,
 )
+from auth_app.services.utils.user_status_cache import UserStatusCache
+from auth_app.tracing import traced
 
 
+@traced
 class TokenService:
     def __init__(
         self,
         user_repo: UserRepo,
         token_repo: TokenRepo,
-        redis: Redis,
-        ses: AioBaseClient,
+        status_cache: UserStatusCache,
+        revocations: RevocationList,
+        token_handler: TokenHandler,
     ) -> None:
         self.__user_repo = user_repo
         self.__token_repo = token_repo
-        self.__redis = redis
-        self.__ses = ses
+        self.__status_cache = status_cache
+        self.__revocations = revocations
+        self.__token_handler = token_handler
 
     @property
     def user_repo(self) -> UserRepo:
@@ -43,10 +56,32 @@ class TokenService:
     def token_repo(self) -> TokenRepo:
         return self.__token_repo
 
+    @staticmethod
+    def _refresh_scheme(
+        token_orm: RefreshTokenORM,
+        token: str,
+    ) -> GetRefreshScheme:
+        """
+        Only the token digest is stored, the token itself
+        is returned once, when it is issued.
+        """
+        return GetRefreshScheme(
+            id=token_orm.id,
+            user_id=token_orm.user_id,
+            token=token,
+            expires_at=token_orm.expires_at,
+        )
+
     async def get_refresh_token(
         self,
-        auth_data: AuthUserScheme,
-    ) -> RefreshTokenORM:
+        auth_data: ReissueRefreshScheme,
+    ) -> GetRefreshScheme:
+        """
+        The stored token cannot be read back, so the user's refresh
+        token is reissued with the role it was created for and the
+        replaced one is revoked once the reissue is committed.
+        Non-USER roles take the admin secret, as on creation.
+        """
         user = await authenticate_user(
             email=auth_data.email,
             password=auth_data.password_hash,
@@ -54,17 +89,49 @@ class TokenService:
         )
         if not user:
             raise ServiceError('User not found or Invalid user data')
-        result = await self.__token_repo.get_refresh(
+        current = await self.__token_repo.get_refresh(
+            user_id=user.id,
+            for_update=True,
+        )
+        if not current:
+            raise ServiceError('Token not found')
+        create_data = CreateDataScheme(
             user_id=user.id,
+            email=user.email,
+            # rows stored before the role was recorded get the least one
+            role=RoleEnum(current.role or RoleEnum.USER),
+            admin_secret=auth_data.admin_secret,
+        )
+        token_data = self.__token_handler.generate_refresh(create_data)
+        token = token_data["refresh_token"]
+        payload = token_data["payload"]
+        result = await self.__token_repo.update_user_refresh(
+            user_id=user.id,
+            update_data=UpdateRefreshScheme(
+                token=token,
+                expires_at=datetime.utcfromtimestamp(payload["expires"]),
+                jti=payload["jti"],
+            ),
         )
         if not result:
             raise ServiceError('Token not found')
-        return result
+        if current.jti:
+            after_commit(
+                self.__token_repo.session,
+                partial(
+                    self.__revocations.revoke_token,
+                    current.jti,
+                    current.expires_at.replace(
+                        tzinfo=timezone.utc
+                    ).timestamp(),
+                ),
+            )
+        return self._refresh_scheme(result, token)
 
     async def create_refresh_token(
         self,
         auth_data: RoleDataScheme,
-    ) -> RefreshTokenORM:
+    ) -> GetRefreshScheme:
         user = await authenticate_user(
             email=auth_data.email,
             password=auth_data.password_hash,
@@ -72,50 +139,55 @@ class TokenService:
         )
         if not user:
             raise ServiceError('User not found or Invalid user data')
-        token_exists = await self.__token_repo.get_refresh(user_id=user.id)
-        if token_exists:
-            raise ServiceError(
-                'Token already exists. Get active token or exchange expired.'
-            )
         create_data = CreateDataScheme(
             user_id=user.id,
             email=user.email,
-            role=auth_data.role,
+            role=auth_data.role or RoleEnum.USER,
             admin_secret=auth_data.admin_secret,
         )
-        token_data = token_handler.generate_refresh(create_data)
+        token_data = self.__token_handler.generate_refresh(create_data)
         payload = token_data["payload"]
 
         expires_raw = payload["expires"]
         if not isinstance(expires_raw, (float, int)):
             raise ValueError("expires must be a number")
 
+        token = token_data["refresh_token"]
         result = await self.__token_repo.create_refresh(
             create_data=CreateRefreshScheme(
                 user_id=user.id,
-                token=token_data.get('refresh_token'),
+                token=token,
                 expires_at=datetime.utcfromtimestamp(expires_raw),
+                role=create_data.role,
+                jti=payload["jti"],
             )
         )
-        return result
+        if not result:
+            raise ServiceError(
+                'Token already exists. Get active token or exchange expired.'
+            )
+        return self._refresh_scheme(result, token)
 
     async def exchange_refresh_token(
         self,
         token_data: TokenData,
-    ) -> RefreshTokenORM:
-        token_data = token_handler.requre_expired(token_data.token)
-        is_user = token_data.payload.get("role") == "USER"
+    ) -> GetRefreshScheme:
+        token_data = self.__token_handler.requre_expired(token_data.token)
+        payload = token_data.payload
+        is_user = payload["role"] == "USER"
         admin_secret = (
-            None if is_user else jwt_settings.ADMIN_SECRET.get_secret_value()
+            None
+            if is_user
+            else get_jwt_settings().ADMIN_SECRET.get_secret_value()
         )
         create_data = CreateDataScheme(
-            user_id=token_data.payload.get("user_id"),
-            email=token_data.payload.get("email"),
-            role=token_data.payload.get("role"),
+            user_id=payload["user_id"],
+            email=payload["email"],
+            role=payload["role"],
             admin_secret=admin_secret,
         )
-        new_token_data = token_handler.generate_refresh(create_data)
-        new_token = new_token_data.get("refresh_token")
+        new_token_data = self.__token_handler.generate_refresh(create_data)
+        new_token = new_token_data["refresh_token"]
         new_payload = new_token_data.get("payload")
         if not isinstance(new_payload, dict):
             raise ServiceError("Invalid payload format")
@@ -126,28 +198,74 @@ class TokenService:
             update_data=UpdateRefreshScheme(
                 token=new_token,
                 expires_at=datetime.utcfromtimestamp(expires_at),
+                jti=new_payload["jti"],
             ),
         )
         if not result:
             raise ServiceError("Token not found or already deleted")
-        return result
+        return self._refresh_scheme(result, new_token)
 
     async def create_access_token(
         self,
         token_data: TokenData,
     ) -> dict[str, str]:
-        token_data = token_handler.verify_refresh(token_data.token)
-        user = await self.__user_repo.get_user(token_data.payload["user_id"])
+        token_data = self.__token_handler.verify_refresh(token_data.token)
+        user_id = token_data.payload["user_id"]
+        status = await self.__status_cache.get(
+            user_id,
+            loader=partial(self.__user_repo.get_user_status, user_id),
+        )
 
-        if not user or not user.is_verified or not user.is_active:
+        if not status or not status.is_verified or not status.is_active:
             raise ServiceError("User must be verified")
 
         extra_payload = {
-            "is_verified": user.is_verified,
-            "is_active": user.is_active,
+            "is_verified": status.is_verified,
+            "is_active": status.is_active,
         }
-        access_token = token_handler.generate_access(
+        access_token = self.__token_handler.generate_access(
             refresh_token=token_data.token,
             extra_payload=extra_payload,
         )
         return access_token
+
+    async def revoke_token(
+        self,
+        token: str,
+    ) -> RevocationScheme:
+        """
+        Expired tokens are accepted, so a refresh token
+        can no longer be exchanged once revoked.
+        """
+        payload = self.__token_handler.base_decode(token)
+        jti = payload.get("jti")
+        if not jti:
+            raise ServiceError(
+                "Token has no jti. Revoke all tokens of the user instead."
+            )
+        revoked_at = time.time()
+        await self.__revocations.revoke_token(jti, payload["expires"])
+        if payload.get("token_type") == "refresh":
+            await self.__token_repo.delete_refresh(token)
+        return RevocationScheme(
+            user_id=payload["user_id"],
+            jti=jti,
+            revoked_at=datetime.utcfromtimestamp(revoked_at),
+        )
+
+    async def revoke_user_tokens(
+        self,
+        user_id: UUID,
+    ) -> RevocationScheme:
+        """
+        Revokes every token issued to the user so far.
+        The stored refresh token is removed, so the user can sign in
+        and create a new one.
+        """
+        revoked_at = time.time()
+        await self.__revocations.revoke_user(user_id, revoked_at)
+        await self.__token_repo.delete_user_refresh(user_id)
+        return RevocationScheme(
+            user_id=user_id,
+            revoked_at=datetime.utcfromtimestamp(revoked_at),
+        )
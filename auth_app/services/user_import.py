@@ -0,0 +1,234 @@
+import csv
+import json
+import uuid
+from codecs import getincrementaldecoder
+from collections import Counter
+from typing import (
+    AsyncIterator,
+    Callable,
+)
+
+from pydantic import ValidationError
+
+from auth_app.exeptions.custom import ImportFormatError
+from auth_app.messages.common import msg_creator
+from auth_app.repositories.outbox import OutboxRepo
+from auth_app.repositories.users import UserRepo
+from auth_app.schemes.users import (
+    ImportStatusEnum,
+    ImportUserScheme,
+    UserImportResultScheme,
+    UserImportRowScheme,
+)
+from auth_app.services.ses.ses_handler import ses_handler
+from auth_app.services.utils.pwd_hashing import (
+    hash_passwords_async,
+    is_password_hash,
+)
+
+# line number, parsed fields, parse error
+ImportRecord = tuple[int, dict | None, str | None]
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, str]]:
+    """
+    Split a UTF-8 byte stream into numbered lines without buffering it.
+    """
+    decoder = getincrementaldecoder("utf-8")()
+    buffer = ""
+    line_no = 0
+    try:
+        async for chunk in chunks:
+            buffer += decoder.decode(chunk)
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                line_no += 1
+                yield line_no, line.rstrip("\r")
+        buffer += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise ImportFormatError("Import stream must be UTF-8") from e
+    if buffer:
+        yield line_no + 1, buffer.rstrip("\r")
+
+
+async def parse_ndjson(
+    lines: AsyncIterator[tuple[int, str]],
+) -> AsyncIterator[ImportRecord]:
+    async for line_no, line in lines:
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield line_no, None, "Invalid JSON"
+            continue
+        if not isinstance(data, dict):
+            yield line_no, None, "Row must be a JSON object"
+            continue
+        yield line_no, data, None
+
+
+async def parse_csv(
+    lines: AsyncIterator[tuple[int, str]],
+) -> AsyncIterator[ImportRecord]:
+    """
+    CSV with a header row. Empty cells are treated as missing values.
+    """
+    header: list[str] | None = None
+    async for line_no, line in lines:
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in values]
+            if "email" not in header:
+                raise ImportFormatError("CSV header must contain email")
+            continue
+        if len(values) != len(header):
+            yield line_no, None, "Wrong number of columns"
+            continue
+        yield line_no, {k: v for k, v in zip(header, values) if v}, None
+
+
+IMPORT_PARSERS: dict[
+    str,
+    Callable[[AsyncIterator[tuple[int, str]]], AsyncIterator[ImportRecord]],
+] = {
+    "text/csv": parse_csv,
+    "application/x-ndjson": parse_ndjson,
+}
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        (
+            f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+            if err["loc"]
+            else err["msg"]
+        )
+        for err in error.errors()
+    )
+
+
+class UserImportService:
+    """
+    Bulk user import. Rows are validated and hashed in batches
+    and each batch is loaded with a single COPY.
+    """
+
+    def __init__(
+        self,
+        user_repo: UserRepo,
+        outbox_repo: OutboxRepo,
+        batch_size: int = 1000,
+    ) -> None:
+        self.__user_repo = user_repo
+        self.__outbox_repo = outbox_repo
+        self.__batch_size = batch_size
+
+    async def import_users(
+        self,
+        records: AsyncIterator[ImportRecord],
+        send_verification: bool = False,
+    ) -> UserImportResultScheme:
+        rows: list[UserImportRowScheme] = []
+        batch: list[ImportRecord] = []
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= self.__batch_size:
+                rows.extend(
+                    await self.__import_batch(batch, send_verification)
+                )
+                batch = []
+        if batch:
+            rows.extend(await self.__import_batch(batch, send_verification))
+
+        counts = Counter(row.status for row in rows)
+        return UserImportResultScheme(
+            created=counts[ImportStatusEnum.CREATED],
+            duplicates=counts[ImportStatusEnum.DUPLICATE],
+            invalid=counts[ImportStatusEnum.INVALID],
+            rows=rows,
+        )
+
+    async def __import_batch(
+        self,
+        batch: list[ImportRecord],
+        send_verification: bool,
+    ) -> list[UserImportRowScheme]:
+        results: dict[int, UserImportRowScheme] = {}
+        valid: list[tuple[int, ImportUserScheme]] = []
+        for line, data, error in batch:
+            if error is None:
+                try:
+                    user = ImportUserScheme.model_validate(data)
+                except ValidationError as e:
+                    error = _validation_detail(e)
+                else:
+                    if user.password_hash is None or is_password_hash(
+                        user.password_hash
+                    ):
+                        valid.append((line, user))
+                        continue
+                    error = "Unsupported password hash"
+            email = (data or {}).get("email")
+            results[line] = UserImportRowScheme(
+                line=line,
+                status=ImportStatusEnum.INVALID,
+                email=str(email) if email is not None else None,
+                detail=error,
+            )
+
+        hashed = iter(
+            await hash_passwords_async(
+                [user.password for _, user in valid if user.password]
+            )
+        )
+        records = [
+            (
+                line,
+                uuid.uuid4(),
+                user.email,
+                user.password_hash or next(hashed),
+                user.role.value,
+            )
+            for line, user in valid
+        ]
+        inserted = (
+            await self.__user_repo.import_users_batch(records)
+            if records
+            else set()
+        )
+
+        emails = []
+        for line, user_id, email, _, _ in records:
+            if user_id in inserted:
+                results[line] = UserImportRowScheme(
+                    line=line,
+                    status=ImportStatusEnum.CREATED,
+                    email=email,
+                    id=user_id,
+                )
+                emails.append(email)
+            else:
+                results[line] = UserImportRowScheme(
+                    line=line,
+                    status=ImportStatusEnum.DUPLICATE,
+                    email=email,
+                    detail="Email already exists",
+                )
+        if send_verification:
+            await self.__outbox_repo.enqueue_many(
+                [
+                    (
+                        email,
+                        ses_handler.generate_email_payload(
+                            **msg_creator.get_ses_import_message(email)
+                        ),
+                    )
+                    for email in emails
+                ]
+            )
+        return [results[line] for line, _, _ in batch]
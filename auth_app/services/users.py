@@ -1,15 +1,15 @@
+from functools import partial
 from uuid import UUID
 
-from aiobotocore.client import AioBaseClient
-from redis.asyncio.client import Redis
-
-from auth_app.config import jwt_settings
+from auth_app.config import get_jwt_settings
 from auth_app.exeptions.custom import (
     ServiceError,
     UserVerificationError,
 )
 from auth_app.messages.common import msg_creator
+from auth_app.middleware.db_session import after_commit
 from auth_app.models import UserORM
+from auth_app.repositories.outbox import OutboxRepo
 from auth_app.repositories.tokens import TokenRepo
 from auth_app.repositories.users import UserRepo
 from auth_app.schemes.users import (
@@ -21,27 +21,52 @@ from auth_app.schemes.users import (
     RoleEnum,
 )
 from auth_app.services.ses.ses_handler import ses_handler
-from auth_app.services.utils.pwd_hashing import hash_password
+from auth_app.services.utils.otp_store import OTPStore
+from auth_app.services.utils.pwd_hashing import hash_password_async
+from auth_app.services.utils.user_status_cache import UserStatusCache
 from auth_app.services.utils.verification import verify_auth_code
+from auth_app.tracing import traced
 
 
+@traced
 class UserService:
     def __init__(
         self,
         user_repo: UserRepo,
         token_repo: TokenRepo,
-        redis: Redis,
-        ses: AioBaseClient,
+        outbox_repo: OutboxRepo,
+        otp_store: OTPStore,
+        status_cache: UserStatusCache,
     ) -> None:
         self.__user_repo = user_repo
         self.__token_repo = token_repo
-        self.__redis = redis
-        self.__ses = ses
+        self.__outbox_repo = outbox_repo
+        self.__otp_store = otp_store
+        self.__status_cache = status_cache
 
     @property
     def user_repo(self) -> UserRepo:
         return self.__user_repo
 
+    async def __update_user(
+        self,
+        user_id: UUID,
+        patch_dict: dict,
+    ) -> UserORM | None:
+        """
+        Every user update goes through here, so the cached status
+        is always dropped once the change is committed.
+        """
+        result = await self.__user_repo.update_user(
+            user_id=user_id,
+            patch_dict=patch_dict,
+        )
+        after_commit(
+            self.__user_repo.session,
+            partial(self.__status_cache.invalidate, user_id),
+        )
+        return result
+
     async def create_user_record(
         self,
         user_data: CreateUserExtendedScheme,
@@ -49,10 +74,12 @@ class UserService:
         if user_data.role != RoleEnum.USER:
             if (
                 user_data.admin_code
-                != jwt_settings.ADMIN_SECRET.get_secret_value()
+                != get_jwt_settings().ADMIN_SECRET.get_secret_value()
             ):
                 raise ServiceError("Invalid role or permission code")
         record = await self.__user_repo.create_user(user_data)
+        if not record:
+            raise ServiceError("User with this email already exists")
         return record
 
     async def create_init_code_message(
@@ -62,8 +89,8 @@ class UserService:
         email_to = record.email
         await ses_handler.send_confirmation_email(
             email_to=email_to,
-            ses=self.__ses,
-            redis_client=self.__redis,
+            outbox_repo=self.__outbox_repo,
+            otp_store=self.__otp_store,
         )
         response = {
             "record": GetUserScheme.model_validate(record),
@@ -78,8 +105,8 @@ class UserService:
         email_to = payload["email"]
         await ses_handler.send_confirmation_email(
             email_to=email_to,
-            ses=self.__ses,
-            redis_client=self.__redis,
+            outbox_repo=self.__outbox_repo,
+            otp_store=self.__otp_store,
         )
         response = {
             "message": msg_creator.get_code_message(email_to),
@@ -95,6 +122,7 @@ class UserService:
         check = await verify_auth_code(
             email=email_to,
             code=verification_code,
+            otp_store=self.__otp_store,
         )
         if not check:
             raise UserVerificationError()
@@ -103,7 +131,7 @@ class UserService:
             exclude_unset=True,
             exclude_defaults=True,
         )
-        result = await self.__user_repo.update_user(
+        result = await self.__update_user(
             user_id=UUID(payload["user_id"]),
             patch_dict=patch_dict,
         )
@@ -118,15 +146,15 @@ class UserService:
         email_to = payload["email"]
         data = await ses_handler.reset_password(
             email_to=email_to,
-            ses=self.__ses,
+            outbox_repo=self.__outbox_repo,
         )
-        new_pwd_hash = hash_password(data["new_password"])
+        new_pwd_hash = await hash_password_async(data["new_password"])
         patch_model = PatchUserScheme(password_hash=new_pwd_hash)
         patch_dict = patch_model.model_dump(
             exclude_unset=True,
             exclude_defaults=True,
         )
-        record = await self.__user_repo.update_user(
+        record = await self.__update_user(
             user_id=UUID(payload["user_id"]),
             patch_dict=patch_dict,
         )
@@ -1,23 +1,20 @@
 from typing import Optional
 
-from auth_app.repositories.users import UserRepo
-from auth_app.schemes.users import GetUserScheme
-from auth_app.services.utils.pwd_hashing import verify_password
+from auth_app.repositories.users import (
+    AuthUserRow,
+    UserRepo,
+)
+from auth_app.services.utils.pwd_hashing import verify_password_async
 
 
 async def authenticate_user(
     email: str,
     password: str,
     user_repo: UserRepo,
-) -> Optional[GetUserScheme]:
-    users = await user_repo.get_users(
-        {
-            'email': email,
-        }
-    )
-    user = users[0] if users else None
+) -> Optional[AuthUserRow]:
+    user = await user_repo.get_auth_row_by_email(email)
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, user.password_hash):
         return None
     return user
@@ -0,0 +1,60 @@
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys.
+    Never gives false negatives; the false positive rate stays
+    near error_rate while no more than capacity keys are added.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+    ) -> None:
+        capacity = max(capacity, 1)
+        self.size = math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_keys(
+        cls,
+        keys: Iterable[str],
+        capacity: int,
+        error_rate: float,
+    ) -> "BloomFilter":
+        keys = list(keys)
+        bloom = cls(max(capacity, 2 * len(keys)), error_rate)
+        for key in keys:
+            bloom.add(key)
+        return bloom
+
+    def _positions(
+        self,
+        key: str,
+    ) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(
+        self,
+        key: str,
+    ) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
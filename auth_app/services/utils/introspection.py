@@ -0,0 +1,68 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from auth_app.config import get_cache_settings
+from auth_app.exeptions.custom import TokenError
+from auth_app.schemes.tokens import IntrospectResultScheme
+from auth_app.services.utils.revocation import RevocationList
+from auth_app.services.utils.token_handler import TokenHandler
+
+
+class TokenIntrospector:
+    """
+    Stateless token validation for downstream services.
+    Verified payloads are memoised by token digest until the token's
+    own expiry, so repeated checks skip the signature verification.
+    Failed tokens are never cached. Revocation is checked on every
+    call, cached or not.
+    """
+
+    def __init__(
+        self,
+        handler: TokenHandler,
+        max_size: int | None = None,
+    ) -> None:
+        if max_size is None:
+            max_size = get_cache_settings().INTROSPECTION_CACHE_SIZE
+        self._handler = handler
+        self._max_size = max_size
+        self._cache: OrderedDict[bytes, dict] = OrderedDict()
+
+    def introspect(
+        self,
+        token: str,
+    ) -> IntrospectResultScheme:
+        key = hashlib.sha256(token.encode()).digest()
+        payload = self._cache.get(key)
+        if payload is not None:
+            if payload["expires"] > time.time():
+                self._cache.move_to_end(key)
+                return IntrospectResultScheme(active=True, claims=payload)
+            del self._cache[key]
+            return IntrospectResultScheme(active=False, error="Expired token")
+
+        try:
+            payload = self._handler.decode_token(token)
+        except TokenError as e:
+            return IntrospectResultScheme(active=False, error=str(e))
+        self._cache[key] = payload
+        if len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+        return IntrospectResultScheme(active=True, claims=payload)
+
+    async def introspect_many(
+        self,
+        tokens: list[str],
+        revocations: RevocationList,
+    ) -> list[IntrospectResultScheme]:
+        results = []
+        for token in tokens:
+            result = self.introspect(token)
+            if result.active and result.claims is not None:
+                try:
+                    await revocations.check(result.claims)
+                except TokenError as e:
+                    result = IntrospectResultScheme(active=False, error=str(e))
+            results.append(result)
+        return results
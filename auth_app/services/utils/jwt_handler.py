@@ -1,15 +1,11 @@
 import time
+import uuid
 from datetime import datetime
 
-import jwt
-from jwt import (
-    DecodeError,
-    InvalidSignatureError,
-)
-
-from auth_app.config import jwt_settings
+from auth_app.config import get_jwt_settings
 from auth_app.exeptions.custom import TokenError
 from auth_app.schemes.tokens import CreateDataScheme
+from auth_app.services.utils.key_ring import KeyRing
 
 
 class JWTHandler:
@@ -18,6 +14,12 @@ class JWTHandler:
     Using the standard JWT library.
     """
 
+    def __init__(
+        self,
+        keys: KeyRing,
+    ) -> None:
+        self.key_ring = keys
+
     @staticmethod
     def get_refresh_response(
         token: str,
@@ -40,39 +42,27 @@ class JWTHandler:
         self,
         create_data: CreateDataScheme,
     ) -> dict:
-        secret = jwt_settings.ADMIN_SECRET.get_secret_value()
+        secret = get_jwt_settings().ADMIN_SECRET.get_secret_value()
         if create_data.role != "USER" and create_data.admin_secret != secret:
             raise TokenError('Invalid admin secret')
+        now = time.time()
         payload = {
             "user_id": str(create_data.user_id),
             "email": create_data.email,
             "role": create_data.role,
-            "expires": time.time() + jwt_settings.REFRESH_LASTING,
+            "expires": now + get_jwt_settings().REFRESH_LASTING,
             "token_type": "refresh",
+            "jti": uuid.uuid4().hex,
+            "iat": now,
         }
-        token = jwt.encode(
-            payload=payload,
-            key=jwt_settings.KEY.get_secret_value(),
-            algorithm=jwt_settings.ALGORITHM.get_secret_value(),
-        )
+        token = self.key_ring.encode(payload)
         return self.get_refresh_response(token, payload)
 
-    @staticmethod
     def base_decode(
+        self,
         token: str,
     ) -> dict:
-        try:
-            payload = jwt.decode(
-                jwt=token,
-                key=jwt_settings.KEY.get_secret_value(),
-                algorithms=[jwt_settings.ALGORITHM.get_secret_value()],
-            )
-            return payload
-
-        except InvalidSignatureError as e:
-            raise TokenError("Invalid Signature") from e
-        except DecodeError as e:
-            raise TokenError(f"{e}") from e
+        return self.key_ring.decode(token)
 
     def decode_token(
         self,
@@ -96,17 +86,16 @@ class JWTHandler:
         token_type = payload.get("token_type")
         if token_type != "refresh":
             raise TokenError(f"Invalid token type: {token_type}")
+        now = time.time()
         access_payload = {
             "user_id": payload.get("user_id"),
             "email": payload.get("email"),
             "role": payload.get("role"),
-            "expires": time.time() + jwt_settings.ACCESS_LASTING,
+            "expires": now + get_jwt_settings().ACCESS_LASTING,
             "token_type": "access",
+            "jti": uuid.uuid4().hex,
+            "iat": now,
         }
         access_payload.update(extra_payload)
-        access_token = jwt.encode(
-            payload=access_payload,
-            key=jwt_settings.KEY.get_secret_value(),
-            algorithm=jwt_settings.ALGORITHM.get_secret_value(),
-        )
+        access_token = self.key_ring.encode(access_payload)
         return self.get_access_response(access_token)
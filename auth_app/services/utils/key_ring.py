@@ -0,0 +1,283 @@
+import base64
+import hashlib
+import json
+import time
+import warnings
+from pathlib import Path
+from typing import (
+    Any,
+    NamedTuple,
+)
+
+from cryptography.hazmat.primitives.asymmetric import (
+    ec,
+    ed25519,
+    rsa,
+)
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+from jwt.algorithms import (
+    Algorithm,
+    get_default_algorithms,
+)
+from jwt.warnings import InsecureKeyLengthWarning
+
+from auth_app.config import get_jwt_settings
+from auth_app.exeptions.custom import TokenError
+from auth_app.metrics import jwt_calls
+
+# RFC 7638 required members per key type
+_THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+}
+
+
+class JWTKey(NamedTuple):
+    kid: str | None
+    algorithm: str
+    key: Any
+    jwk: dict | None
+
+
+class PreparedKey(NamedTuple):
+    """
+    Everything PyJWT would otherwise resolve on each call:
+    the algorithm instance, the prepared key and, for signing,
+    the already encoded header segment.
+    """
+
+    kid: str | None
+    algorithm: str
+    alg_obj: Algorithm
+    key: Any
+    header: bytes
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    """
+    Strict unpadded base64url, as PyJWS would accept it: anything
+    that does not encode back to the same segment is rejected,
+    so no extra characters or padding ride along with a signature.
+    """
+    decoded = base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+    if _b64encode(decoded) != data:
+        raise ValueError("Non-canonical base64url segment")
+    return decoded
+
+
+def prepare_key(key: JWTKey) -> PreparedKey:
+    alg_obj = get_default_algorithms()[key.algorithm]
+    prepared = alg_obj.prepare_key(key.key)
+    key_length_msg = alg_obj.check_key_length(prepared)
+    if key_length_msg:
+        warnings.warn(key_length_msg, InsecureKeyLengthWarning, stacklevel=2)
+    header = {"alg": key.algorithm, "typ": "JWT"}
+    if key.kid:
+        header["kid"] = key.kid
+    return PreparedKey(
+        kid=key.kid,
+        algorithm=key.algorithm,
+        alg_obj=alg_obj,
+        key=prepared,
+        header=_b64encode(
+            json.dumps(header, separators=(",", ":"), sort_keys=True).encode()
+        ),
+    )
+
+
+def _algorithm_for(public_key: Any) -> str:
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return "RS256"
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        if isinstance(public_key.curve, ec.SECP256R1):
+            return "ES256"
+        if isinstance(public_key.curve, ec.SECP384R1):
+            return "ES384"
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    raise ValueError(f"Unsupported JWT key type: {type(public_key)}")
+
+
+def _public_jwk(
+    public_key: Any,
+    algorithm: str,
+) -> dict:
+    jwk = get_default_algorithms()[algorithm].to_jwk(public_key, as_dict=True)
+    members = {k: jwk[k] for k in _THUMBPRINT_MEMBERS[jwk["kty"]]}
+    digest = hashlib.sha256(
+        json.dumps(members, separators=(",", ":"), sort_keys=True).encode()
+    ).digest()
+    jwk["kid"] = base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+    jwk["alg"] = algorithm
+    jwk["use"] = "sig"
+    return jwk
+
+
+def load_public_key(path: Path) -> JWTKey:
+    public_key = load_pem_public_key(path.read_bytes())
+    algorithm = _algorithm_for(public_key)
+    jwk = _public_jwk(public_key, algorithm)
+    return JWTKey(kid=jwk["kid"], algorithm=algorithm, key=public_key, jwk=jwk)
+
+
+def load_private_key(path: Path) -> tuple[JWTKey, JWTKey]:
+    """
+    Signing key and its public counterpart for verification
+    """
+    private_key = load_pem_private_key(path.read_bytes(), password=None)
+    public_key = private_key.public_key()
+    algorithm = _algorithm_for(public_key)
+    jwk = _public_jwk(public_key, algorithm)
+    return (
+        JWTKey(kid=jwk["kid"], algorithm=algorithm, key=private_key, jwk=None),
+        JWTKey(kid=jwk["kid"], algorithm=algorithm, key=public_key, jwk=jwk),
+    )
+
+
+class KeyRing:
+    """
+    Keys used to sign and verify tokens, parsed and prepared once at
+    startup. With an asymmetric signing key every token carries a kid
+    equal to the RFC 7638 thumbprint of its key; extra verification
+    keys keep tokens of a previous (or upcoming) key valid during
+    rotation and are published in the JWKS document.
+
+    Tokens are only checked for signature and structure here;
+    expiry is the custom 'expires' claim checked by JWTHandler.
+    """
+
+    def __init__(
+        self,
+        signing: JWTKey,
+        verification: list[JWTKey],
+    ) -> None:
+        self.signing = prepare_key(signing)
+        self._verification = {
+            key.kid: prepare_key(key) for key in verification
+        }
+        self.jwks_body = json.dumps(
+            {"keys": [key.jwk for key in verification if key.jwk]},
+            separators=(",", ":"),
+        ).encode()
+        self.jwks_etag = f'"{hashlib.sha256(self.jwks_body).hexdigest()}"'
+
+    @classmethod
+    def from_settings(cls) -> "KeyRing":
+        jwt_settings = get_jwt_settings()
+        algorithm = jwt_settings.ALGORITHM.get_secret_value()
+        if jwt_settings.JWT_SIGNING_KEY_FILE is None:
+            symmetric = JWTKey(
+                kid=None,
+                algorithm=algorithm,
+                key=jwt_settings.KEY.get_secret_value(),
+                jwk=None,
+            )
+            return cls(signing=symmetric, verification=[symmetric])
+
+        signing, public = load_private_key(jwt_settings.JWT_SIGNING_KEY_FILE)
+        if signing.algorithm != algorithm:
+            raise ValueError(
+                f"ALGORITHM is {algorithm}, "
+                f"but the signing key is a {signing.algorithm} key"
+            )
+        verification = [public] + [
+            load_public_key(path)
+            for path in jwt_settings.JWT_VERIFICATION_KEY_FILES
+        ]
+        if jwt_settings.JWT_LEGACY_HS_ALGORITHM:
+            # kid-less tokens issued before the switch to key pairs
+            verification.append(
+                JWTKey(
+                    kid=None,
+                    algorithm=jwt_settings.JWT_LEGACY_HS_ALGORITHM,
+                    key=jwt_settings.KEY.get_secret_value(),
+                    jwk=None,
+                )
+            )
+        return cls(signing=signing, verification=verification)
+
+    def encode(
+        self,
+        payload: dict,
+    ) -> str:
+        started = time.perf_counter()
+        try:
+            return self._encode(payload)
+        finally:
+            jwt_calls["encode"].observe(time.perf_counter() - started)
+
+    def decode(
+        self,
+        token: str,
+    ) -> dict:
+        started = time.perf_counter()
+        try:
+            return self._decode(token)
+        finally:
+            jwt_calls["decode"].observe(time.perf_counter() - started)
+
+    def _encode(
+        self,
+        payload: dict,
+    ) -> str:
+        signing_input = (
+            self.signing.header
+            + b"."
+            + _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+        )
+        signature = self.signing.alg_obj.sign(signing_input, self.signing.key)
+        return (signing_input + b"." + _b64encode(signature)).decode()
+
+    def _decode(
+        self,
+        token: str,
+    ) -> dict:
+        parts = token.encode().split(b".")
+        if len(parts) != 3:
+            raise TokenError("Not enough segments")
+        header_segment, payload_segment, crypto_segment = parts
+        try:
+            header = json.loads(_b64decode(header_segment))
+            signature = _b64decode(crypto_segment)
+        except ValueError as e:
+            raise TokenError("Invalid header or signature encoding") from e
+        if not isinstance(header, dict):
+            raise TokenError("Invalid header string: must be a json object")
+        if "crit" in header:
+            # no extension is understood, so none may be required
+            raise TokenError("Unsupported critical extension")
+        if header.get("b64", True) is not True:
+            raise TokenError("Unencoded payloads are not supported")
+
+        kid = header.get("kid")
+        key = (
+            self._verification.get(kid)
+            if kid is None or isinstance(kid, str)
+            else None
+        )
+        if key is None:
+            raise TokenError("Unknown signing key")
+        if header.get("alg") != key.algorithm:
+            raise TokenError("The specified alg value is not allowed")
+        if not key.alg_obj.verify(
+            header_segment + b"." + payload_segment,
+            key.key,
+            signature,
+        ):
+            raise TokenError("Invalid Signature")
+
+        try:
+            payload = json.loads(_b64decode(payload_segment))
+        except ValueError as e:
+            raise TokenError("Invalid payload encoding") from e
+        if not isinstance(payload, dict):
+            raise TokenError("Invalid payload string: must be a json object")
+        return payload
@@ -0,0 +1,130 @@
+import hashlib
+import hmac
+
+from redis.asyncio.client import Redis
+
+from auth_app.config import (
+    get_jwt_settings,
+    get_otp_settings,
+)
+from auth_app.exeptions.custom import RateLimitError
+
+# KEYS: code, issue counter. ARGV: digest, ttl, max issues, issue window.
+# Returns 0 or the seconds until another code may be issued.
+ISSUE_SCRIPT = """
+local issued = redis.call('INCR', KEYS[2])
+if issued == 1 then
+    redis.call('EXPIRE', KEYS[2], ARGV[4])
+end
+if issued > tonumber(ARGV[3]) then
+    return math.max(redis.call('TTL', KEYS[2]), 1)
+end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], 'digest', ARGV[1], 'attempts', 0)
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 0
+"""
+
+# KEYS: code, failure counter.
+# ARGV: digest, max attempts per code, max failures, failure window.
+# Returns 1 for a match (the code is consumed), 0 for a miss
+# or a negative number of seconds the email stays locked.
+VERIFY_SCRIPT = """
+local failures = tonumber(redis.call('GET', KEYS[2]) or '0')
+if failures >= tonumber(ARGV[3]) then
+    return -math.max(redis.call('TTL', KEYS[2]), 1)
+end
+local digest = redis.call('HGET', KEYS[1], 'digest')
+if not digest then
+    return 0
+end
+if digest == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+if redis.call('HINCRBY', KEYS[1], 'attempts', 1) >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+end
+if redis.call('INCR', KEYS[2]) == 1 then
+    redis.call('EXPIRE', KEYS[2], ARGV[4])
+end
+return 0
+"""
+
+
+class OTPStore:
+    """
+    One-time verification codes kept in Redis as HMAC digests.
+    Issuing and checking a code are single script calls, so the check,
+    the consumption of a matching code and the attempt counting
+    cannot interleave with a concurrent request.
+    A code is dropped after OTP_MAX_ATTEMPTS misses, an email is locked
+    after OTP_MAX_FAILURES misses and may be sent OTP_MAX_ISSUES codes
+    per window.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+    ) -> None:
+        self._settings = get_otp_settings()
+        secret = self._settings.OTP_HMAC_KEY or get_jwt_settings().KEY
+        self._key = secret.get_secret_value().encode()
+        self._issue = redis.register_script(ISSUE_SCRIPT)
+        self._verify = redis.register_script(VERIFY_SCRIPT)
+
+    @staticmethod
+    def _keys(
+        email: str,
+        counter: str,
+    ) -> list[str]:
+        # same hash slot for both keys of a script
+        return [f"otp:{{{email}}}", f"otp-{counter}:{{{email}}}"]
+
+    def _digest(
+        self,
+        email: str,
+        code: str,
+    ) -> str:
+        message = f"{email}:{code}".encode()
+        return hmac.new(self._key, message, hashlib.sha256).hexdigest()
+
+    async def issue(
+        self,
+        email: str,
+        code: str,
+    ) -> None:
+        """
+        Replaces the previous code of the email
+        """
+        wait = await self._issue(
+            keys=self._keys(email, "issued"),
+            args=[
+                self._digest(email, code),
+                self._settings.OTP_TTL,
+                self._settings.OTP_MAX_ISSUES,
+                self._settings.OTP_ISSUE_WINDOW,
+            ],
+        )
+        if wait:
+            raise RateLimitError(int(wait))
+
+    async def verify(
+        self,
+        email: str,
+        code: str,
+    ) -> bool:
+        result = int(
+            await self._verify(
+                keys=self._keys(email, "failures"),
+                args=[
+                    self._digest(email, code),
+                    self._settings.OTP_MAX_ATTEMPTS,
+                    self._settings.OTP_MAX_FAILURES,
+                    self._settings.OTP_FAILURE_WINDOW,
+                ],
+            )
+        )
+        if result < 0:
+            raise RateLimitError(-result)
+        return result == 1
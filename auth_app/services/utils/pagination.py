@@ -0,0 +1,17 @@
+import base64
+from uuid import UUID
+
+
+def encode_cursor(last_id: UUID) -> str:
+    """
+    Opaque cursor pointing right after the given record
+    """
+    return base64.urlsafe_b64encode(last_id.bytes).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> UUID:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return UUID(bytes=base64.urlsafe_b64decode(padded))
+    except ValueError as e:
+        raise ValueError("Invalid pagination cursor") from e
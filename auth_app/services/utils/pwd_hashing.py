@@ -1,16 +1,280 @@
-from passlib.context import CryptContext
+import asyncio
+import functools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    NamedTuple,
+)
 
-from auth_app.config import pwd_settings
+from passlib.context import CryptContext
 
-pwd_context = CryptContext(
-    schemes=[pwd_settings.HASHING_ALGORITHM.get_secret_value()],
-    deprecated=[pwd_settings.HASHING_DEPRECATED.get_secret_value()],
+from auth_app.config import (
+    available_cpus,
+    get_pwd_settings,
+    get_server_settings,
 )
+from auth_app.exeptions.custom import HashingError
+from auth_app.metrics import hashing_calls
+from auth_app.tracing import span
+
+
+@functools.cache
+def get_pwd_context() -> CryptContext:
+    # built on first use in every process, the pool workers included
+    algorithm, deprecated = get_pwd_settings().hashing_algorithm
+    return CryptContext(schemes=[algorithm], deprecated=[deprecated])
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    pwd_context = get_pwd_context()
+    return [pwd_context.hash(password) for password in passwords]
+
+
+def is_password_hash(value: str) -> bool:
+    return get_pwd_context().identify(value, required=False) is not None
+
+
+class HashingPoolStats(NamedTuple):
+    size: int
+    max_queue: int
+    in_flight: int
+    busy: int
+    queued: int
+    peak_in_flight: int
+    completed: int
+    rejected: int
+    timed_out: int
+
+
+class HashingPool:
+    """
+    Bounded process pool for password hashing and verification.
+    Keeps bcrypt off the event loop and rejects new work once
+    all workers are busy and the waiting queue is full.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_queue: int,
+        timeout: float,
+    ) -> None:
+        self.size = size
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+        # one permit per worker process, callers beyond wait here;
+        # created for the running loop on first use
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._workers: asyncio.Semaphore | None = None
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.size,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _slots(self) -> asyncio.Semaphore:
+        """
+        Worker permits of the running loop. A semaphore can only be
+        awaited from one loop, a new loop (another lifespan or test
+        client in the same process) starts over with fresh counters.
+        """
+        loop = asyncio.get_running_loop()
+        if self._workers is None or self._loop is not loop:
+            self._loop = loop
+            self._workers = asyncio.Semaphore(self.size)
+            self._in_flight = 0
+        return self._workers
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+    ) -> Any:
+        """
+        Waits for a free worker, then gives the call HASHING_TIMEOUT
+        seconds to run. A call that times out keeps its worker busy
+        until the process is done with it, so it keeps counting
+        against the pool.
+        """
+        workers = self._slots()
+        if self._in_flight >= self.size + self.max_queue:
+            self._rejected += 1
+            raise HashingError("Password hashing pool is saturated")
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            await workers.acquire()
+        except BaseException:
+            self._in_flight -= 1
+            raise
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self._release(workers)
+            raise
+        future.add_done_callback(
+            lambda _: self._release_threadsafe(loop, workers)
+        )
+        try:
+            result = await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=self.timeout,
+            )
+        except asyncio.TimeoutError as e:
+            self._timed_out += 1
+            raise HashingError("Password hashing timed out") from e
+        self._completed += 1
+        return result
+
+    def _release(self, workers: asyncio.Semaphore) -> None:
+        if workers is not self._workers:
+            # a slot of a previous loop, its counters are gone
+            return
+        self._in_flight -= 1
+        workers.release()
+
+    def _release_threadsafe(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        workers: asyncio.Semaphore,
+    ) -> None:
+        """
+        Done callback of the executor future, called from its thread
+        """
+        try:
+            loop.call_soon_threadsafe(self._release, workers)
+        except RuntimeError:
+            # the loop is closed, nobody waits for the slot any more
+            pass
+
+    async def warm_up(self) -> int:
+        """
+        Spawns the worker processes before the first login needs them.
+        Returns the number of distinct workers that answered.
+        """
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(
+            *(
+                loop.run_in_executor(self.executor, _worker_pid)
+                for _ in range(self.size)
+            )
+        )
+        return len(set(pids))
+
+    def stats(self) -> HashingPoolStats:
+        return HashingPoolStats(
+            size=self.size,
+            max_queue=self.max_queue,
+            in_flight=self._in_flight,
+            busy=min(self._in_flight, self.size),
+            queued=max(self._in_flight - self.size, 0),
+            peak_in_flight=self._peak_in_flight,
+            completed=self._completed,
+            rejected=self._rejected,
+            timed_out=self._timed_out,
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def default_pool_size() -> int:
+    """
+    Share of the CPUs of one server worker, each worker process
+    runs a hashing pool of its own
+    """
+    workers = get_server_settings().SERVER_WORKERS or 1
+    return max(1, available_cpus() // workers)
+
+
+@functools.cache
+def default_hashing_pool() -> HashingPool:
+    """
+    The pool shared by the process, created on first use
+    """
+    pwd_settings = get_pwd_settings()
+    return HashingPool(
+        size=pwd_settings.HASHING_POOL_SIZE or default_pool_size(),
+        max_queue=pwd_settings.HASHING_MAX_QUEUE,
+        timeout=pwd_settings.HASHING_TIMEOUT,
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    started = time.perf_counter()
+    try:
+        with span("password.hash"):
+            return await default_hashing_pool().run(hash_password, password)
+    finally:
+        hashing_calls["hash"].observe(time.perf_counter() - started)
+
+
+async def verify_password_async(
+    plain_password: str,
+    hashed_password: str,
+) -> bool:
+    started = time.perf_counter()
+    try:
+        with span("password.verify"):
+            return await default_hashing_pool().run(
+                verify_password,
+                plain_password,
+                hashed_password,
+            )
+    finally:
+        hashing_calls["verify"].observe(time.perf_counter() - started)
+
+
+async def hash_passwords_async(
+    passwords: list[str],
+    slice_size: int = 4,
+) -> list[str]:
+    """
+    Hash a batch across all pool workers. Only one small slice per
+    worker is in flight at a time, so interactive logins queued
+    behind a bulk job wait for a single slice at most.
+    """
+    slices = [
+        passwords[i : i + slice_size]
+        for i in range(0, len(passwords), slice_size)
+    ]
+    hashing_pool = default_hashing_pool()
+    semaphore = asyncio.Semaphore(hashing_pool.size)
+
+    async def hash_slice(part: list[str]) -> list[str]:
+        async with semaphore:
+            return await hashing_pool.run(hash_passwords, part)
+
+    hashed = await asyncio.gather(*(hash_slice(part) for part in slices))
+    return list(chain.from_iterable(hashed))
@@ -0,0 +1,180 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from fastapi import Request
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from auth_app.config import get_rate_limit_settings
+from auth_app.exeptions.custom import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+# KEYS: bucket keys, ARGV: now, then capacity and period of every bucket.
+# Takes one token from every bucket or, when any of them is empty,
+# from none. Returns the wait of every bucket, 0 for the ones with tokens.
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local buckets = {}
+local waits = {}
+local allowed = true
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local refill = capacity / tonumber(ARGV[i * 2 + 1])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill)
+    buckets[i] = {tokens, refill, capacity}
+    if tokens < 1 then
+        allowed = false
+        waits[i] = tostring((1 - tokens) / refill)
+    else
+        waits[i] = '0'
+    end
+end
+if allowed then
+    for i, key in ipairs(KEYS) do
+        local tokens = buckets[i][1] - 1
+        local ttl = (buckets[i][3] - tokens) / buckets[i][2]
+        redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+        redis.call('PEXPIRE', key, math.ceil(ttl * 1000))
+    end
+end
+return waits
+"""
+
+
+class Rate(NamedTuple):
+    """
+    Bucket of capacity attempts, refilled evenly over period seconds
+    """
+
+    capacity: int
+    period: float
+
+
+class RateLimiter:
+    """
+    Token buckets kept in Redis and updated atomically by a Lua script.
+    A bucket found empty is remembered in-process until it refills,
+    so a client hammering a blocked key costs no Redis round trip.
+    Redis failures let the attempt through.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        local_size: int | None = None,
+    ) -> None:
+        if local_size is None:
+            local_size = get_rate_limit_settings().RATE_LIMIT_LOCAL_SIZE
+        self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+        self._local_size = local_size
+        self._blocked: OrderedDict[str, float] = OrderedDict()
+
+    async def hit(
+        self,
+        buckets: dict[str, Rate],
+    ) -> None:
+        now = time.monotonic()
+        local_wait = 0.0
+        for key in buckets:
+            blocked_until = self._blocked.get(key)
+            if blocked_until is None:
+                continue
+            if blocked_until <= now:
+                del self._blocked[key]
+            else:
+                local_wait = max(local_wait, blocked_until - now)
+        if local_wait:
+            raise RateLimitError(local_wait)
+
+        args: list[float] = [time.time()]
+        for rate in buckets.values():
+            args.extend(rate)
+        try:
+            waits = await self._script(keys=list(buckets), args=args)
+        except RedisError as e:
+            logger.warning("Rate limit check failed: %r", e)
+            return
+
+        retry_after = 0.0
+        for key, wait in zip(buckets, waits):
+            wait = float(wait)
+            if wait > 0:
+                self._block(key, now + wait)
+                retry_after = max(retry_after, wait)
+        if retry_after:
+            raise RateLimitError(retry_after)
+
+    def _block(
+        self,
+        key: str,
+        until: float,
+    ) -> None:
+        self._blocked[key] = until
+        self._blocked.move_to_end(key)
+        if len(self._blocked) > self._local_size:
+            self._blocked.popitem(last=False)
+
+
+def client_ip(request: Request) -> str:
+    if get_rate_limit_settings().RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimit:
+    """
+    Route dependency checking the buckets of the client IP, of the
+    email in the JSON body and of the scope as a whole. Routes sharing
+    a scope share their buckets. Declared in the route's dependencies,
+    it runs before the endpoint touches the database or a password hash.
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        per_ip: Rate | None = None,
+        per_email: Rate | None = None,
+        overall: Rate | None = None,
+    ) -> None:
+        self.scope = scope
+        self.per_ip = per_ip
+        self.per_email = per_email
+        self.overall = overall
+
+    async def __call__(
+        self,
+        request: Request,
+    ) -> None:
+        if not get_rate_limit_settings().RATE_LIMIT_ENABLED:
+            return
+        buckets = {}
+        if self.per_ip:
+            buckets[f"rl:{self.scope}:ip:{client_ip(request)}"] = self.per_ip
+        if self.per_email:
+            email = await self._body_email(request)
+            if email:
+                buckets[f"rl:{self.scope}:email:{email}"] = self.per_email
+        if self.overall:
+            buckets[f"rl:{self.scope}"] = self.overall
+        if buckets:
+            await request.app.state.resources.rate_limiter.hit(buckets)
+
+    @staticmethod
+    async def _body_email(request: Request) -> str | None:
+        """
+        The body is already read and cached by FastAPI at this point
+        """
+        try:
+            body = await request.json()
+        except ValueError:
+            return None
+        email = body.get("email") if isinstance(body, dict) else None
+        return email.strip().lower() if isinstance(email, str) else None
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import time
+from uuid import UUID
+
+from redis.asyncio.client import (
+    PubSub,
+    Redis,
+)
+from redis.exceptions import RedisError
+
+from auth_app.config import (
+    get_jwt_settings,
+    get_revocation_settings,
+)
+from auth_app.exeptions.custom import TokenError
+from auth_app.services.utils.bloom_filter import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+# revoked jti -> token expiry
+REVOKED_TOKENS_KEY = "revoked:tokens"
+# user id -> time before which all of the user's tokens are revoked
+REVOKED_USERS_KEY = "revoked:users"
+
+
+def _token_member(jti: str) -> str:
+    return f"j:{jti}"
+
+
+def _user_member(user_id: str) -> str:
+    return f"u:{user_id}"
+
+
+class RevocationList:
+    """
+    Revoked tokens, by jti or by user, kept in Redis sorted sets scored
+    by the time the entry stops mattering, so expired entries are pruned
+    on every write. Each worker keeps a Bloom filter of the live entries,
+    rebuilt from Redis periodically and updated over pub/sub: a token
+    that misses the filter is not revoked and costs no round trip.
+    Until the filter is built, and when Redis cannot be reached for a
+    possible hit, tokens are checked against Redis or rejected.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        channel: str | None = None,
+        capacity: int | None = None,
+        error_rate: float | None = None,
+        rebuild_interval: float | None = None,
+    ) -> None:
+        settings = get_revocation_settings()
+        jwt_settings = get_jwt_settings()
+        self._redis = redis
+        self._channel = channel or settings.REVOCATION_CHANNEL
+        self._capacity = (
+            settings.REVOCATION_BLOOM_CAPACITY
+            if capacity is None
+            else capacity
+        )
+        self._error_rate = (
+            settings.REVOCATION_BLOOM_ERROR_RATE
+            if error_rate is None
+            else error_rate
+        )
+        self._rebuild_interval = (
+            settings.REVOCATION_REBUILD_INTERVAL
+            if rebuild_interval is None
+            else rebuild_interval
+        )
+        # no token outlives a user revocation by more than this
+        self._max_token_lifetime = max(
+            jwt_settings.REFRESH_LASTING, jwt_settings.ACCESS_LASTING
+        )
+        self._bloom: BloomFilter | None = None
+        self._pubsub: PubSub | None = None
+        self._listener: asyncio.Task | None = None
+
+    async def revoke_token(
+        self,
+        jti: str,
+        expires: float,
+    ) -> None:
+        await self._revoke(
+            REVOKED_TOKENS_KEY,
+            jti,
+            score=expires,
+            prune_before=time.time(),
+            member=_token_member(jti),
+        )
+
+    async def revoke_user(
+        self,
+        user_id: UUID | str,
+        revoked_at: float,
+    ) -> None:
+        user_id = str(user_id)
+        await self._revoke(
+            REVOKED_USERS_KEY,
+            user_id,
+            score=revoked_at,
+            prune_before=time.time() - self._max_token_lifetime,
+            member=_user_member(user_id),
+        )
+
+    async def _revoke(
+        self,
+        key: str,
+        value: str,
+        score: float,
+        prune_before: float,
+        member: str,
+    ) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(key, {value: score}, gt=True)
+            pipe.zremrangebyscore(key, "-inf", prune_before)
+            pipe.publish(self._channel, member)
+            await pipe.execute()
+        if self._bloom is not None:
+            self._bloom.add(member)
+
+    def might_be_revoked(
+        self,
+        payload: dict,
+    ) -> bool:
+        if self._bloom is None:
+            return True
+        jti = payload.get("jti")
+        return (
+            jti is not None and _token_member(jti) in self._bloom
+        ) or _user_member(str(payload.get("user_id"))) in self._bloom
+
+    async def is_revoked(
+        self,
+        payload: dict,
+    ) -> bool:
+        if not self.might_be_revoked(payload):
+            return False
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.zscore(REVOKED_TOKENS_KEY, payload.get("jti") or "")
+                pipe.zscore(REVOKED_USERS_KEY, str(payload.get("user_id")))
+                token_expires, user_revoked_at = await pipe.execute()
+        except RedisError as e:
+            logger.warning("Token revocation check failed: %r", e)
+            raise TokenError("Unable to check token revocation") from e
+        if token_expires is not None:
+            return True
+        # tokens issued before iat was added count as revoked
+        return (
+            user_revoked_at is not None
+            and payload.get("iat", 0) < user_revoked_at
+        )
+
+    async def check(
+        self,
+        payload: dict,
+    ) -> None:
+        if await self.is_revoked(payload):
+            raise TokenError("Revoked token")
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+    async def rebuild(self) -> None:
+        now = time.time()
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.zrangebyscore(REVOKED_TOKENS_KEY, now, "+inf")
+            pipe.zrangebyscore(
+                REVOKED_USERS_KEY,
+                now - self._max_token_lifetime,
+                "+inf",
+            )
+            tokens, users = await pipe.execute()
+        self._bloom = BloomFilter.from_keys(
+            [_token_member(jti) for jti in tokens]
+            + [_user_member(user_id) for user_id in users],
+            capacity=self._capacity,
+            error_rate=self._error_rate,
+        )
+
+    async def _listen(self) -> None:
+        """
+        Subscribes before every rebuild, so revocations published
+        while the snapshot is read are applied on top of it.
+        """
+        while True:
+            try:
+                if self._pubsub is None:
+                    self._pubsub = self._redis.pubsub()
+                    await self._pubsub.subscribe(self._channel)
+                await self.rebuild()
+                rebuild_at = time.monotonic() + self._rebuild_interval
+                while time.monotonic() < rebuild_at:
+                    message = await self._pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=1.0,
+                    )
+                    if message is not None and self._bloom is not None:
+                        self._bloom.add(message["data"])
+            except RedisError as e:
+                # revocations may have been missed while disconnected
+                logger.warning("Token revocation feed lost: %r", e)
+                self._bloom = None
+                if self._pubsub is not None:
+                    await self._pubsub.aclose()
+                    self._pubsub = None
+                await asyncio.sleep(1)
@@ -1,6 +1,9 @@
 from typing import NamedTuple
 
-from fastapi import Security
+from fastapi import (
+    Request,
+    Security,
+)
 from fastapi.security import (
     HTTPAuthorizationCredentials,
     HTTPBearer,
@@ -8,6 +11,9 @@ from fastapi.security import (
 
 from auth_app.exeptions.custom import TokenError
 from auth_app.services.utils.jwt_handler import JWTHandler
+from auth_app.services.utils.key_ring import KeyRing
+
+oauth2_scheme = HTTPBearer()
 
 
 class TokenData(NamedTuple):
@@ -20,9 +26,11 @@ class TokenHandler(JWTHandler):
     A service for implementing operations related to token verification.
     """
 
-    def __init__(self) -> None:
-        super().__init__()
-        self.oauth2_scheme = HTTPBearer()
+    def __init__(
+        self,
+        keys: KeyRing,
+    ) -> None:
+        super().__init__(keys)
 
     def requre_expired(
         self,
@@ -66,13 +74,12 @@ class TokenHandler(JWTHandler):
         return TokenData(token=token, payload=payload)
 
 
-token_handler = TokenHandler()
-
-
-def get_current_token_payload(
-    token: HTTPAuthorizationCredentials = Security(
-        token_handler.oauth2_scheme
-    ),
+async def get_current_token_payload(
+    request: Request,
+    token: HTTPAuthorizationCredentials = Security(oauth2_scheme),
 ) -> TokenData:
-    token_data = token_handler.verify_refresh(token.credentials)
+    resources = request.app.state.resources
+    token_data = resources.token_handler.verify_refresh(token.credentials)
+    revocations = resources.revocation_list
+    await revocations.check(token_data.payload)
     return token_data
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import (
+    Awaitable,
+    Callable,
+    cast,
+)
+from uuid import UUID
+
+from redis.asyncio.client import (
+    PubSub,
+    Redis,
+)
+from redis.exceptions import RedisError
+
+from auth_app.config import get_cache_settings
+from auth_app.models.users import UserStatus
+
+logger = logging.getLogger(__name__)
+
+# KEYS: status hash. ARGV: generation seen before loading, verified,
+# active, ttl. Returns 1 when stored, 0 when an invalidation ran since.
+WRITE_BACK_SCRIPT = """
+if (redis.call('HGET', KEYS[1], 'g') or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'v', ARGV[2], 'a', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+
+class UserStatusCache:
+    """
+    Read-through cache of the user flags checked on every access-token
+    mint. A short-lived in-process LRU sits in front of Redis hashes;
+    invalidations are broadcast to every worker over pub/sub.
+    Redis failures fall back to the loader.
+
+    An invalidation bumps a generation kept in the hash, and a reader
+    writes the status it loaded back only if the generation it saw
+    before loading is unchanged. A row loaded before a commit is thus
+    never cached after the invalidation that follows the commit.
+    The generation lives for USER_STATUS_TTL, so only a loader slower
+    than that could still store a stale status, for one more TTL.
+    In-process entries are guarded the same way by a counter of the
+    invalidations seen by the worker; an invalidation published by
+    another worker reaches it with the pub/sub delay.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        ttl: int | None = None,
+        local_ttl: float | None = None,
+        local_size: int | None = None,
+        channel: str | None = None,
+    ) -> None:
+        settings = get_cache_settings()
+        self._redis = redis
+        self._ttl = settings.USER_STATUS_TTL if ttl is None else ttl
+        self._local_ttl = (
+            settings.USER_STATUS_LOCAL_TTL if local_ttl is None else local_ttl
+        )
+        self._local_size = (
+            settings.USER_STATUS_LOCAL_SIZE
+            if local_size is None
+            else local_size
+        )
+        self._channel = channel or settings.USER_STATUS_CHANNEL
+        self._local: OrderedDict[str, tuple[float, UserStatus]] = OrderedDict()
+        # bumped by every invalidation seen, guards local write-backs
+        self._invalidations = 0
+        self._write_back = redis.register_script(WRITE_BACK_SCRIPT)
+        self._pubsub: PubSub | None = None
+        self._listener: asyncio.Task | None = None
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f"user-status:{user_id}"
+
+    async def get(
+        self,
+        user_id: UUID | str,
+        loader: Callable[[], Awaitable[UserStatus | None]],
+    ) -> UserStatus | None:
+        user_id = str(user_id)
+        status = self._get_local(user_id)
+        if status is not None:
+            return status
+        invalidations = self._invalidations
+        try:
+            verified, active, generation = await cast(
+                Awaitable[list],
+                self._redis.hmget(self._key(user_id), ["v", "a", "g"]),
+            )
+        except RedisError as e:
+            logger.warning("User status cache read failed: %r", e)
+            verified = active = generation = None
+        if verified is not None and active is not None:
+            status = UserStatus(verified == "1", active == "1")
+            if invalidations == self._invalidations:
+                self._set_local(user_id, status)
+            return status
+
+        status = await loader()
+        if status is not None and await self._set_remote(
+            user_id,
+            status,
+            generation or "0",
+        ):
+            if invalidations == self._invalidations:
+                self._set_local(user_id, status)
+        return status
+
+    async def invalidate(
+        self,
+        user_id: UUID | str,
+    ) -> None:
+        user_id = str(user_id)
+        self._drop_local(user_id)
+        key = self._key(user_id)
+        try:
+            # MULTI: no reader sees the new generation with the old flags
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.hincrby(key, "g", 1)
+                pipe.hdel(key, "v", "a")
+                pipe.expire(key, self._ttl)
+                pipe.publish(self._channel, user_id)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("User status cache invalidation failed: %r", e)
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                if self._pubsub is None:
+                    self._pubsub = self._redis.pubsub()
+                    await self._pubsub.subscribe(self._channel)
+                async for message in self._pubsub.listen():
+                    if message["type"] == "message":
+                        self._drop_local(message["data"])
+            except RedisError as e:
+                # invalidations may have been missed while disconnected
+                logger.warning("User status invalidation feed lost: %r", e)
+                self._invalidations += 1
+                self._local.clear()
+                if self._pubsub is not None:
+                    await self._pubsub.aclose()
+                    self._pubsub = None
+                await asyncio.sleep(1)
+
+    def _drop_local(
+        self,
+        user_id: str,
+    ) -> None:
+        self._invalidations += 1
+        self._local.pop(user_id, None)
+
+    def _get_local(
+        self,
+        user_id: str,
+    ) -> UserStatus | None:
+        item = self._local.get(user_id)
+        if item is None:
+            return None
+        expires_at, status = item
+        if expires_at < time.monotonic():
+            del self._local[user_id]
+            return None
+        self._local.move_to_end(user_id)
+        return status
+
+    def _set_local(
+        self,
+        user_id: str,
+        status: UserStatus,
+    ) -> None:
+        self._local[user_id] = (time.monotonic() + self._local_ttl, status)
+        self._local.move_to_end(user_id)
+        if len(self._local) > self._local_size:
+            self._local.popitem(last=False)
+
+    async def _set_remote(
+        self,
+        user_id: str,
+        status: UserStatus,
+        generation: str,
+    ) -> bool:
+        """
+        False when the user was invalidated since the generation was
+        read: the loaded status may predate the change
+        """
+        try:
+            stored = await self._write_back(
+                keys=[self._key(user_id)],
+                args=[
+                    generation,
+                    int(status.is_verified),
+                    int(status.is_active),
+                    self._ttl,
+                ],
+            )
+        except RedisError as e:
+            logger.warning("User status cache write failed: %r", e)
+            # no invalidations can arrive either, the local ttl bounds it
+            return True
+        return bool(stored)
@@ -1,21 +1,20 @@
-from auth_app.db.connect_redis import redis_client
 from auth_app.exeptions.custom import (
     UserActivityError,
     UserVerificationError,
 )
 from auth_app.schemes.users import GetUserScheme
+from auth_app.services.utils.otp_store import OTPStore
 
 
 async def verify_auth_code(
     email: str,
     code: str,
+    otp_store: OTPStore,
 ) -> bool:
     """
-    Compare the transmitted one-time password with the cached one
+    Check and consume the transmitted one-time password
     """
-    cached_code = await redis_client.get(f"otp:{email}")
-    print(f"cached_code: {cached_code}, otp: {code}")
-    return cached_code == code
+    return await otp_store.verify(email=email, code=code)
 
 
 async def check_auth_statuses(
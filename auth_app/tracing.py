@@ -0,0 +1,238 @@
+import functools
+import inspect
+from contextlib import (
+    AbstractContextManager,
+    nullcontext,
+)
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    TypeVar,
+)
+
+from opentelemetry import (
+    propagate,
+    trace,
+)
+from opentelemetry.context import Context
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SimpleSpanProcessor,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import (
+    ParentBased,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import (
+    SpanKind,
+    Status,
+    StatusCode,
+)
+from sqlalchemy import (
+    Engine,
+    event,
+)
+
+from auth_app.config import get_tracing_settings
+
+T = TypeVar("T")
+
+tracer = trace.get_tracer("auth_app")
+
+_DISABLED = nullcontext()
+
+
+def tracing_enabled() -> bool:
+    """
+    Read on every call from the cached settings, not at import
+    """
+    return get_tracing_settings().TRACING_ENABLED
+
+
+def span(
+    name: str,
+    kind: SpanKind = SpanKind.INTERNAL,
+    attributes: dict[str, Any] | None = None,
+) -> AbstractContextManager:
+    """
+    Child span of the current one. Exceptions raised inside are recorded
+    on the span. A shared no-op context when tracing is disabled.
+    """
+    if not tracing_enabled():
+        return _DISABLED
+    return tracer.start_as_current_span(
+        name,
+        kind=kind,
+        attributes=attributes,
+    )
+
+
+def traced(cls: type[T]) -> type[T]:
+    """
+    Class decorator wrapping every public coroutine method of the class
+    in a span named Class.method. Async generators are left as they are.
+    With tracing disabled a call returns the coroutine of the method
+    itself, no extra frame is added.
+    """
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(attr):
+            continue
+        setattr(cls, name, _traced_method(attr, f"{cls.__name__}.{name}"))
+    return cls
+
+
+def _traced_method(
+    func: Callable[..., Any],
+    name: str,
+) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Coroutine[Any, Any, Any]:
+        if not tracing_enabled():
+            return func(*args, **kwargs)
+        return _in_span(name, func(*args, **kwargs))
+
+    return wrapper
+
+
+async def _in_span(
+    name: str,
+    coro: Coroutine[Any, Any, T],
+) -> T:
+    with tracer.start_as_current_span(name):
+        return await coro
+
+
+def extract_context(headers: list[tuple[bytes, bytes]]) -> Context:
+    """
+    Trace context of the incoming traceparent/tracestate headers
+    """
+    carrier = {
+        key.decode("latin-1"): value.decode("latin-1")
+        for key, value in headers
+    }
+    return propagate.extract(carrier)
+
+
+def create_exporter() -> SpanExporter:
+    tracing_settings = get_tracing_settings()
+    if tracing_settings.TRACING_EXPORTER == "memory":
+        return InMemorySpanExporter()
+    # pulls in protobuf and requests, only needed when exporting
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+        OTLPSpanExporter,
+    )
+
+    return OTLPSpanExporter(endpoint=tracing_settings.TRACING_OTLP_ENDPOINT)
+
+
+def create_tracer_provider(
+    exporter: SpanExporter,
+) -> TracerProvider:
+    """
+    Provider sampling TRACING_SAMPLE_RATIO of the new traces and
+    following the decision of the caller for propagated ones.
+    Spans are queued and exported in batches by a background thread,
+    so a request never waits for the collector. The in-memory
+    exporter of tests gets every span synchronously instead.
+    """
+    tracing_settings = get_tracing_settings()
+    provider = TracerProvider(
+        resource=Resource.create(
+            {"service.name": tracing_settings.TRACING_SERVICE_NAME}
+        ),
+        sampler=ParentBased(
+            TraceIdRatioBased(tracing_settings.TRACING_SAMPLE_RATIO)
+        ),
+    )
+    if isinstance(exporter, InMemorySpanExporter):
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    else:
+        provider.add_span_processor(
+            BatchSpanProcessor(
+                exporter,
+                max_queue_size=tracing_settings.TRACING_MAX_QUEUE_SIZE,
+                max_export_batch_size=(
+                    tracing_settings.TRACING_EXPORT_BATCH_SIZE
+                ),
+                schedule_delay_millis=(
+                    tracing_settings.TRACING_EXPORT_DELAY * 1000
+                ),
+            )
+        )
+    return provider
+
+
+@functools.cache
+def get_span_exporter() -> SpanExporter:
+    return create_exporter()
+
+
+@functools.cache
+def get_tracer_provider() -> TracerProvider:
+    """
+    Provider of the process, created on the first call and set as the
+    global one: OpenTelemetry accepts the global provider only once,
+    later lifespans in the same process reuse it
+    """
+    provider = create_tracer_provider(get_span_exporter())
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+def install_query_spans(engine: Engine) -> None:
+    """
+    A CLIENT span around every statement sent to Postgres
+    """
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    event.listen(engine, "after_cursor_execute", _after_execute)
+    event.listen(engine, "handle_error", _on_error)
+
+
+def _before_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    query_span = tracer.start_span(
+        statement.split(None, 1)[0].upper() if statement else "SQL",
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": "postgresql",
+            "db.statement": statement,
+        },
+    )
+    conn.info.setdefault("query_spans", []).append(query_span)
+
+
+def _after_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    spans = conn.info.get("query_spans")
+    if spans:
+        spans.pop().end()
+
+
+def _on_error(context: Any) -> None:
+    if context.connection is None:
+        return
+    spans = context.connection.info.get("query_spans")
+    if spans:
+        query_span = spans.pop()
+        query_span.record_exception(context.original_exception)
+        query_span.set_status(Status(StatusCode.ERROR))
+        query_span.end()
@@ -5,14 +5,14 @@ from sqlalchemy import pool
 
 from alembic import context
 
-from auth_app.config import pg_settings
+from auth_app.config import get_pg_settings
 from auth_app.models.base import Base
 from auth_app.models.users import UserORM
 
 config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
-config.set_main_option("sqlalchemy.url", pg_settings.postgres_dsn + "?async_fallback=True")
+config.set_main_option("sqlalchemy.url", get_pg_settings().postgres_dsn + "?async_fallback=True")
 target_metadata = Base.metadata
 
 
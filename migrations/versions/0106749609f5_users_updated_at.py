@@ -0,0 +1,45 @@
+"""users updated_at
+
+Revision ID: 0106749609f5
+Revises: 6d9553234651
+Create Date: 2026-10-17 19:48:06.305127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0106749609f5'
+down_revision: Union[str, None] = '6d9553234651'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # a stable default is stored once, so no table rewrite is needed
+    op.add_column('users', sa.Column('updated_at', sa.DateTime(), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_updated_at',
+            'users',
+            ['updated_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_updated_at',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('users', 'updated_at')
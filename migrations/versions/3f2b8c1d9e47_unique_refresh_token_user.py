@@ -0,0 +1,91 @@
+"""unique refresh token user
+
+Revision ID: 3f2b8c1d9e47
+Revises: 0106749609f5
+Create Date: 2026-10-17 20:14:37.820519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2b8c1d9e47'
+down_revision: Union[str, None] = '0106749609f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def drop_invalid_index(name: str, table_name: str) -> None:
+    # a failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind,
+    # which a rerun with IF NOT EXISTS would silently keep
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT NOT i.indisvalid FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name"
+    ), {'name': name}).scalar()
+    if invalid:
+        op.drop_index(name, table_name=table_name, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # keep the latest token of users that raced into several rows
+    op.execute(sa.text(
+        "DELETE FROM refresh_tokens t USING refresh_tokens newer "
+        "WHERE t.user_id = newer.user_id "
+        "AND (t.expires_at, t.id) < (newer.expires_at, newer.id)"
+    ))
+    with op.get_context().autocommit_block():
+        drop_invalid_index('ix_refresh_tokens_user_id_unique', 'refresh_tokens')
+        try:
+            # a row inserted since the DELETE can still fail the build
+            op.create_index(
+                'ix_refresh_tokens_user_id_unique',
+                'refresh_tokens',
+                ['user_id'],
+                unique=True,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        except sa.exc.DBAPIError:
+            drop_invalid_index(
+                'ix_refresh_tokens_user_id_unique', 'refresh_tokens'
+            )
+            raise
+        op.drop_index(
+            'ix_refresh_tokens_user_id',
+            table_name='refresh_tokens',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute(sa.text(
+        'ALTER INDEX ix_refresh_tokens_user_id_unique '
+        'RENAME TO ix_refresh_tokens_user_id'
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        drop_invalid_index('ix_refresh_tokens_user_id_plain', 'refresh_tokens')
+        op.create_index(
+            'ix_refresh_tokens_user_id_plain',
+            'refresh_tokens',
+            ['user_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_refresh_tokens_user_id',
+            table_name='refresh_tokens',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute(sa.text(
+        'ALTER INDEX ix_refresh_tokens_user_id_plain '
+        'RENAME TO ix_refresh_tokens_user_id'
+    ))
@@ -0,0 +1,37 @@
+"""outbox message retention
+
+Revision ID: 5e1d7a9c2b40
+Revises: acf9c64e9e0e
+Create Date: 2026-10-17 23:14:52.180342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1d7a9c2b40'
+down_revision: Union[str, None] = 'acf9c64e9e0e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('email_outbox', sa.Column('expires_at', sa.DateTime(), nullable=True))
+    op.alter_column('email_outbox', 'message', existing_type=sa.Text(), nullable=True)
+    # delivered and abandoned emails no longer keep their codes and passwords
+    op.execute(sa.text(
+        "UPDATE email_outbox SET message = NULL WHERE status <> 'PENDING'"
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text(
+        "UPDATE email_outbox SET message = '' WHERE message IS NULL"
+    ))
+    op.alter_column('email_outbox', 'message', existing_type=sa.Text(), nullable=False)
+    op.drop_column('email_outbox', 'expires_at')
@@ -0,0 +1,86 @@
+"""hot lookup indexes
+
+Revision ID: 6d9553234651
+Revises: a225fdc6797d
+Create Date: 2026-10-17 11:03:52.114870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d9553234651'
+down_revision: Union[str, None] = 'a225fdc6797d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def drop_invalid_index(name: str, table_name: str) -> None:
+    # a failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind,
+    # which a rerun with IF NOT EXISTS would silently keep
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT NOT i.indisvalid FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name"
+    ), {'name': name}).scalar()
+    if invalid:
+        op.drop_index(name, table_name=table_name, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        drop_invalid_index('ix_refresh_tokens_user_id', 'refresh_tokens')
+        op.create_index(
+            'ix_refresh_tokens_user_id',
+            'refresh_tokens',
+            ['user_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        drop_invalid_index('ix_refresh_tokens_expires_at', 'refresh_tokens')
+        op.create_index(
+            'ix_refresh_tokens_expires_at',
+            'refresh_tokens',
+            ['expires_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        drop_invalid_index('ix_users_email_lower', 'users')
+        op.create_index(
+            'ix_users_email_lower',
+            'users',
+            [sa.text('lower(email)')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_email_lower',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_refresh_tokens_expires_at',
+            table_name='refresh_tokens',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_refresh_tokens_user_id',
+            table_name='refresh_tokens',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,84 @@
+"""unique lower email
+
+Revision ID: 9b3f0e6d4c12
+Revises: 5e1d7a9c2b40
+Create Date: 2026-10-17 23:52:07.604918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3f0e6d4c12'
+down_revision: Union[str, None] = '5e1d7a9c2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def drop_invalid_index(name: str, table_name: str) -> None:
+    # a failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind,
+    # which a rerun with IF NOT EXISTS would silently keep
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT NOT i.indisvalid FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name"
+    ), {'name': name}).scalar()
+    if invalid:
+        op.drop_index(name, table_name=table_name, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT lower(email) FROM users "
+        "GROUP BY lower(email) HAVING count(*) > 1 LIMIT 10"
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            'Emails registered more than once in different case, '
+            f'merge the accounts before upgrading: {", ".join(duplicates)}'
+        )
+    with op.get_context().autocommit_block():
+        drop_invalid_index('users_email_lower_key', 'users')
+        try:
+            op.create_index(
+                'users_email_lower_key',
+                'users',
+                [sa.text('lower(email)')],
+                unique=True,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        except sa.exc.DBAPIError:
+            drop_invalid_index('users_email_lower_key', 'users')
+            raise
+        op.drop_index(
+            'ix_users_email_lower',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_constraint('users_email_key', 'users', type_='unique')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint('users_email_key', 'users', ['email'])
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_email_lower',
+            'users',
+            [sa.text('lower(email)')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'users_email_lower_key',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
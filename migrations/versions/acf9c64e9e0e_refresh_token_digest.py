@@ -0,0 +1,67 @@
+"""refresh token digest
+
+Revision ID: acf9c64e9e0e
+Revises: 3f2b8c1d9e47
+Create Date: 2026-10-17 21:02:11.417230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'acf9c64e9e0e'
+down_revision: Union[str, None] = '3f2b8c1d9e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def drop_invalid_index(name: str, table_name: str) -> None:
+    # a failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind,
+    # which a rerun with IF NOT EXISTS would silently keep
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT NOT i.indisvalid FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name"
+    ), {'name': name}).scalar()
+    if invalid:
+        op.drop_index(name, table_name=table_name, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('refresh_tokens', sa.Column('token_digest', sa.LargeBinary(), nullable=True))
+    op.execute(sa.text(
+        "UPDATE refresh_tokens "
+        "SET token_digest = sha256(convert_to(token, 'UTF8'))"
+    ))
+    op.alter_column('refresh_tokens', 'token_digest', nullable=False)
+    with op.get_context().autocommit_block():
+        drop_invalid_index('refresh_tokens_token_digest_key', 'refresh_tokens')
+        op.create_index(
+            'refresh_tokens_token_digest_key',
+            'refresh_tokens',
+            ['token_digest'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.execute(sa.text(
+        'ALTER TABLE refresh_tokens '
+        'ADD CONSTRAINT refresh_tokens_token_digest_key '
+        'UNIQUE USING INDEX refresh_tokens_token_digest_key'
+    ))
+    op.drop_constraint('refresh_tokens_token_key', 'refresh_tokens', type_='unique')
+    op.drop_column('refresh_tokens', 'token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # plain tokens cannot be restored, users sign in again
+    op.execute(sa.text('DELETE FROM refresh_tokens'))
+    op.add_column('refresh_tokens', sa.Column('token', sa.String(), nullable=False))
+    op.create_unique_constraint('refresh_tokens_token_key', 'refresh_tokens', ['token'])
+    op.drop_constraint('refresh_tokens_token_digest_key', 'refresh_tokens', type_='unique')
+    op.drop_column('refresh_tokens', 'token_digest')
@@ -0,0 +1,31 @@
+"""refresh token claims
+
+Revision ID: c47e2a1f8d35
+Revises: 9b3f0e6d4c12
+Create Date: 2026-10-18 00:31:45.772016
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47e2a1f8d35'
+down_revision: Union[str, None] = '9b3f0e6d4c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('refresh_tokens', sa.Column('role', postgresql.ENUM('ADMIN', 'USER', 'STAFFER', 'OTHER', name='userrole', create_type=False), nullable=True))
+    op.add_column('refresh_tokens', sa.Column('jti', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('refresh_tokens', 'jti')
+    op.drop_column('refresh_tokens', 'role')
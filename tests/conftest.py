@@ -0,0 +1,22 @@
+import pytest
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from auth_app import tracing
+from auth_app.config import get_tracing_settings
+from auth_app.middleware import tracing as tracing_middleware
+
+
+@pytest.fixture
+def span_exporter(monkeypatch: pytest.MonkeyPatch) -> InMemorySpanExporter:
+    """
+    Tracing enabled with its spans collected in memory. The tracer is
+    patched instead of the global provider, which is set once per process.
+    """
+    exporter = InMemorySpanExporter()
+    tracer = tracing.create_tracer_provider(exporter).get_tracer("auth_app")
+    monkeypatch.setattr(get_tracing_settings(), "TRACING_ENABLED", True)
+    monkeypatch.setattr(tracing, "tracer", tracer)
+    monkeypatch.setattr(tracing_middleware, "tracer", tracer)
+    return exporter
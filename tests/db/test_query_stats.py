@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import (
+    create_engine,
+    text,
+)
+from sqlalchemy.exc import OperationalError
+
+from auth_app.db.query_stats import (
+    QueryStats,
+    fingerprint,
+)
+
+
+def test_fingerprint() -> None:
+    assert fingerprint(
+        "SELECT * FROM users WHERE email = 'a@b.c' AND age > 42"
+    ) == fingerprint("SELECT * FROM users WHERE email = 'x''y' AND age > 7")
+    assert fingerprint(
+        "SELECT users.id FROM users\n  WHERE users.id = $1::UUID"
+    ) == "SELECT users.id FROM users WHERE users.id = ?"
+    assert fingerprint("SELECT 1 FROM t1") != fingerprint("SELECT 1 FROM t2")
+
+
+def test_in_lists_share_fingerprint() -> None:
+    assert fingerprint("DELETE FROM t WHERE id IN (1, 2, 3)") == (
+        "DELETE FROM t WHERE id IN (?+)"
+    )
+    assert fingerprint("DELETE FROM t WHERE id IN ($1, $2)") == fingerprint(
+        "DELETE FROM t WHERE id IN (%(id_1)s, %(id_2)s, %(id_3)s)"
+    )
+
+
+def test_query_stats() -> None:
+    engine = create_engine("sqlite://")
+    stats = QueryStats(slow_threshold=60)
+    stats.install(engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+        conn.execute(text("SELECT 'a'"))
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing"))
+        assert conn.info["query_start"] == []
+
+    snapshot = stats.snapshot()
+    assert [item["fingerprint"] for item in snapshot] == ["SELECT ?"]
+    assert snapshot[0]["count"] == 3
+    stats.reset()
+    assert stats.snapshot() == []
+
+
+def test_query_stats_fingerprint_limit() -> None:
+    engine = create_engine("sqlite://")
+    stats = QueryStats(slow_threshold=60, max_fingerprints=1)
+    stats.install(engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 1 WHERE 1 = 1"))
+
+    assert {item["fingerprint"] for item in stats.snapshot()} == {
+        "SELECT ?",
+        "<other>",
+    }
@@ -0,0 +1,89 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+)
+
+from auth_app.middleware.metrics import MetricsMiddleware
+from auth_app.routers.metrics import metrics_router
+
+
+class ProbeError(Exception):
+    pass
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/probe/{item_id}")
+    async def probe(item_id: int) -> dict:
+        return {"item_id": item_id}
+
+    @app.post("/probe/fail")
+    async def fail() -> None:
+        raise ProbeError("boom")
+
+    app.include_router(router=metrics_router)
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def latency_count(method: str, route: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "http_request_duration_seconds_count",
+        {"method": method, "route": route},
+    )
+    return value or 0.0
+
+
+def error_count(exception: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "app_errors_total",
+        {"exception": exception},
+    )
+    return value or 0.0
+
+
+def test_latency_observed_under_route_template() -> None:
+    before = latency_count("GET", "/probe/{item_id}")
+    with TestClient(create_app()) as client:
+        assert client.get("/probe/1").status_code == 200
+        assert client.get("/probe/2").status_code == 200
+        # a rejected path parameter still matched the route
+        assert client.get("/probe/x").status_code == 422
+    assert latency_count("GET", "/probe/{item_id}") == before + 3
+
+
+def test_unmatched_requests_share_one_child() -> None:
+    before = latency_count("ANY", "unmatched")
+    with TestClient(create_app()) as client:
+        assert client.get("/missing/1").status_code == 404
+        assert client.get("/missing/2").status_code == 404
+        # the route exists but not for the method
+        assert client.delete("/probe/1").status_code == 405
+    assert latency_count("ANY", "unmatched") == before + 3
+    assert latency_count("GET", "/missing/1") == 0
+
+
+def test_unhandled_exception_counted_by_type() -> None:
+    errors_before = error_count("ProbeError")
+    latency_before = latency_count("POST", "/probe/fail")
+    with TestClient(create_app(), raise_server_exceptions=False) as client:
+        assert client.post("/probe/fail").status_code == 500
+    assert error_count("ProbeError") == errors_before + 1
+    assert latency_count("POST", "/probe/fail") == latency_before + 1
+
+
+def test_metrics_endpoint_exposes_samples() -> None:
+    with TestClient(create_app()) as client:
+        client.get("/probe/1")
+        response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE_LATEST
+    body = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/probe/{item_id}"}'
+    ) in body
+    assert "app_errors_total" in body
@@ -0,0 +1,107 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import (
+    SpanKind,
+    StatusCode,
+)
+
+from auth_app.middleware.tracing import TracingMiddleware
+from auth_app.tracing import span
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/probe/{item_id}")
+    async def probe(item_id: int) -> dict:
+        with span("probe.work"):
+            return {"item_id": item_id}
+
+    @app.post("/probe/fail")
+    async def fail() -> None:
+        raise ValueError("boom")
+
+    app.add_middleware(TracingMiddleware)
+    return app
+
+
+def test_request_span_renamed_after_route(
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    client = TestClient(create_app())
+    assert client.get("/probe/7").status_code == 200
+
+    work, request_span = span_exporter.get_finished_spans()
+    assert request_span.kind == SpanKind.SERVER
+    assert request_span.name == "GET /probe/{item_id}"
+    assert request_span.attributes is not None
+    assert request_span.attributes["http.route"] == "/probe/{item_id}"
+    assert request_span.attributes["url.path"] == "/probe/7"
+    assert request_span.attributes["http.response.status_code"] == 200
+    # work done by the endpoint is a child of the request span
+    assert work.parent is not None
+    assert work.parent.span_id == request_span.context.span_id
+
+
+def test_unmatched_request_keeps_method_name(
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    client = TestClient(create_app())
+    assert client.get("/missing").status_code == 404
+
+    (request_span,) = span_exporter.get_finished_spans()
+    assert request_span.name == "GET"
+    assert request_span.attributes is not None
+    assert "http.route" not in request_span.attributes
+
+
+def test_traceparent_continues_trace(
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    client = TestClient(create_app())
+    response = client.get(
+        "/probe/7",
+        headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+    )
+    assert response.status_code == 200
+
+    spans = span_exporter.get_finished_spans()
+    assert {s.context.trace_id for s in spans} == {int(TRACE_ID, 16)}
+    request_span = spans[-1]
+    assert request_span.parent is not None
+    assert request_span.parent.span_id == int(PARENT_ID, 16)
+    assert request_span.parent.is_remote
+
+
+def test_new_trace_without_traceparent(
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    client = TestClient(create_app())
+    client.get("/probe/1")
+    client.get("/probe/2")
+
+    first, second = (
+        s
+        for s in span_exporter.get_finished_spans()
+        if s.kind is SpanKind.SERVER
+    )
+    assert first.parent is None
+    assert first.context.trace_id != second.context.trace_id
+
+
+def test_unhandled_exception_marks_span_failed(
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    client = TestClient(create_app(), raise_server_exceptions=False)
+    assert client.post("/probe/fail").status_code == 500
+
+    (request_span,) = span_exporter.get_finished_spans()
+    assert request_span.name == "POST /probe/fail"
+    assert request_span.status.status_code == StatusCode.ERROR
+    assert request_span.events[0].name == "exception"
@@ -0,0 +1,60 @@
+import pytest
+from pydantic import ValidationError
+
+from auth_app.schemes.service import (
+    HashingPoolStatsScheme,
+    QueryStatsScheme,
+)
+
+
+def test_hashing_pool_stats() -> None:
+    valid_data = {
+        "size": 4,
+        "max_queue": 64,
+        "in_flight": 6,
+        "busy": 4,
+        "queued": 2,
+        "peak_in_flight": 12,
+        "completed": 1024,
+        "rejected": 0,
+        "timed_out": 0,
+    }
+    valid_data_case = HashingPoolStatsScheme.model_validate(valid_data)
+    assert valid_data_case.size == 4
+    assert valid_data_case.busy == 4
+    assert valid_data_case.queued == 2
+
+    partial_data = {
+        "size": 4,
+        "max_queue": 64,
+    }
+    with pytest.raises(ValidationError):
+        HashingPoolStatsScheme.model_validate(partial_data)
+
+    wrong_types = dict(valid_data, in_flight="many", rejected=[1])
+    with pytest.raises(ValidationError):
+        HashingPoolStatsScheme.model_validate(wrong_types)
+
+
+def test_query_stats() -> None:
+    valid_data = {
+        "fingerprint": "SELECT users.id FROM users WHERE users.email = ?",
+        "count": 120,
+        "total_ms": 96.4,
+        "avg_ms": 0.8,
+        "max_ms": 12.5,
+        "min_ms": 0.3,
+    }
+    valid_data_case = QueryStatsScheme.model_validate(valid_data)
+    assert valid_data_case.count == 120
+    assert valid_data_case.fingerprint.startswith("SELECT")
+
+    partial_data = {
+        "fingerprint": "SELECT ?",
+    }
+    with pytest.raises(ValidationError):
+        QueryStatsScheme.model_validate(partial_data)
+
+    wrong_types = dict(valid_data, count="often", max_ms=[1])
+    with pytest.raises(ValidationError):
+        QueryStatsScheme.model_validate(wrong_types)
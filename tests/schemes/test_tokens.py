@@ -8,6 +8,12 @@ from auth_app.schemes.tokens import (
     CreateRefreshScheme,
     DeleteRefreshScheme,
     GetRefreshScheme,
+    IntrospectRequestScheme,
+    IntrospectResponseScheme,
+    IntrospectResultScheme,
+    ReissueRefreshScheme,
+    RevocationScheme,
+    RevokeTokenScheme,
 )
 from auth_app.schemes.users import RoleEnum
 
@@ -62,6 +68,14 @@ def test_create_refresh() -> None:
     assert str(valid_data_case.user_id) == "123e4567-e89b-12d3-a456-426614174000"
     assert valid_data_case.token == "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ..."
     assert isinstance(valid_data_case.expires_at, datetime)
+    assert valid_data_case.role == RoleEnum.USER
+    assert valid_data_case.jti is None
+
+    claims_case = CreateRefreshScheme.model_validate(
+        {**valid_data, "role": "STAFFER", "jti": "4c4bd2a8b7c9"}
+    )
+    assert claims_case.role == RoleEnum.STAFFER
+    assert claims_case.jti == "4c4bd2a8b7c9"
 
     invalid_data = {
         "user_id": 123,
@@ -88,6 +102,28 @@ def test_create_refresh() -> None:
         CreateRefreshScheme.model_validate(partial_data)
 
 
+def test_reissue_refresh() -> None:
+    valid_data = {
+        "email": "mail@example.com",
+        "password_hash": "MySecurePassword123!",
+    }
+    valid_data_case = ReissueRefreshScheme.model_validate(valid_data)
+    assert valid_data_case.email == "mail@example.com"
+    assert valid_data_case.admin_secret is None
+
+    admin_case = ReissueRefreshScheme.model_validate(
+        {**valid_data, "admin_secret": "123Admin"}
+    )
+    assert admin_case.admin_secret == "123Admin"
+
+    invalid_data = {
+        "email": "mail",
+        "password_hash": "123",
+    }
+    with pytest.raises(ValidationError):
+        ReissueRefreshScheme.model_validate(invalid_data)
+
+
 def test_get_refresh() -> None:
     valid_data = {
         "id": "123e4567-e89b-12d3-a456-426614174001",
@@ -168,3 +204,47 @@ def test_delete_refresh() -> None:
     }
     with pytest.raises(ValidationError):
         DeleteRefreshScheme.model_validate(wrong_data)
+
+
+def test_introspect() -> None:
+    request_case = IntrospectRequestScheme.model_validate(
+        {"tokens": ["token-1", "token-2"]}
+    )
+    assert request_case.tokens == ["token-1", "token-2"]
+
+    with pytest.raises(ValidationError):
+        IntrospectRequestScheme.model_validate({"tokens": []})
+
+    with pytest.raises(ValidationError):
+        IntrospectRequestScheme.model_validate({"tokens": ["t"] * 101})
+
+    active = IntrospectResultScheme(
+        active=True,
+        claims={"user_id": "123e4567-e89b-12d3-a456-426614174000"},
+    )
+    inactive = IntrospectResultScheme(active=False, error="Expired token")
+    assert active.error is None
+    assert inactive.claims is None
+
+    response = IntrospectResponseScheme(results=[active, inactive])
+    assert [result.active for result in response.results] == [True, False]
+
+
+def test_revocation() -> None:
+    request_case = RevokeTokenScheme.model_validate({"token": "token-1"})
+    assert request_case.token == "token-1"
+
+    with pytest.raises(ValidationError):
+        RevokeTokenScheme.model_validate({})
+
+    user_case = RevocationScheme.model_validate({
+        "user_id": "123e4567-e89b-12d3-a456-426614174000",
+        "revoked_at": "2025-01-01T15:34:00",
+    })
+    assert user_case.jti is None
+
+    with pytest.raises(ValidationError):
+        RevocationScheme.model_validate({
+            "user_id": "not-a-uuid",
+            "revoked_at": "2025-01-01T15:34:00",
+        })
@@ -6,12 +6,19 @@ from auth_app.schemes.users import (
     CreateResponseScheme,
     CreateUserScheme,
     DeleteUserScheme,
+    ExportFormatEnum,
     GetUserScheme,
+    ImportStatusEnum,
+    ImportUserScheme,
     MessageResponseScheme,
     PatchUserScheme,
     PutUserScheme,
     RoleEnum,
     UserFilterScheme,
+    UserImportResultScheme,
+    UserImportRowScheme,
+    UserListQueryScheme,
+    UserPageScheme,
     VerificationScheme,
     client_roles,
     stuffer_roles,
@@ -29,6 +36,12 @@ def test_role_enum() -> None:
     assert isinstance(stuffer_roles, list)
 
 
+def test_export_format_enum() -> None:
+    assert ExportFormatEnum.NDJSON == "ndjson"
+    assert ExportFormatEnum.CSV == "csv"
+    assert ExportFormatEnum("csv") is ExportFormatEnum.CSV
+
+
 def test_auth_user_data() -> None:
     valid_data = {
         "email": "email@example.com",
@@ -368,3 +381,109 @@ def test_verification_data() -> None:
 
     with pytest.raises(ValidationError):
         VerificationScheme.model_validate(no_fields)
+
+
+def test_user_list_query() -> None:
+    default_case = UserListQueryScheme.model_validate({})
+    assert default_case.limit == 100
+    assert default_case.cursor is None
+    assert not default_case.stream
+
+    filtered_case = UserListQueryScheme.model_validate(
+        {"role": "USER", "limit": 10, "cursor": "abc", "stream": "true"}
+    )
+    assert filtered_case.role == "USER"
+    assert filtered_case.limit == 10
+    assert filtered_case.cursor == "abc"
+    assert filtered_case.stream
+
+    with pytest.raises(ValidationError):
+        UserListQueryScheme.model_validate({"limit": 0})
+
+    with pytest.raises(ValidationError):
+        UserListQueryScheme.model_validate({"limit": 1001})
+
+
+def test_user_page() -> None:
+    user = {
+        "id": "123e4567-e89b-12d3-a456-426614174000",
+        "email": "email@example.com",
+        "password_hash": "password_example_123",
+    }
+    last_page = UserPageScheme.model_validate({"items": [user]})
+    assert len(last_page.items) == 1
+    assert last_page.items[0].email == "email@example.com"
+    assert last_page.next_cursor is None
+
+    empty_page = UserPageScheme.model_validate(
+        {"items": [], "next_cursor": "abc"}
+    )
+    assert empty_page.items == []
+    assert empty_page.next_cursor == "abc"
+
+    with pytest.raises(ValidationError):
+        UserPageScheme.model_validate({"next_cursor": "abc"})
+
+
+def test_import_user() -> None:
+    plain_case = ImportUserScheme.model_validate(
+        {"email": "email@example.com", "password": "password_example_123"}
+    )
+    assert plain_case.password == "password_example_123"
+    assert plain_case.password_hash is None
+    assert plain_case.role == "USER"
+
+    hashed_case = ImportUserScheme.model_validate(
+        {
+            "email": "email@example.com",
+            "password_hash": "$2b$12$hash",
+            "role": "STAFFER",
+        }
+    )
+    assert hashed_case.password is None
+    assert hashed_case.role == "STAFFER"
+
+    with pytest.raises(ValidationError):
+        ImportUserScheme.model_validate({"email": "email@example.com"})
+
+    with pytest.raises(ValidationError):
+        ImportUserScheme.model_validate(
+            {
+                "email": "email@example.com",
+                "password": "password_example_123",
+                "password_hash": "$2b$12$hash",
+            }
+        )
+
+    with pytest.raises(ValidationError):
+        ImportUserScheme.model_validate(
+            {"email": "email@example.com", "password": "123"}
+        )
+
+
+def test_import_result() -> None:
+    created = UserImportRowScheme.model_validate(
+        {
+            "line": 2,
+            "status": "CREATED",
+            "email": "email@example.com",
+            "id": "123e4567-e89b-12d3-a456-426614174000",
+        }
+    )
+    invalid = UserImportRowScheme.model_validate(
+        {"line": 3, "status": "INVALID", "detail": "Invalid JSON"}
+    )
+    assert created.status == ImportStatusEnum.CREATED
+    assert invalid.email is None
+    assert invalid.id is None
+
+    result = UserImportResultScheme(
+        created=1,
+        duplicates=0,
+        invalid=1,
+        rows=[created, invalid],
+    )
+    assert [row.line for row in result.rows] == [2, 3]
+
+    with pytest.raises(ValidationError):
+        UserImportRowScheme.model_validate({"line": 4, "status": "SKIPPED"})
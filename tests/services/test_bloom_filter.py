@@ -0,0 +1,44 @@
+import math
+
+from auth_app.services.utils.bloom_filter import BloomFilter
+
+
+def test_sizing() -> None:
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    assert bloom.size == math.ceil(-1000 * math.log(0.01) / math.log(2) ** 2)
+    assert bloom.hash_count == 7
+    assert len(bloom._bits) == (bloom.size + 7) // 8
+
+    assert BloomFilter(capacity=0, error_rate=0.5).hash_count == 1
+
+
+def test_no_false_negatives() -> None:
+    keys = [f"j:{i}" for i in range(5000)]
+    bloom = BloomFilter(capacity=5000, error_rate=0.001)
+    for key in keys:
+        bloom.add(key)
+    assert bloom.count == 5000
+    assert all(key in bloom for key in keys)
+
+
+def test_false_positive_rate() -> None:
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    for i in range(10000):
+        bloom.add(f"u:{i}")
+    false_positives = sum(f"j:{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
+
+
+def test_empty_filter() -> None:
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    assert "j:1" not in bloom
+    assert "" not in bloom
+
+
+def test_from_keys() -> None:
+    keys = [f"j:{i}" for i in range(300)]
+    bloom = BloomFilter.from_keys(keys, capacity=100, error_rate=0.01)
+    # sized for twice the keys it starts with, leaving room to add
+    assert bloom.size == BloomFilter(600, 0.01).size
+    assert bloom.count == 300
+    assert all(key in bloom for key in keys)
@@ -0,0 +1,167 @@
+import base64
+import json
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+)
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import (
+    ec,
+    ed25519,
+)
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+)
+
+from auth_app.exeptions.custom import TokenError
+from auth_app.services.utils.key_ring import (
+    JWTKey,
+    KeyRing,
+    load_private_key,
+)
+
+PAYLOAD = {"user_id": "42", "role": "USER", "expires": 2000000000}
+SECRET = "test-secret-test-secret-test-secret"
+
+
+def _b64(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _hs_ring() -> KeyRing:
+    key = JWTKey(kid=None, algorithm="HS256", key=SECRET, jwk=None)
+    return KeyRing(signing=key, verification=[key])
+
+
+def _key_pair(
+    tmp_path: Path,
+    private_key: Any,
+) -> tuple[JWTKey, JWTKey]:
+    path = tmp_path / "signing.pem"
+    path.write_bytes(
+        private_key.private_bytes(
+            Encoding.PEM,
+            PrivateFormat.PKCS8,
+            NoEncryption(),
+        )
+    )
+    return load_private_key(path)
+
+
+def test_symmetric_round_trip() -> None:
+    ring = _hs_ring()
+    token = ring.encode(PAYLOAD)
+    assert ring.decode(token) == PAYLOAD
+    assert jwt.decode(token, SECRET, algorithms=["HS256"]) == PAYLOAD
+    assert ring.decode(jwt.encode(PAYLOAD, SECRET, algorithm="HS256")) == (
+        PAYLOAD
+    )
+    assert json.loads(ring.jwks_body) == {"keys": []}
+
+
+@pytest.mark.parametrize(
+    ("private_key", "algorithm"),
+    [
+        (ec.generate_private_key(ec.SECP256R1()), "ES256"),
+        (ed25519.Ed25519PrivateKey.generate(), "EdDSA"),
+    ],
+)
+def test_asymmetric_round_trip(
+    tmp_path: Path,
+    private_key: Any,
+    algorithm: str,
+) -> None:
+    signing, public = _key_pair(tmp_path, private_key)
+    ring = KeyRing(signing=signing, verification=[public])
+    token = ring.encode(PAYLOAD)
+
+    header = jwt.get_unverified_header(token)
+    assert header == {"alg": algorithm, "kid": public.kid, "typ": "JWT"}
+    assert ring.decode(token) == PAYLOAD
+    assert jwt.decode(
+        token,
+        private_key.public_key(),
+        algorithms=[algorithm],
+    ) == PAYLOAD
+
+    jwks = json.loads(ring.jwks_body)
+    assert [key["kid"] for key in jwks["keys"]] == [public.kid]
+    assert jwks["keys"][0]["alg"] == algorithm
+    assert ring.jwks_etag.startswith('"')
+
+
+def test_rotation(tmp_path: Path) -> None:
+    old_signing, old_public = _key_pair(
+        tmp_path, ec.generate_private_key(ec.SECP256R1())
+    )
+    new_signing, new_public = _key_pair(
+        tmp_path, ec.generate_private_key(ec.SECP256R1())
+    )
+    old_token = KeyRing(old_signing, [old_public]).encode(PAYLOAD)
+
+    ring = KeyRing(new_signing, [new_public, old_public])
+    assert ring.decode(old_token) == PAYLOAD
+    assert ring.decode(ring.encode(PAYLOAD)) == PAYLOAD
+    with pytest.raises(TokenError, match="Unknown signing key"):
+        KeyRing(new_signing, [new_public]).decode(old_token)
+
+
+@pytest.mark.parametrize(
+    "tamper",
+    [
+        lambda token: token + "A",
+        lambda token: token + "=",
+        lambda token: token + "==",
+        lambda token: token + "!",
+        lambda token: token[:-1] + "+",
+        lambda token: token.replace(".", "..", 1),
+        lambda token: token.rsplit(".", 1)[0],
+    ],
+)
+def test_malformed_tokens(tamper: Callable[[str], str]) -> None:
+    ring = _hs_ring()
+    with pytest.raises(TokenError):
+        ring.decode(tamper(ring.encode(PAYLOAD)))
+
+
+def test_non_canonical_signature() -> None:
+    ring = _hs_ring()
+    token = ring.encode(PAYLOAD)
+    # a 32 byte signature leaves two unused bits in its last character
+    last = token[-1]
+    alphabet = (
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    )
+    sibling = alphabet[alphabet.index(last) ^ 1]
+    with pytest.raises(TokenError):
+        ring.decode(token[:-1] + sibling)
+
+
+@pytest.mark.parametrize(
+    ("header", "error"),
+    [
+        ({"alg": "HS256", "crit": ["exp"]}, "critical extension"),
+        ({"alg": "HS256", "b64": False}, "Unencoded payloads"),
+        ({"alg": "HS512"}, "alg value is not allowed"),
+        ({"alg": "none"}, "alg value is not allowed"),
+        ({"alg": "HS256", "kid": "other"}, "Unknown signing key"),
+    ],
+)
+def test_rejected_headers(header: dict, error: str) -> None:
+    ring = _hs_ring()
+    signature = ring.encode(PAYLOAD).rsplit(".", 1)[1]
+    token = f"{_b64(header)}.{_b64(PAYLOAD)}.{signature}"
+    with pytest.raises(TokenError, match=error):
+        ring.decode(token)
+
+
+def test_wrong_secret() -> None:
+    token = jwt.encode(PAYLOAD, SECRET + "x", algorithm="HS256")
+    with pytest.raises(TokenError, match="Invalid Signature"):
+        _hs_ring().decode(token)
@@ -0,0 +1,92 @@
+import asyncio
+
+import fakeredis
+import pytest
+from pydantic import SecretStr
+
+from auth_app.config import (
+    OTPSettings,
+    get_otp_settings,
+)
+from auth_app.exeptions.custom import RateLimitError
+from auth_app.services.utils.otp_store import OTPStore
+
+EMAIL = "mail@example.com"
+
+
+@pytest.fixture(autouse=True)
+def otp_settings(monkeypatch: pytest.MonkeyPatch) -> OTPSettings:
+    settings = get_otp_settings()
+    # keeps the store independent of the JWT settings
+    monkeypatch.setattr(settings, "OTP_HMAC_KEY", SecretStr("otp-test-key"))
+    return settings
+
+
+def test_issue_and_verify(otp_settings: OTPSettings) -> None:
+    async def scenario() -> None:
+        redis = fakeredis.FakeAsyncRedis()
+        store = OTPStore(redis)
+        await store.issue(EMAIL, "123456")
+
+        # only the digest is stored
+        stored = await redis.hgetall(f"otp:{{{EMAIL}}}")
+        assert b"123456" not in stored[b"digest"]
+        assert 0 < await redis.ttl(f"otp:{{{EMAIL}}}") <= otp_settings.OTP_TTL
+
+        assert await store.verify(EMAIL, "654321") is False
+        assert await store.verify(EMAIL, "123456") is True
+        # a code is consumed by its match
+        assert await store.verify(EMAIL, "123456") is False
+
+    asyncio.run(scenario())
+
+
+def test_new_code_replaces_previous() -> None:
+    async def scenario() -> None:
+        store = OTPStore(fakeredis.FakeAsyncRedis())
+        await store.issue(EMAIL, "111111")
+        await store.issue(EMAIL, "222222")
+        assert await store.verify(EMAIL, "111111") is False
+        assert await store.verify(EMAIL, "222222") is True
+
+    asyncio.run(scenario())
+
+
+def test_code_dropped_after_max_attempts(otp_settings: OTPSettings) -> None:
+    async def scenario() -> None:
+        store = OTPStore(fakeredis.FakeAsyncRedis())
+        await store.issue(EMAIL, "123456")
+        for _ in range(otp_settings.OTP_MAX_ATTEMPTS):
+            assert await store.verify(EMAIL, "000000") is False
+        assert await store.verify(EMAIL, "123456") is False
+
+    asyncio.run(scenario())
+
+
+def test_email_locked_after_max_failures(otp_settings: OTPSettings) -> None:
+    async def scenario() -> None:
+        store = OTPStore(fakeredis.FakeAsyncRedis())
+        failures = 0
+        while failures < otp_settings.OTP_MAX_FAILURES:
+            await store.issue(EMAIL, "123456")
+            for _ in range(otp_settings.OTP_MAX_ATTEMPTS):
+                assert await store.verify(EMAIL, "000000") is False
+                failures += 1
+        # every check is refused while the email is locked
+        with pytest.raises(RateLimitError):
+            await store.verify(EMAIL, "123456")
+
+    asyncio.run(scenario())
+
+
+def test_issue_limit(otp_settings: OTPSettings) -> None:
+    async def scenario() -> None:
+        store = OTPStore(fakeredis.FakeAsyncRedis())
+        for _ in range(otp_settings.OTP_MAX_ISSUES):
+            await store.issue(EMAIL, "123456")
+        with pytest.raises(RateLimitError):
+            await store.issue(EMAIL, "123456")
+        # other emails keep their own counter
+        await store.issue("other@example.com", "123456")
+
+    asyncio.run(scenario())
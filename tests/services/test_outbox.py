@@ -0,0 +1,85 @@
+import asyncio
+import uuid
+from datetime import (
+    datetime,
+    timedelta,
+)
+from unittest.mock import (
+    AsyncMock,
+    MagicMock,
+    patch,
+)
+
+from prometheus_client import REGISTRY
+
+from auth_app.config import get_outbox_settings
+from auth_app.models.outbox import EmailOutboxORM
+from auth_app.services import outbox
+from auth_app.services.outbox import OutboxWorker
+
+
+def outcome_count(outcome: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "outbox_emails_total",
+        {"outcome": outcome},
+    )
+    return value or 0.0
+
+
+def latency_count() -> float:
+    value = REGISTRY.get_sample_value("outbox_delivery_latency_seconds_count")
+    return value or 0.0
+
+
+def outbox_row(attempts: int) -> EmailOutboxORM:
+    return EmailOutboxORM(
+        id=uuid.uuid4(),
+        email_to="user@example.com",
+        subject="Subject",
+        message="Body",
+        source="noreply@example.com",
+        attempts=attempts,
+        created_at=datetime.utcnow() - timedelta(seconds=3),
+    )
+
+
+def create_worker() -> OutboxWorker:
+    provider = MagicMock()
+    provider.get_client = AsyncMock()
+    return OutboxWorker(session_factory=MagicMock(), ses_provider=provider)
+
+
+def test_delivery_exports_latency_and_outcome() -> None:
+    worker = create_worker()
+    sent_before = outcome_count("sent")
+    latency_before = latency_count()
+
+    with patch.object(outbox.ses_handler, "send_email", AsyncMock()):
+        result = asyncio.run(worker._deliver(outbox_row(attempts=1)))
+    assert result.error is None
+    assert outcome_count("sent") == sent_before + 1
+    assert latency_count() == latency_before + 1
+
+    with patch.object(
+        outbox.ses_handler,
+        "send_email",
+        AsyncMock(side_effect=ConnectionError("ses down")),
+    ):
+        result = asyncio.run(worker._deliver(outbox_row(attempts=1)))
+    assert result.error == repr(ConnectionError("ses down"))
+    assert outcome_count("sent") == sent_before + 1
+
+
+def test_failures_counted_as_retried_until_given_up() -> None:
+    worker = create_worker()
+    retried_before = outcome_count("retried")
+    failed_before = outcome_count("failed")
+
+    next_attempt = worker._next_attempt_at(outbox_row(attempts=1))
+    assert next_attempt is not None and next_attempt > datetime.utcnow()
+    assert outcome_count("retried") == retried_before + 1
+
+    last = outbox_row(attempts=get_outbox_settings().OUTBOX_MAX_ATTEMPTS)
+    assert worker._next_attempt_at(last) is None
+    assert outcome_count("failed") == failed_before + 1
+    assert outcome_count("retried") == retried_before + 1
@@ -0,0 +1,41 @@
+from uuid import (
+    UUID,
+    uuid4,
+)
+
+import pytest
+
+from auth_app.services.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def test_cursor_round_trip() -> None:
+    for last_id in (
+        uuid4(),
+        UUID(int=0),
+        UUID("ffffffff-ffff-ffff-ffff-ffffffffffff"),
+    ):
+        cursor = encode_cursor(last_id)
+        assert len(cursor) == 22
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == last_id
+
+
+def test_cursor_is_url_safe() -> None:
+    cursor = encode_cursor(UUID("fbefbeff-ffbe-fbef-befb-effbefbeffbe"))
+    assert "+" not in cursor
+    assert "/" not in cursor
+    assert decode_cursor(cursor) == UUID(
+        "fbefbeff-ffbe-fbef-befb-effbefbeffbe"
+    )
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["", "abc", encode_cursor(uuid4()) + "AAAA", "A" * 21],
+)
+def test_invalid_cursor(cursor: str) -> None:
+    with pytest.raises(ValueError, match="Invalid pagination cursor"):
+        decode_cursor(cursor)
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from auth_app import config
+from auth_app.exeptions.custom import HashingError
+from auth_app.services.utils import pwd_hashing
+from auth_app.services.utils.pwd_hashing import HashingPool
+
+
+def thread_pool(size: int, max_queue: int, timeout: float) -> HashingPool:
+    pool = HashingPool(size=size, max_queue=max_queue, timeout=timeout)
+    # threads instead of spawned processes, same future semantics
+    pool._executor = ThreadPoolExecutor(max_workers=size)
+    return pool
+
+
+def test_available_cpus_without_affinity(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.delattr(os, "sched_getaffinity", raising=False)
+    monkeypatch.setattr(os, "cpu_count", lambda: 6)
+    monkeypatch.setattr(config, "CGROUP_CPU_MAX", tmp_path / "cpu.max")
+    assert config.available_cpus() == 6
+
+
+def test_available_cpus_capped_by_cgroup_quota(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.delattr(os, "sched_getaffinity", raising=False)
+    monkeypatch.setattr(os, "cpu_count", lambda: 6)
+    cpu_max = tmp_path / "cpu.max"
+    monkeypatch.setattr(config, "CGROUP_CPU_MAX", cpu_max)
+
+    cpu_max.write_text("150000 100000\n")
+    assert config.available_cpus() == 2
+    cpu_max.write_text("max 100000\n")
+    assert config.available_cpus() == 6
+
+
+@pytest.mark.parametrize(
+    "workers, expected",
+    [(None, 8), (1, 8), (2, 4), (3, 2), (8, 1), (16, 1)],
+)
+def test_default_pool_size_splits_cpus_among_workers(
+    monkeypatch: pytest.MonkeyPatch,
+    workers: int | None,
+    expected: int,
+) -> None:
+    monkeypatch.setattr(pwd_hashing, "available_cpus", lambda: 8)
+    monkeypatch.setattr(
+        config.get_server_settings(),
+        "SERVER_WORKERS",
+        workers,
+    )
+    assert pwd_hashing.default_pool_size() == expected
+
+
+def test_timed_out_call_holds_its_slot_until_done() -> None:
+    pool = thread_pool(size=1, max_queue=0, timeout=0.05)
+    done = threading.Event()
+
+    async def scenario() -> None:
+        with pytest.raises(HashingError, match="timed out"):
+            await pool.run(done.wait, 5)
+        # the worker is still busy with the abandoned call
+        stats = pool.stats()
+        assert (stats.in_flight, stats.busy, stats.timed_out) == (1, 1, 1)
+        with pytest.raises(HashingError, match="saturated"):
+            await pool.run(sum, [1, 2])
+        assert pool.stats().rejected == 1
+
+        done.set()
+        # the done callback hands the slot back to the loop
+        for _ in range(100):
+            if pool.stats().in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.stats().in_flight == 0
+        assert await pool.run(sum, [1, 2]) == 3
+        assert pool.stats().completed == 1
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        done.set()
+        pool.shutdown()
+
+
+def test_pool_is_reused_across_event_loops() -> None:
+    pool = thread_pool(size=1, max_queue=0, timeout=0.05)
+    done = threading.Event()
+
+    async def abandon() -> None:
+        with pytest.raises(HashingError, match="timed out"):
+            await pool.run(done.wait, 5)
+
+    try:
+        asyncio.run(abandon())
+        # the slot is released after its loop is closed
+        done.set()
+        assert asyncio.run(pool.run(sum, [1, 2])) == 3
+        assert asyncio.run(pool.run(sum, [3, 4])) == 7
+        assert pool.stats().in_flight == 0
+    finally:
+        done.set()
+        pool.shutdown()
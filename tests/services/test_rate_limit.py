@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+
+from auth_app.exeptions.custom import RateLimitError
+from auth_app.services.utils.rate_limit import (
+    TOKEN_BUCKET_SCRIPT,
+    Rate,
+    RateLimiter,
+)
+
+
+def test_token_bucket_script() -> None:
+    async def scenario() -> None:
+        redis = fakeredis.FakeAsyncRedis()
+        script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+        # 2 attempts refilled over 10 seconds: one every 5 seconds
+        for now in (1000, 1000):
+            assert await script(keys=["b"], args=[now, 2, 10]) == [b"0"]
+        assert await script(keys=["b"], args=[1000, 2, 10]) == [b"5"]
+        assert float((await script(keys=["b"], args=[1002, 2, 10]))[0]) == (
+            pytest.approx(3)
+        )
+        assert await script(keys=["b"], args=[1005, 2, 10]) == [b"0"]
+        assert 0 < await redis.pttl("b") <= 10000
+
+    asyncio.run(scenario())
+
+
+def test_token_bucket_script_is_all_or_nothing() -> None:
+    async def scenario() -> None:
+        redis = fakeredis.FakeAsyncRedis()
+        script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+        assert await script(keys=["small"], args=[1000, 1, 60]) == [b"0"]
+
+        waits = await script(keys=["big", "small"], args=[1000, 5, 60, 1, 60])
+        assert waits == [b"0", b"60"]
+        # the blocked attempt took nothing from the other bucket
+        assert await redis.hget("big", "tokens") is None
+
+    asyncio.run(scenario())
+
+
+def test_rate_limiter() -> None:
+    async def scenario() -> None:
+        redis = fakeredis.FakeAsyncRedis()
+        limiter = RateLimiter(redis)
+        buckets = {"ip:1": Rate(capacity=2, period=60)}
+        await limiter.hit(buckets)
+        await limiter.hit(buckets)
+        with pytest.raises(RateLimitError):
+            await limiter.hit(buckets)
+
+        # an empty bucket is answered locally until it refills
+        with patch.object(
+            limiter,
+            "_script",
+            side_effect=AssertionError("Redis called"),
+        ):
+            with pytest.raises(RateLimitError):
+                await limiter.hit(buckets)
+
+    asyncio.run(scenario())
+
+
+def test_rate_limiter_fails_open() -> None:
+    async def scenario() -> None:
+        server = fakeredis.FakeServer()
+        limiter = RateLimiter(fakeredis.FakeAsyncRedis(server=server))
+        server.connected = False
+        for _ in range(3):
+            await limiter.hit({"ip:1": Rate(capacity=1, period=60)})
+
+    asyncio.run(scenario())
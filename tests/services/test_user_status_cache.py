@@ -0,0 +1,103 @@
+import asyncio
+from typing import Awaitable, Callable
+
+import fakeredis
+
+from auth_app.models.users import UserStatus
+from auth_app.services.utils.user_status_cache import UserStatusCache
+
+USER_ID = "0b3c5a5e-5d4e-4f4e-9a57-6f1f3b7c2d10"
+ACTIVE = UserStatus(is_verified=True, is_active=True)
+INACTIVE = UserStatus(is_verified=True, is_active=False)
+
+
+def counting_loader(
+    status: UserStatus,
+) -> tuple[Callable[[], Awaitable[UserStatus]], list[int]]:
+    calls = [0]
+
+    async def loader() -> UserStatus:
+        calls[0] += 1
+        return status
+
+    return loader, calls
+
+
+def test_read_through_and_invalidation() -> None:
+    async def scenario() -> None:
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        cache = UserStatusCache(redis)
+        loader, calls = counting_loader(ACTIVE)
+
+        assert await cache.get(USER_ID, loader) == ACTIVE
+        assert await cache.get(USER_ID, loader) == ACTIVE
+        assert calls == [1]
+        # another worker reads the hash without the loader
+        other = UserStatusCache(redis)
+        assert await other.get(USER_ID, loader) == ACTIVE
+        assert calls == [1]
+
+        await cache.invalidate(USER_ID)
+        loader, calls = counting_loader(INACTIVE)
+        assert await cache.get(USER_ID, loader) == INACTIVE
+        assert calls == [1]
+
+    asyncio.run(scenario())
+
+
+def test_status_loaded_before_invalidation_is_not_cached() -> None:
+    async def scenario() -> None:
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        cache = UserStatusCache(redis)
+        writer = UserStatusCache(redis)
+
+        async def stale_loader() -> UserStatus:
+            # the row is read, then the deactivation commits and
+            # invalidates before the reader writes its status back
+            await writer.invalidate(USER_ID)
+            return ACTIVE
+
+        assert await cache.get(USER_ID, stale_loader) == ACTIVE
+        assert await redis.hget(f"user-status:{USER_ID}", "a") is None
+
+        loader, calls = counting_loader(INACTIVE)
+        assert await cache.get(USER_ID, loader) == INACTIVE
+        assert calls == [1]
+        assert await cache.get(USER_ID, loader) == INACTIVE
+        assert calls == [1]
+
+    asyncio.run(scenario())
+
+
+def test_local_entry_skipped_after_invalidation_during_read() -> None:
+    async def scenario() -> None:
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        cache = UserStatusCache(redis)
+
+        async def stale_loader() -> UserStatus:
+            # the invalidation is seen by this worker while loading
+            await cache.invalidate(USER_ID)
+            return ACTIVE
+
+        assert await cache.get(USER_ID, stale_loader) == ACTIVE
+        loader, calls = counting_loader(INACTIVE)
+        assert await cache.get(USER_ID, loader) == INACTIVE
+        assert calls == [1]
+
+    asyncio.run(scenario())
+
+
+def test_redis_failure_falls_back_to_loader() -> None:
+    async def scenario() -> None:
+        server = fakeredis.FakeServer()
+        server.connected = False
+        redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        cache = UserStatusCache(redis)
+        loader, calls = counting_loader(ACTIVE)
+
+        assert await cache.get(USER_ID, loader) == ACTIVE
+        await cache.invalidate(USER_ID)
+        assert await cache.get(USER_ID, loader) == ACTIVE
+        assert calls == [2]
+
+    asyncio.run(scenario())
@@ -0,0 +1,35 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from auth_app.serve import prepare_multiproc_dir
+
+
+def test_multiproc_dir_created_for_several_workers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    assert prepare_multiproc_dir(1) is None
+    assert "PROMETHEUS_MULTIPROC_DIR" not in os.environ
+
+    created = prepare_multiproc_dir(2)
+    try:
+        assert created is not None and os.path.isdir(created)
+        assert os.environ["PROMETHEUS_MULTIPROC_DIR"] == created
+    finally:
+        path = os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+        if path:
+            os.rmdir(path)
+
+
+def test_multiproc_dir_cleared_on_startup(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    (tmp_path / "counter_123.db").write_bytes(b"stale")
+    (tmp_path / "README").write_text("kept")
+
+    assert prepare_multiproc_dir(4) is None
+    assert sorted(os.listdir(tmp_path)) == ["README"]
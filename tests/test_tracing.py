@@ -0,0 +1,92 @@
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import StatusCode
+
+from auth_app import tracing
+from auth_app.config import get_tracing_settings
+
+
+def probe_class() -> type:
+    class Probe:
+        async def fetch(self, value: int) -> int:
+            with tracing.span("probe.inner"):
+                return value * 2
+
+        async def fail(self) -> None:
+            raise ValueError("boom")
+
+        async def _private(self) -> int:
+            return 1
+
+        def sync(self) -> int:
+            return 1
+
+        async def stream(self) -> AsyncIterator[int]:
+            yield 1
+
+    return Probe
+
+
+def test_traced_wraps_public_coroutines(
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    probe_cls = tracing.traced(probe_class())
+    probe = probe_cls()
+
+    assert asyncio.run(probe.fetch(21)) == 42
+    inner, outer = span_exporter.get_finished_spans()
+    assert outer.name == "Probe.fetch"
+    assert inner.name == "probe.inner"
+    assert inner.parent is not None
+    assert inner.parent.span_id == outer.context.span_id
+
+    assert hasattr(probe_cls.fetch, "__wrapped__")
+    for name in ("_private", "sync", "stream"):
+        assert not hasattr(getattr(probe_cls, name), "__wrapped__")
+
+
+def test_traced_records_exceptions(
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    probe_cls = tracing.traced(probe_class())
+
+    with pytest.raises(ValueError):
+        asyncio.run(probe_cls().fail())
+    (failed,) = span_exporter.get_finished_spans()
+    assert failed.name == "Probe.fail"
+    assert failed.status.status_code == StatusCode.ERROR
+    assert failed.events[0].name == "exception"
+
+
+def test_tracing_enabled_at_call_time(
+    monkeypatch: pytest.MonkeyPatch,
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    # decorated while disabled, as at import with the default settings
+    monkeypatch.setattr(get_tracing_settings(), "TRACING_ENABLED", False)
+    probe = tracing.traced(probe_class())()
+    assert tracing.span("probe") is tracing.span("other")
+    assert asyncio.run(probe.fetch(21)) == 42
+    assert span_exporter.get_finished_spans() == ()
+
+    monkeypatch.setattr(get_tracing_settings(), "TRACING_ENABLED", True)
+    assert asyncio.run(probe.fetch(21)) == 42
+    inner, outer = span_exporter.get_finished_spans()
+    assert (inner.name, outer.name) == ("probe.inner", "Probe.fetch")
+
+
+def test_tracer_provider_is_created_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_tracing_settings(), "TRACING_EXPORTER", "memory")
+
+    provider = tracing.get_tracer_provider()
+    assert tracing.get_tracer_provider() is provider
+    assert trace.get_tracer_provider() is provider
+    assert isinstance(tracing.get_span_exporter(), InMemorySpanExporter)